@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark du pipeline d'analyse (analyze_position / analyze_game)
+
+Mesure le débit (positions/s, parties/min), les percentiles de latence
+et la mémoire, avec le moteur simulé (benchmarks/fake_uci.py) et avec
+Stockfish s'il est installé. Les résultats sont écrits en JSON pour être
+comparés d'une version à l'autre, sans accès réseau.
+
+Usage:
+    python benchmarks/bench_analyzer.py --output bench.json
+    python benchmarks/bench_analyzer.py --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+import chess.pgn
+
+import chessassist
+from chessassist.core.analyzer import GameAnalyzer, read_game
+
+FAKE_ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_uci.py")
+
+def synthetic_games(count: int, plies: int, seed: int = 0) -> List[str]:
+    """
+    Génère des parties aléatoires mais reproductibles
+    
+    Args:
+        count: Nombre de parties
+        plies: Nombre maximal de demi-coups par partie
+        seed: Graine du générateur
+    
+    Returns:
+        Parties au format PGN
+    """
+    rng = random.Random(seed)
+    games = []
+    for index in range(count):
+        game = chess.pgn.Game()
+        game.headers["Event"] = f"Benchmark {index}"
+        node = game
+        board = chess.Board()
+        for _ in range(plies):
+            moves = sorted(board.legal_moves, key=lambda move: move.uci())
+            if not moves:
+                break
+            move = rng.choice(moves)
+            node = node.add_variation(move)
+            board.push(move)
+        games.append(str(game))
+    return games
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Percentiles de latence en millisecondes"""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+    
+    return {
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000
+    }
+
+def bench_engine(
+    engine_command,
+    games: List[str],
+    time_per_move: Optional[float],
+    depth: Optional[int],
+    position_time: float
+) -> Dict:
+    """
+    Mesure les performances de l'analyseur avec un moteur donné
+    
+    Seules les méthodes publiques sont chronométrées, avec tout ce que
+    paie un appelant (cache, construction des résultats).
+    
+    Args:
+        engine_command: Chemin ou commande du moteur UCI
+        games: Parties à analyser
+        time_per_move: Temps par position pour analyze_game (secondes)
+        depth: Profondeur par position pour analyze_game
+        position_time: Temps par position pour analyze_position (secondes),
+            qui ne prend qu'une limite de temps
+    
+    Returns:
+        Métriques mesurées
+    """
+    results = {}
+    with GameAnalyzer(engine_command) as analyzer:
+        # Latence de analyze_position sur les positions des parties
+        latencies = []
+        errors = 0
+        for pgn in games:
+            game = read_game(pgn)
+            board = game.board()
+            for move in game.mainline_moves():
+                board.push(move)
+                if board.is_game_over():
+                    break
+                start = time.perf_counter()
+                result = analyzer.analyze_position(board, time_limit=position_time)
+                latencies.append(time.perf_counter() - start)
+                errors += "error" in result
+        
+        total = sum(latencies)
+        results["analyze_position"] = {
+            "positions": len(latencies),
+            "errors": errors,
+            "positions_per_s": len(latencies) / total if total else 0.0,
+            **percentiles(latencies)
+        }
+        
+        # Débit de analyze_game et mémoire
+        tracemalloc.start()
+        game_times = []
+        positions = 0
+        for pgn in games:
+            start = time.perf_counter()
+            analyses = analyzer.analyze_game(pgn, time_per_move=time_per_move, depth=depth)
+            game_times.append(time.perf_counter() - start)
+            positions += len(analyses) + 1
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        total = sum(game_times)
+        results["analyze_game"] = {
+            "games": len(game_times),
+            "games_per_min": 60 * len(game_times) / total if total else 0.0,
+            "positions_per_s": positions / total if total else 0.0,
+            **percentiles(game_times),
+            "peak_python_memory_kb": peak // 1024
+        }
+        results["metrics"] = analyzer.metrics.to_dict()
+    
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+def find_stockfish() -> Optional[str]:
+    """Chemin de Stockfish s'il est installé"""
+    try:
+        return GameAnalyzer().stockfish_path
+    except FileNotFoundError:
+        return None
+
+def compare(current: Dict, baseline: Dict):
+    """Affiche l'évolution des métriques par rapport à un fichier de référence"""
+    for engine, sections in current["engines"].items():
+        for section, metrics in sections.items():
+            if not isinstance(metrics, dict):
+                continue
+            reference = baseline.get("engines", {}).get(engine, {}).get(section, {})
+            for name, value in metrics.items():
+                if isinstance(value, (int, float)) and name in reference and reference[name]:
+                    change = (value - reference[name]) / reference[name] * 100
+                    print(f"{engine:10} {section:17} {name:22} {value:12.2f} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'analyseur ChessAssist")
+    parser.add_argument("--games", type=int, default=5, help="Nombre de parties synthétiques")
+    parser.add_argument("--plies", type=int, default=60, help="Demi-coups par partie")
+    parser.add_argument("--time-per-move", type=float, default=None, help="Temps par position (secondes)")
+    parser.add_argument("--depth", type=int, default=12, help="Profondeur par position")
+    parser.add_argument("--position-time", type=float, default=0.01, help="Temps par position de analyze_position (secondes)")
+    parser.add_argument("--fake-delay", type=float, default=0.0005, help="Délai par profondeur du moteur simulé")
+    parser.add_argument("--no-stockfish", action="store_true", help="N'utilise que le moteur simulé")
+    parser.add_argument("--output", help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", help="Fichier JSON de référence à comparer")
+    args = parser.parse_args()
+    
+    games = synthetic_games(args.games, args.plies)
+    engines = {"fake": [sys.executable, FAKE_ENGINE, "--delay", str(args.fake_delay)]}
+    stockfish = None if args.no_stockfish else find_stockfish()
+    if stockfish:
+        engines["stockfish"] = stockfish
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "chessassist_version": chessassist.__version__,
+        "python_chess_version": chess.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "params": vars(args),
+        "engines": {}
+    }
+    for name, command in engines.items():
+        print(f"Benchmark: {name}...")
+        report["engines"][name] = bench_engine(command, games, args.time_per_move, args.depth, args.position_time)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark de charge des chemins de synchronisation chess.com
+
+Les clients sont dirigés vers le faux serveur local
+(chessassist.chess_com.fake_server) avec une latence réseau simulée;
+chaque chemin (archives JSON, lecture en flux, parties récentes, base
+locale, export PGN, cache, client asynchrone) est mesuré en requêtes/s
+et parties/s. Les pannes injectées (429, 5xx) ne concernent que le
+client asynchrone, le seul à les absorber. Aucun accès réseau.
+
+Usage:
+    python benchmarks/bench_chess_com.py --output bench_chess_com.json
+    python benchmarks/bench_chess_com.py --baseline bench_chess_com.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chessassist
+from chessassist.chess_com.api import ChessComAPI
+from chessassist.chess_com.async_api import AsyncChessComAPI
+from chessassist.chess_com.cache import ResponseCache
+from chessassist.chess_com.fake_server import FakeChessComServer
+from chessassist.chess_com.store import GameStore
+from chessassist.core.pgn_stream import iter_games
+
+def measure(server: FakeChessComServer, run: Callable[[], int]) -> Dict:
+    """
+    Mesure un chemin de synchronisation
+    
+    Args:
+        server: Faux serveur interrogé
+        run: Fonction exécutant le chemin et renvoyant le nombre de parties obtenues
+    
+    Returns:
+        Requêtes, parties, durée et débits
+    """
+    requests = server.requests
+    start = time.perf_counter()
+    games = run()
+    elapsed = time.perf_counter() - start
+    requests = server.requests - requests
+    return {
+        "requests": requests,
+        "games": games,
+        "elapsed_s": elapsed,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "games_per_s": games / elapsed if elapsed else 0.0
+    }
+
+def bench_sync(server: FakeChessComServer, players: List[str], args) -> Dict:
+    """Chemins du client synchrone (ChessComAPI)"""
+    results = {}
+    
+    def client(**kwargs) -> ChessComAPI:
+        return ChessComAPI(
+            rate_limit_delay=args.rate_limit_delay,
+            max_workers=args.max_workers,
+            base_url=server.base_url,
+            **kwargs
+        )
+    
+    def monthly_json() -> int:
+        api = client()
+        return sum(
+            len(api.get_monthly_games(username, year, month))
+            for username in players for year, month in api.get_archives(username)
+        )
+    
+    def monthly_stream() -> int:
+        api = client()
+        return sum(
+            sum(1 for _ in api.iter_monthly_games(username, year, month, include_pgn=False))
+            for username in players for year, month in api.get_archives(username)
+        )
+    
+    def recent_games() -> int:
+        api = client()
+        return sum(len(api.get_recent_games(username, limit=args.recent)) for username in players)
+    
+    results["monthly_json"] = measure(server, monthly_json)
+    results["monthly_stream"] = measure(server, monthly_stream)
+    results["recent_games"] = measure(server, recent_games)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        api = client()
+        with GameStore(os.path.join(directory, "games.sqlite")) as store:
+            results["store_sync"] = measure(server, lambda: sum(store.sync(api, username) for username in players))
+        
+        def pgn_export() -> int:
+            paths = [
+                path for username in players
+                for path in api.download_pgn_archives(username, os.path.join(directory, "pgn"))
+            ]
+            return sum(1 for path in paths for _ in iter_games(path))
+        
+        results["pgn_export"] = measure(server, pgn_export)
+        
+        with ResponseCache(os.path.join(directory, "cache")) as cache:
+            cached = client(cache=cache)
+            measure(server, lambda: sum(len(cached.get_recent_games(username, limit=args.recent)) for username in players))
+            results["recent_games_cached"] = measure(
+                server, lambda: sum(len(cached.get_recent_games(username, limit=args.recent)) for username in players)
+            )
+            results["recent_games_cached"]["cache"] = cache.stats()
+    
+    return results
+
+def bench_async(server: FakeChessComServer, players: List[str], args) -> Dict:
+    """Synchronisation groupée du client asynchrone (fetch_players)"""
+    async def fan_out():
+        async with AsyncChessComAPI(rate=args.rate, max_concurrency=args.concurrency, base_url=server.base_url) as api:
+            data = await api.fetch_players(players, months=args.months)
+            return data, api.throttled
+    
+    def run() -> int:
+        data, throttled = asyncio.run(fan_out())
+        run.throttled = throttled
+        run.failed = sum(1 for player in data.values() if player.error)
+        return sum(len(games) for player in data.values() for games in player.games.values())
+    
+    results = measure(server, run)
+    results["throttled"] = run.throttled
+    results["failed_players"] = run.failed
+    return {"fetch_players": results}
+
+def compare(current: Dict, baseline: Dict):
+    """Affiche l'évolution des métriques par rapport à un fichier de référence"""
+    for section, metrics in current["results"].items():
+        reference = baseline.get("results", {}).get(section, {})
+        for name, value in metrics.items():
+            if isinstance(value, (int, float)) and name in reference and reference[name]:
+                change = (value - reference[name]) / reference[name] * 100
+                print(f"{section:20} {name:16} {value:12.2f} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de synchronisation chess.com (faux serveur local)")
+    parser.add_argument("--players", type=int, default=4, help="Nombre de joueurs")
+    parser.add_argument("--months", type=int, default=6, help="Mois d'archives par joueur")
+    parser.add_argument("--games-per-month", type=int, default=50, help="Parties par joueur et par mois")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latence simulée par réponse (secondes)")
+    parser.add_argument("--rate-limit-delay", type=float, default=0.0, help="Délai entre requêtes du client synchrone")
+    parser.add_argument("--max-workers", type=int, default=4, help="Requêtes parallèles du client synchrone")
+    parser.add_argument("--recent", type=int, default=100, help="Parties demandées à get_recent_games")
+    parser.add_argument("--rate", type=float, default=50.0, help="Requêtes/s du client asynchrone")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requêtes simultanées du client asynchrone")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Réponse 429 toutes les N requêtes (asynchrone)")
+    parser.add_argument("--error-every", type=int, default=0, help="Réponse 503 toutes les N requêtes (asynchrone)")
+    parser.add_argument("--output", help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", help="Fichier JSON de référence à comparer")
+    args = parser.parse_args()
+    
+    players = [f"player{index}" for index in range(args.players)]
+    settings = {"months": args.months, "games_per_month": args.games_per_month, "latency": args.latency}
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "chessassist_version": chessassist.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "params": vars(args),
+        "results": {}
+    }
+    
+    print("Benchmark: client synchrone...")
+    with FakeChessComServer(**settings) as server:
+        report["results"].update(bench_sync(server, players, args))
+    
+    print("Benchmark: client asynchrone...")
+    with FakeChessComServer(throttle_every=args.throttle_every, error_every=args.error_every, **settings) as server:
+        report["results"].update(bench_async(server, players, args))
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Moteur UCI simulé et déterministe pour les benchmarks et les tests
+
+Le score d'une position est dérivé de son hash Zobrist: une même
+position donne toujours le même score et le même meilleur coup. Le
+délai par profondeur simule le coût d'une recherche.
+
+Usage: python benchmarks/fake_uci.py [--delay 0.001] [--max-depth 20] [--spread 300]
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+import chess
+import chess.polyglot
+
+def position_score(board: chess.Board, depth: int, spread: int) -> int:
+    """Score déterministe (centipions, point de vue du trait) pour une profondeur"""
+    key = chess.polyglot.zobrist_hash(board)
+    base = key % (2 * spread + 1) - spread
+    # Légère oscillation sur les premières profondeurs, comme un vrai moteur
+    return base + (key >> (depth % 16)) % 21 - 10 if depth < 6 else base
+
+def best_move(board: chess.Board) -> chess.Move:
+    """Meilleur coup déterministe: le premier coup légal en notation UCI"""
+    return min(board.legal_moves, key=lambda move: move.uci())
+
+class FakeEngine:
+    """Interpréteur du protocole UCI (sous-ensemble utilisé par python-chess)"""
+    
+    def __init__(self, delay: float, max_depth: int, spread: int):
+        self.delay = delay
+        self.max_depth = max_depth
+        self.spread = spread
+        self.board = chess.Board()
+        self.stop_event = threading.Event()
+        self.search: threading.Thread = None
+        self.lock = threading.Lock()
+    
+    def send(self, line: str):
+        with self.lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+    
+    def position(self, tokens):
+        if tokens[0] == "startpos":
+            self.board = chess.Board()
+            rest = tokens[1:]
+        else:
+            fen_end = tokens.index("moves") if "moves" in tokens else len(tokens)
+            self.board = chess.Board(" ".join(tokens[1:fen_end]))
+            rest = tokens[fen_end:]
+        if rest and rest[0] == "moves":
+            for move in rest[1:]:
+                self.board.push_uci(move)
+    
+    def go(self, tokens):
+        params = dict(zip(tokens[::2], tokens[1::2]))
+        depth_limit = int(params.get("depth", self.max_depth))
+        movetime = float(params["movetime"]) / 1000 if "movetime" in params else None
+        node_limit = int(params["nodes"]) if "nodes" in params else None
+        infinite = "infinite" in tokens
+        
+        board = self.board.copy()
+        self.stop_event.clear()
+        
+        def run():
+            start = time.perf_counter()
+            nodes = 0
+            move = best_move(board) if any(board.legal_moves) else None
+            depth = 1
+            while True:
+                time.sleep(self.delay)
+                nodes += 1000 * depth
+                elapsed = time.perf_counter() - start
+                score = position_score(board, depth, self.spread)
+                pv = f" pv {move.uci()}" if move else ""
+                self.send(
+                    f"info depth {depth} seldepth {depth + 2} score cp {score} "
+                    f"nodes {nodes} nps {int(nodes / max(elapsed, 1e-6))} "
+                    f"time {int(elapsed * 1000)} hashfull {min(depth * 10, 1000)} tbhits 0{pv}"
+                )
+                if self.stop_event.is_set():
+                    break
+                if infinite:
+                    if depth >= self.max_depth:
+                        self.stop_event.wait()
+                        break
+                elif (
+                    depth >= min(depth_limit, self.max_depth)
+                    or (movetime is not None and elapsed >= movetime)
+                    or (node_limit is not None and nodes >= node_limit)
+                ):
+                    break
+                depth += 1
+            self.send(f"bestmove {move.uci() if move else '(none)'}")
+        
+        self.search = threading.Thread(target=run, daemon=True)
+        self.search.start()
+    
+    def loop(self):
+        for line in sys.stdin:
+            tokens = line.split()
+            if not tokens:
+                continue
+            command = tokens[0]
+            if command == "uci":
+                self.send("id name FakeUCI 1.0")
+                self.send("id author ChessAssist")
+                self.send("option name Threads type spin default 1 min 1 max 512")
+                self.send("option name Hash type spin default 16 min 1 max 33554432")
+                self.send("uciok")
+            elif command == "isready":
+                if self.search:
+                    self.search.join()
+                self.send("readyok")
+            elif command == "ucinewgame":
+                self.board = chess.Board()
+            elif command == "position":
+                self.position(tokens[1:])
+            elif command == "go":
+                self.go(tokens[1:])
+            elif command == "stop":
+                self.stop_event.set()
+            elif command == "quit":
+                self.stop_event.set()
+                break
+
+def main():
+    parser = argparse.ArgumentParser(description="Moteur UCI simulé")
+    parser.add_argument("--delay", type=float, default=0.001, help="Délai par profondeur (secondes)")
+    parser.add_argument("--max-depth", type=int, default=20, help="Profondeur maximale")
+    parser.add_argument("--spread", type=int, default=300, help="Amplitude des scores (centipions)")
+    args = parser.parse_args()
+    FakeEngine(args.delay, args.max_depth, args.spread).loop()
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Point d'entrée principal pour ChessAssist CLI
 import click
 from rich.console import Console
 from rich.panel import Panel
-from chessassist.cli.commands import analyze, openings, stats
+from chessassist.cli.commands import analyze, openings, stats, daemon
 
 console = Console()
 
@@ -25,6 +25,7 @@ def cli():
 cli.add_command(analyze)
 cli.add_command(openings) 
 cli.add_command(stats)
+cli.add_command(daemon)
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -3,67 +3,214 @@ Client pour l'API chess.com
 """
 
 import requests
+import codecs
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
 import time
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pathlib import Path
+from chessassist.chess_com.cache import MONTHLY_ARCHIVE, ResponseCache, archive_closed_at
+from chessassist.chess_com.records import GameInfo, GameRecord
+from chessassist.openings.eco import EcoIndex
 
-@dataclass
-class GameInfo:
-    """Informations sur une partie"""
-    game_id: str
-    url: str
-    pgn: str
-    white_player: str
-    black_player: str
-    white_rating: int
-    black_rating: int
-    time_control: str
-    end_time: datetime
-    result: str
-    rated: bool
+# Taille des blocs lus lors d'une réception en flux
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Début d'un tableau JSON nommé (ex: "games": [)
+ARRAY_START = r'"{key}"\s*:\s*\['
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "games") -> Iterator[Dict]:
+    """
+    Décode en flux les éléments d'un tableau JSON nommé
+    
+    Seul l'élément en cours de lecture est gardé en mémoire: une archive
+    de plusieurs centaines de Mo est parcourue à mémoire constante.
+    
+    Args:
+        chunks: Blocs d'octets de la réponse (UTF-8)
+        key: Nom du tableau dans l'objet racine
+        
+    Yields:
+        Éléments du tableau, dans l'ordre
+    """
+    chunks = iter(chunks)
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    start = re.compile(ARRAY_START.format(key=re.escape(key)))
+    buffer = ""
+    position = None  # Position de lecture une fois le tableau trouvé
+    
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        if position is None:
+            match = start.search(buffer)
+            if match is None:
+                continue
+            position = match.end()
+        
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                # Lit la fin de la réponse pour que la source se termine normalement
+                for _ in chunks:
+                    pass
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # Élément incomplet: attend le bloc suivant
+            yield item
+        
+        buffer = buffer[position:]
+        position = 0
+    
+    if position is not None:
+        raise ValueError(f"Tableau JSON \"{key}\" tronqué")
+
+def _read_file_chunks(path) -> Iterator[bytes]:
+    """Lit un fichier par blocs"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+def parse_archives(urls: List[str]) -> List[Tuple[int, int]]:
+    """
+    Extrait les mois d'une liste d'URL d'archives mensuelles
+    
+    Args:
+        urls: URL renvoyées par /player/<joueur>/games/archives
+        
+    Returns:
+        Couples (année, mois), du plus récent au plus ancien
+    """
+    months = set()
+    for url in urls:
+        match = MONTHLY_ARCHIVE.search(url)
+        if match:
+            months.add((int(match.group(1)), int(match.group(2))))
+    return sorted(months, reverse=True)
+
+def months_to_fetch(fetched: int, found: int, limit: int, max_batch: int) -> int:
+    """
+    Nombre de mois d'archives à demander au prochain lot
+    
+    Le mois le plus récent est demandé seul: il suffit souvent pour un
+    joueur actif. Ensuite, seuls les mois nécessaires pour combler le
+    manque (estimé d'après le nombre moyen de parties par mois déjà lu)
+    sont demandés en parallèle.
+    
+    Args:
+        fetched: Mois déjà demandés
+        found: Parties déjà trouvées
+        limit: Nombre de parties recherchées
+        max_batch: Nombre maximal de requêtes simultanées
+    
+    Returns:
+        Nombre de mois du prochain lot (au moins 1)
+    """
+    if not fetched:
+        return 1
+    if not found:
+        return max_batch
+    per_month = found / fetched
+    return max(1, min(max_batch, math.ceil((limit - found) / per_month)))
 
 class ChessComAPI:
     """Client pour l'API chess.com"""
     
     BASE_URL = "https://api.chess.com/pub"
     
-    def __init__(self, rate_limit_delay: float = 1.0):
+    def __init__(
+        self,
+        rate_limit_delay: float = 1.0,
+        cache: Optional[ResponseCache] = None,
+        max_workers: int = 4,
+        base_url: Optional[str] = None
+    ):
         """
         Initialise le client API
         
         Args:
             rate_limit_delay: Délai entre les requêtes (en secondes)
+            cache: Cache disque des réponses (optionnel)
+            max_workers: Requêtes simultanées pour les récupérations parallèles
+            base_url: URL de l'API (par défaut: BASE_URL, ex: FakeChessComServer)
         """
+        if base_url:
+            self.BASE_URL = base_url
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'ChessAssist/0.1.0 (Educational Tool)'
         })
         self.rate_limit_delay = rate_limit_delay
         self.last_request_time = 0
+        self.cache = cache
+        self.max_workers = max_workers
+        self._rate_lock = threading.Lock()
+    
+    def _wait_for_slot(self):
+        """
+        Attend son tour d'envoi (sûr entre threads)
+        
+        Chaque appel réserve un créneau espacé de rate_limit_delay du
+        précédent avant de dormir: des threads concurrents ne partent
+        donc jamais ensemble.
+        """
+        with self._rate_lock:
+            slot = max(time.time(), self.last_request_time + self.rate_limit_delay)
+            self.last_request_time = slot
+        
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
     
     def _make_request(self, endpoint: str) -> Dict:
         """
         Effectue une requête à l'API avec gestion du rate limiting
         
+        Avec un cache, les archives de mois terminés sont servies sans
+        requête; les autres réponses en cache sont revalidées par une
+        requête conditionnelle (ETag / Last-Modified).
+        
         Args:
             endpoint: Point de terminaison de l'API
             
         Returns:
             Réponse JSON de l'API
         """
-        # Gestion du rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        
         url = f"{self.BASE_URL}{endpoint}"
+        cached = self.cache.get(url) if self.cache else None
+        if cached is not None and cached.immutable:
+            return json.loads(cached.body)
+        
+        self._wait_for_slot()
         
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, headers=cached.conditional_headers() if cached else None)
+            if response.status_code == 304 and cached is not None:
+                self.cache.mark_revalidated(url)
+                return json.loads(cached.body)
+            
             response.raise_for_status()
-            self.last_request_time = time.time()
+            if self.cache:
+                self.cache.put(
+                    url,
+                    response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
             return response.json()
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Erreur API chess.com: {e}")
@@ -92,6 +239,19 @@ class ChessComAPI:
         """
         return self._make_request(f"/player/{username}/stats")
     
+    def get_archives(self, username: str) -> List[Tuple[int, int]]:
+        """
+        Récupère la liste des mois où le joueur a des parties
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            
+        Returns:
+            Couples (année, mois), du plus récent au plus ancien
+        """
+        data = self._make_request(f"/player/{username}/games/archives")
+        return parse_archives(data.get("archives", []))
+    
     def get_monthly_games(self, username: str, year: int, month: int) -> List[Dict]:
         """
         Récupère les parties d'un mois donné
@@ -108,43 +268,234 @@ class ChessComAPI:
         data = self._make_request(f"/player/{username}/games/{formatted_month}")
         return data.get("games", [])
     
-    def get_recent_games(self, username: str, limit: int = 10) -> List[GameInfo]:
+    def _stream_request(self, endpoint: str) -> Iterator[bytes]:
+        """
+        Effectue une requête dont la réponse est lue en flux
+        
+        Le cache est utilisé comme par _make_request; une réponse reçue
+        est écrite dans le cache au fil de la lecture, sans être gardée
+        en mémoire.
+        
+        Args:
+            endpoint: Point de terminaison de l'API
+            
+        Yields:
+            Blocs d'octets de la réponse
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        cached = self.cache.get(url, load_body=False) if self.cache else None
+        if cached is not None and cached.immutable:
+            yield from _read_file_chunks(cached.path)
+            return
+        
+        self._wait_for_slot()
+        try:
+            with self.session.get(url, headers=cached.conditional_headers() if cached else None, stream=True) as response:
+                if response.status_code == 304 and cached is not None:
+                    self.cache.mark_revalidated(url)
+                    yield from _read_file_chunks(cached.path)
+                    return
+                
+                response.raise_for_status()
+                if not self.cache:
+                    yield from response.iter_content(STREAM_CHUNK_SIZE)
+                    return
+                
+                temp_path = self.cache.new_body_file()
+                try:
+                    with open(temp_path, "wb") as f:
+                        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                            f.write(chunk)
+                            yield chunk
+                    self.cache.put_file(
+                        url,
+                        temp_path,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified")
+                    )
+                finally:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Erreur API chess.com: {e}")
+    
+    def iter_monthly_records(self, username: str, year: int, month: int, include_pgn: bool = True) -> Iterator[GameRecord]:
+        """
+        Parcourt les parties d'un mois sous forme compacte, sans décodage
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            year: Année
+            month: Mois (1-12)
+            include_pgn: Conserve le PGN de chaque partie
+            
+        Yields:
+            Parties du mois, dans l'ordre de l'archive
+        """
+        chunks = self._stream_request(f"/player/{username}/games/{year:04d}/{month:02d}")
+        for game_data in iter_json_array(chunks, "games"):
+            if not include_pgn:
+                game_data.pop("pgn", None)
+            yield GameRecord(game_data)
+    
+    def iter_monthly_games(self, username: str, year: int, month: int, include_pgn: bool = True) -> Iterator[GameInfo]:
+        """
+        Parcourt les parties d'un mois sans charger l'archive en mémoire
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            year: Année
+            month: Mois (1-12)
+            include_pgn: Conserve le PGN de chaque partie (sinon chaîne vide)
+            
+        Yields:
+            Parties du mois, dans l'ordre de l'archive
+        """
+        for record in self.iter_monthly_records(username, year, month, include_pgn):
+            game_info = self._parse_game_data(record)
+            if game_info:
+                yield game_info
+    
+    def get_recent_games(self, username: str, limit: int = 10, include_pgn: bool = True) -> List[GameInfo]:
         """
         Récupère les parties récentes d'un joueur
         
+        Les archives sont lues en flux et seules les `limit` parties les
+        plus récentes de chaque mois sont gardées: la mémoire utilisée ne
+        dépend pas de la taille des archives.
+        
         Args:
             username: Nom d'utilisateur chess.com
             limit: Nombre maximum de parties à récupérer
+            include_pgn: Conserve le PGN des parties
             
         Returns:
-            Liste des parties récentes
-        """
-        # Commence par le mois actuel
-        now = datetime.now()
-        games = []
-        
-        for months_back in range(3):  # Regarde les 3 derniers mois
-            check_date = now - timedelta(days=30 * months_back)
-            monthly_games = self.get_monthly_games(
-                username, 
-                check_date.year, 
-                check_date.month
+            Liste des parties récentes, de la plus récente à la plus ancienne
+        """
+        def newest_in_month(month: Tuple[int, int]) -> Tuple[int, List[GameRecord]]:
+            seen = 0
+            
+            def counted(records: Iterator[GameRecord]) -> Iterator[GameRecord]:
+                nonlocal seen
+                for record in records:
+                    seen += 1
+                    yield record
+            
+            newest = heapq.nlargest(
+                limit,
+                counted(self.iter_monthly_records(username, *month, include_pgn=include_pgn)),
+                key=lambda r: r.end_timestamp
             )
+            return seen, newest
+        
+        # Seuls les mois présents dans l'index des archives sont demandés,
+        # du plus récent au plus ancien: le dernier mois seul, puis en
+        # parallèle les mois nécessaires pour atteindre la limite
+        archives = self.get_archives(username)
+        records = []
+        found = 0
+        fetched = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while fetched < len(archives) and found < limit:
+                batch = archives[fetched:fetched + months_to_fetch(fetched, found, limit, self.max_workers)]
+                fetched += len(batch)
+                for seen, newest in executor.map(newest_in_month, batch):
+                    found += seen
+                    records = heapq.nlargest(limit, records + newest, key=lambda r: r.end_timestamp)
+        
+        # Seules les parties retenues sont entièrement décodées
+        return [game for game in map(self._parse_game_data, records) if game]
+    
+    def sync_games(self, username: str, store) -> int:
+        """
+        Synchronise les parties d'un joueur dans une base locale
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            store: Base locale (voir chessassist.chess_com.store.GameStore)
             
-            for game_data in monthly_games:
-                if len(games) >= limit:
-                    break
-                
-                game_info = self._parse_game_data(game_data)
-                if game_info:
-                    games.append(game_info)
+        Returns:
+            Nombre de nouvelles parties
+        """
+        return store.sync(self, username)
+    
+    def download_pgn_archive(self, username: str, year: int, month: int, path: Union[str, Path]) -> Path:
+        """
+        Télécharge l'export PGN d'un mois directement dans un fichier
+        
+        La réponse est écrite par blocs dans un fichier temporaire du même
+        répertoire, renommé à la fin: un téléchargement interrompu ne
+        laisse jamais de fichier partiel à la place de l'archive.
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            year: Année
+            month: Mois (1-12)
+            path: Fichier PGN de destination
             
-            if len(games) >= limit:
-                break
+        Returns:
+            Chemin du fichier écrit
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        url = f"{self.BASE_URL}/player/{username}/games/{year:04d}/{month:02d}/pgn"
+        
+        self._wait_for_slot()
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f, self.session.get(url, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Erreur API chess.com: {e}")
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return path
+    
+    def download_pgn_archives(
+        self,
+        username: str,
+        directory: Union[str, Path],
+        months: Optional[Iterable[Tuple[int, int]]] = None
+    ) -> List[Path]:
+        """
+        Exporte l'historique d'un joueur en fichiers PGN mensuels
+        
+        Les mois déjà présents dans le répertoire sont sautés, sauf ceux
+        dont le fichier a été écrit avant la fin du mois (voir
+        archive_closed_at) et peut donc manquer de nouvelles parties. Les fichiers produits se
+        lisent sans décodage JSON avec iter_games ou
+        GameAnalyzer.analyze_pgn_file.
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            directory: Répertoire de destination
+            months: Couples (année, mois) à exporter (par défaut: tout l'index des archives)
+            
+        Returns:
+            Chemins des fichiers PGN, du mois le plus ancien au plus récent
+        """
+        directory = Path(directory)
+        if months is None:
+            months = self.get_archives(username)
+        months = sorted(set(months))
+        
+        def download(month: Tuple[int, int]) -> Path:
+            year, month = month
+            path = directory / f"{username.lower()}_{year:04d}-{month:02d}.pgn"
+            url = f"{self.BASE_URL}/player/{username}/games/{year:04d}/{month:02d}/pgn"
+            # Fichier écrit après la clôture du mois: complet
+            closed_at = archive_closed_at(url)
+            if path.exists() and closed_at is not None and path.stat().st_mtime >= closed_at:
+                return path
+            return self.download_pgn_archive(username, year, month, path)
         
-        # Trie par date décroissante et limite
-        games.sort(key=lambda g: g.end_time, reverse=True)
-        return games[:limit]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(download, months))
     
     def get_game_pgn(self, game_url: str) -> str:
         """
@@ -161,50 +512,20 @@ class ChessComAPI:
         # Une implémentation complète pourrait utiliser selenium ou requests-html
         return ""
     
-    def _parse_game_data(self, game_data: Dict) -> Optional[GameInfo]:
+    @staticmethod
+    def _parse_game_data(game_data: Union[Dict, GameRecord]) -> Optional[GameInfo]:
         """
         Parse les données d'une partie depuis l'API
         
         Args:
-            game_data: Données brutes de la partie
+            game_data: Données brutes de la partie ou enregistrement compact
             
         Returns:
             Objet GameInfo ou None si parsing échoue
         """
         try:
-            # Extraction des informations de base
-            game_id = game_data.get("uuid", "")
-            url = game_data.get("url", "")
-            pgn = game_data.get("pgn", "")
-            
-            # Joueurs et ratings
-            white = game_data.get("white", {})
-            black = game_data.get("black", {})
-            
-            white_player = white.get("username", "Unknown")
-            black_player = black.get("username", "Unknown")
-            white_rating = white.get("rating", 0)
-            black_rating = black.get("rating", 0)
-            
-            # Détails de la partie
-            time_control = game_data.get("time_control", "")
-            end_time = datetime.fromtimestamp(game_data.get("end_time", 0))
-            result = white.get("result", "unknown")
-            rated = game_data.get("rated", False)
-            
-            return GameInfo(
-                game_id=game_id,
-                url=url,
-                pgn=pgn,
-                white_player=white_player,
-                black_player=black_player,
-                white_rating=white_rating,
-                black_rating=black_rating,
-                time_control=time_control,
-                end_time=end_time,
-                result=result,
-                rated=rated
-            )
+            record = game_data if isinstance(game_data, GameRecord) else GameRecord(game_data)
+            return record.to_info()
         except Exception as e:
             print(f"Erreur lors du parsing de la partie: {e}")
             return None
@@ -218,16 +539,17 @@ class ChessComAPI:
             limit: Nombre de parties à analyser
             
         Returns:
-            Dictionnaire des ouvertures avec leur fréquence
+            Dictionnaire des ouvertures (nom ECO) avec leur fréquence
         """
         games = self.get_recent_games(username, limit)
+        index = EcoIndex.default()
         opening_counts = {}
         
         for game in games:
             if game.pgn:
-                # Extraction simplifiée de l'ouverture depuis le PGN
-                # Une implémentation plus sophistiquée analyserait les premiers coups
-                opening = self._extract_opening_from_pgn(game.pgn)
+                # Classification par position (table ECO); à défaut, en-têtes du PGN
+                entry = index.classify_pgn(game.pgn)
+                opening = entry.name if entry else self._extract_opening_from_pgn(game.pgn)
                 if opening:
                     opening_counts[opening] = opening_counts.get(opening, 0) + 1
         
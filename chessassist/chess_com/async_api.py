@@ -0,0 +1,533 @@
+"""
+Client asynchrone pour l'API chess.com (connexions partagées, débit limité)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from chessassist.chess_com.api import ChessComAPI, GameInfo, months_to_fetch, parse_archives
+from chessassist.chess_com.records import GameBatch
+
+class TokenBucket:
+    """Limiteur de débit à jetons, partagé entre toutes les requêtes"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.5):
+        """
+        Initialise le limiteur
+        
+        Args:
+            rate: Requêtes autorisées par seconde
+            capacity: Nombre de requêtes pouvant partir en rafale (par défaut: rate)
+            min_rate: Débit plancher après des réponses 429
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.min_rate = min(min_rate, rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff_until = 0.0
+        # Créé dans la boucle qui l'utilise (Python 3.8/3.9 lie les verrous
+        # à la boucle courante lors de leur création)
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _refill(self, now: float):
+        """Ajoute les jetons accumulés depuis la dernière mise à jour"""
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self):
+        """Attend qu'un jeton soit disponible et le consomme"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def throttle(self, retry_after: Optional[float] = None):
+        """
+        Réagit à une réponse 429: suspend les envois et divise le débit
+        
+        Le débit n'est divisé qu'une fois par période de ralentissement:
+        les autres réponses 429 de requêtes parties en même temps ne font
+        que prolonger la suspension.
+        
+        Args:
+            retry_after: Délai demandé par le serveur (secondes)
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if now >= self._backoff_until:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._backoff_until = now + (retry_after or 1.0 / self.rate)
+        self.tokens = 0.0
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+    
+    def recover(self):
+        """Réagit à une réponse réussie: remonte progressivement vers le débit maximal"""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Lit l'en-tête Retry-After (secondes ou date HTTP)
+    
+    Args:
+        value: Valeur de l'en-tête
+    
+    Returns:
+        Délai en secondes ou None si absent ou illisible
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class PlayerData:
+    """Données d'un joueur récupérées par une synchronisation groupée"""
+    username: str
+    profile: Optional[Dict] = None
+    stats: Optional[Dict] = None
+    archives: List[Tuple[int, int]] = field(default_factory=list)
+    games: Dict[Tuple[int, int], List[Dict]] = field(default_factory=dict)
+    error: Optional[str] = None  # Première erreur rencontrée (requêtes suivantes annulées)
+
+# Avancement d'un joueur: (nom d'utilisateur, requêtes terminées, requêtes prévues)
+ProgressCallback = Callable[[str, int, int], None]
+
+class FairScheduler:
+    """Exécute les tâches de plusieurs joueurs à tour de rôle (round-robin)"""
+    
+    def __init__(self, concurrency: int):
+        """
+        Initialise l'ordonnanceur
+        
+        Args:
+            concurrency: Tâches exécutées simultanément
+        """
+        self.concurrency = concurrency
+        self._queues: Dict[str, Deque[Callable[[], Awaitable]]] = {}
+        self._turns: Deque[str] = deque()
+        self._running = 0
+        self._changed = asyncio.Condition()
+    
+    def add(self, key: str, job: Callable[[], Awaitable]):
+        """
+        Ajoute une tâche (y compris depuis une tâche en cours)
+        
+        Args:
+            key: Joueur auquel appartient la tâche
+            job: Fonction renvoyant la coroutine à exécuter
+        """
+        queue = self._queues.setdefault(key, deque())
+        if not queue:
+            self._turns.append(key)
+        queue.append(job)
+    
+    def cancel(self, key: str) -> int:
+        """
+        Abandonne les tâches en attente d'un joueur
+        
+        Returns:
+            Nombre de tâches abandonnées
+        """
+        queue = self._queues.get(key)
+        if not queue:
+            return 0
+        count = len(queue)
+        queue.clear()
+        self._turns.remove(key)
+        return count
+    
+    async def _worker(self):
+        """Prend la tâche du joueur suivant jusqu'à épuisement des tâches"""
+        while True:
+            async with self._changed:
+                # Une tâche en cours peut encore en ajouter d'autres
+                await self._changed.wait_for(lambda: self._turns or not self._running)
+                if not self._turns:
+                    return
+                key = self._turns.popleft()
+                queue = self._queues[key]
+                job = queue.popleft()
+                if queue:
+                    self._turns.append(key)
+                self._running += 1
+            
+            try:
+                await job()
+            finally:
+                async with self._changed:
+                    self._running -= 1
+                    self._changed.notify_all()
+    
+    async def run(self):
+        """Exécute toutes les tâches, y compris celles ajoutées en cours de route"""
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+
+class AsyncChessComAPI:
+    """Client asynchrone pour l'API chess.com"""
+    
+    BASE_URL = ChessComAPI.BASE_URL
+    
+    def __init__(
+        self,
+        rate: float = 10.0,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0
+    ):
+        """
+        Initialise le client API
+        
+        Args:
+            rate: Requêtes par seconde autorisées (limiteur partagé)
+            max_concurrency: Requêtes simultanées (taille du pool de connexions)
+            max_retries: Nouvelles tentatives après une réponse 429 ou 5xx
+            base_url: URL de l'API (par défaut: BASE_URL)
+            timeout: Délai maximal d'une requête (secondes)
+        """
+        self.base_url = base_url or self.BASE_URL
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate)
+        self.requests = 0
+        self.throttled = 0
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def __aenter__(self):
+        """Ouvre la session HTTP et son pool de connexions"""
+        # Créé dans la boucle en cours, comme la session
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': 'ChessAssist/0.1.0 (Educational Tool)'}
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Ferme la session HTTP"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def _make_request(self, endpoint: str) -> Dict:
+        """
+        Effectue une requête à l'API en respectant le débit partagé
+        
+        Une réponse 429 ralentit le limiteur (et suspend les envois
+        pendant Retry-After) puis la requête est retentée; il en va de
+        même, avec un délai croissant, pour les erreurs 5xx.
+        
+        Args:
+            endpoint: Point de terminaison de l'API
+        
+        Returns:
+            Réponse JSON de l'API
+        """
+        if self.session is None:
+            raise RuntimeError("Session HTTP non initialisée")
+        
+        url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    async with self.session.get(url) as response:
+                        retry = attempt < self.max_retries and (response.status == 429 or response.status >= 500)
+                        if response.status == 429 and retry:
+                            self.throttled += 1
+                            self.bucket.throttle(parse_retry_after(response.headers.get("Retry-After")) or 1.0)
+                        elif not retry:
+                            response.raise_for_status()
+                            data = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # ValueError: réponse JSON invalide
+                raise RuntimeError(f"Erreur API chess.com: {e}")
+            
+            if not retry:
+                self.bucket.recover()
+                return data
+            
+            if response.status >= 500:
+                await asyncio.sleep(min(2 ** attempt * 0.5, 10.0))
+            attempt += 1
+    
+    async def get_player_profile(self, username: str) -> Dict:
+        """
+        Récupère le profil d'un joueur
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+        
+        Returns:
+            Données du profil joueur
+        """
+        return await self._make_request(f"/player/{username}")
+    
+    async def get_player_stats(self, username: str) -> Dict:
+        """
+        Récupère les statistiques d'un joueur
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+        
+        Returns:
+            Statistiques du joueur
+        """
+        return await self._make_request(f"/player/{username}/stats")
+    
+    async def get_archives(self, username: str) -> List[Tuple[int, int]]:
+        """
+        Récupère la liste des mois où le joueur a des parties
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+        
+        Returns:
+            Couples (année, mois), du plus récent au plus ancien
+        """
+        data = await self._make_request(f"/player/{username}/games/archives")
+        return parse_archives(data.get("archives", []))
+    
+    async def get_monthly_games(self, username: str, year: int, month: int) -> List[Dict]:
+        """
+        Récupère les parties d'un mois donné
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            year: Année
+            month: Mois (1-12)
+        
+        Returns:
+            Liste des parties du mois
+        """
+        data = await self._make_request(f"/player/{username}/games/{year:04d}/{month:02d}")
+        return data.get("games", [])
+    
+    async def get_many_monthly_games(
+        self,
+        usernames: Iterable[str],
+        months: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[str, int, int], List[Dict]]:
+        """
+        Récupère en parallèle les parties de plusieurs joueurs et mois
+        
+        Args:
+            usernames: Noms d'utilisateur chess.com
+            months: Couples (année, mois)
+        
+        Returns:
+            Parties indexées par (joueur, année, mois)
+        """
+        keys = [(username, year, month) for username in usernames for year, month in months]
+        results = await asyncio.gather(*(self.get_monthly_games(*key) for key in keys))
+        return dict(zip(keys, results))
+    
+    async def get_recent_games(self, username: str, limit: int = 10) -> List[GameInfo]:
+        """
+        Récupère les parties récentes d'un joueur
+        
+        Les mois de l'index des archives sont demandés du plus récent au
+        plus ancien: le dernier mois seul, puis au plus max_concurrency
+        mois simultanés, selon le nombre de parties encore manquantes
+        (voir months_to_fetch).
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+            limit: Nombre maximum de parties à récupérer
+        
+        Returns:
+            Liste des parties récentes, de la plus récente à la plus ancienne
+        """
+        archives = await self.get_archives(username)
+        games = []
+        fetched = 0
+        while fetched < len(archives) and len(games) < limit:
+            batch = archives[fetched:fetched + months_to_fetch(fetched, len(games), limit, self.max_concurrency)]
+            fetched += len(batch)
+            monthly = await self.get_many_monthly_games([username], batch)
+            for monthly_games in monthly.values():
+                games.extend(monthly_games)
+        
+        # Tri en colonnes; seules les parties retenues sont décodées
+        newest = GameBatch.from_games(games).newest(limit)
+        return [game for game in map(ChessComAPI._parse_game_data, newest.games) if game]
+    
+    async def get_club_members(self, club: str) -> List[str]:
+        """
+        Récupère les membres d'un club
+        
+        Args:
+            club: Identifiant du club dans son URL (ex: "chess-com-developer-community")
+        
+        Returns:
+            Noms d'utilisateur des membres (actifs cette semaine en premier)
+        """
+        data = await self._make_request(f"/club/{club}/members")
+        members = (data.get(group, []) for group in ("weekly", "monthly", "all_time"))
+        return list(dict.fromkeys(member["username"] for group in members for member in group))
+    
+    async def fetch_players(
+        self,
+        usernames: Iterable[str],
+        months: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, PlayerData]:
+        """
+        Récupère profil, statistiques et archives de nombreux joueurs
+        
+        Les requêtes de tous les joueurs partagent la session, le limiteur
+        de débit et max_concurrency requêtes simultanées; elles sont
+        distribuées à tour de rôle entre joueurs, si bien qu'un joueur à
+        l'historique chargé ne retarde pas les autres. Une erreur sur un
+        joueur (ex: compte fermé) annule ses requêtes restantes sans
+        interrompre les autres.
+        
+        Args:
+            usernames: Noms d'utilisateur chess.com
+            months: Nombre de mois récents dont les parties sont aussi récupérées
+            on_progress: Appelé après chaque requête d'un joueur; le dernier
+                appel pour un joueur a autant de requêtes terminées que prévues
+        
+        Returns:
+            Données par nom d'utilisateur, dans l'ordre de la liste
+        """
+        scheduler = FairScheduler(self.max_concurrency)
+        players = {username: PlayerData(username) for username in usernames}
+        done = dict.fromkeys(players, 0)
+        total = dict.fromkeys(players, 3)
+        
+        def submit(username: str, request: Callable[[], Awaitable], store: Callable[[PlayerData, object], None]):
+            async def job():
+                player = players[username]
+                try:
+                    store(player, await request())
+                    done[username] += 1
+                except RuntimeError as e:
+                    if player.error is None:
+                        player.error = str(e)
+                    total[username] -= scheduler.cancel(username) + 1
+                if on_progress is not None:
+                    on_progress(username, done[username], total[username])
+            
+            scheduler.add(username, job)
+        
+        def store_archives(player: PlayerData, archives: List[Tuple[int, int]]):
+            player.archives = archives
+            for year, month in archives[:months]:
+                total[player.username] += 1
+                submit(
+                    player.username,
+                    lambda year=year, month=month: self.get_monthly_games(player.username, year, month),
+                    lambda player, games, key=(year, month): player.games.__setitem__(key, games)
+                )
+        
+        for username in players:
+            submit(username, lambda username=username: self.get_player_profile(username),
+                   lambda player, profile: setattr(player, "profile", profile))
+            submit(username, lambda username=username: self.get_player_stats(username),
+                   lambda player, stats: setattr(player, "stats", stats))
+            submit(username, lambda username=username: self.get_archives(username), store_archives)
+        
+        await scheduler.run()
+        return players
+    
+    async def fetch_club(
+        self,
+        club: str,
+        months: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, PlayerData]:
+        """
+        Récupère les données de tous les membres d'un club (voir fetch_players)
+        
+        Args:
+            club: Identifiant du club dans son URL
+            months: Nombre de mois récents dont les parties sont aussi récupérées
+            on_progress: Appelé après chaque requête d'un joueur
+        
+        Returns:
+            Données par nom d'utilisateur
+        """
+        members = await self.get_club_members(club)
+        return await self.fetch_players(members, months, on_progress)
+
+def fetch_players(
+    usernames: Iterable[str],
+    months: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+    **kwargs
+) -> Dict[str, PlayerData]:
+    """
+    Version synchrone de AsyncChessComAPI.fetch_players
+    
+    Args:
+        usernames: Noms d'utilisateur chess.com
+        months: Nombre de mois récents dont les parties sont aussi récupérées
+        on_progress: Appelé après chaque requête d'un joueur
+        **kwargs: Arguments pour AsyncChessComAPI (ex: rate, max_concurrency)
+    
+    Returns:
+        Données par nom d'utilisateur
+    """
+    async def run():
+        async with AsyncChessComAPI(**kwargs) as api:
+            return await api.fetch_players(usernames, months, on_progress)
+    
+    return asyncio.run(run())
+
+def fetch_club(
+    club: str,
+    months: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+    **kwargs
+) -> Dict[str, PlayerData]:
+    """
+    Version synchrone de AsyncChessComAPI.fetch_club
+    
+    Args:
+        club: Identifiant du club dans son URL
+        months: Nombre de mois récents dont les parties sont aussi récupérées
+        on_progress: Appelé après chaque requête d'un joueur
+        **kwargs: Arguments pour AsyncChessComAPI (ex: rate, max_concurrency)
+    
+    Returns:
+        Données par nom d'utilisateur
+    """
+    async def run():
+        async with AsyncChessComAPI(**kwargs) as api:
+            return await api.fetch_club(club, months, on_progress)
+    
+    return asyncio.run(run())
@@ -0,0 +1,267 @@
+"""
+Cache disque des réponses de l'API chess.com (index SQLite, corps en fichiers)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Archives mensuelles: /player/<joueur>/games/<année>/<mois>[/pgn]
+MONTHLY_ARCHIVE = re.compile(r"/games/(\d{4})/(\d{2})(/pgn)?$")
+
+# Délai après la fin du mois avant de considérer une archive comme définitive
+# (les parties terminées juste avant minuit peuvent être indexées en retard)
+ARCHIVE_GRACE_PERIOD = 3600.0
+
+def archive_closed_at(url: str) -> Optional[float]:
+    """
+    Instant à partir duquel une archive mensuelle ne change plus
+    
+    Args:
+        url: URL de la requête
+    
+    Returns:
+        Timestamp UTC (début du mois suivant + délai de grâce), ou None
+        si l'URL n'est pas une archive mensuelle
+    """
+    match = MONTHLY_ARCHIVE.search(url)
+    if match is None:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return datetime(year, month, 1, tzinfo=timezone.utc).timestamp() + ARCHIVE_GRACE_PERIOD
+
+@dataclass
+class CachedResponse:
+    """Réponse conservée en cache"""
+    body: Optional[bytes]  # None si lu sans charger le corps (voir path)
+    etag: Optional[str]
+    last_modified: Optional[str]
+    immutable: bool
+    path: Optional[Path] = None  # Fichier contenant le corps
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """En-têtes de revalidation (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """Cache persistant des réponses HTTP, avec éviction par taille"""
+    
+    def __init__(self, directory: Union[str, Path] = "chessassist_http_cache", max_bytes: int = 512 * 1024 * 1024):
+        """
+        Ouvre (ou crée) le cache
+        
+        Args:
+            directory: Répertoire du cache (index et corps des réponses)
+            max_bytes: Taille totale maximale des corps avant éviction LRU
+        """
+        self.directory = Path(directory)
+        self.bodies = self.directory / "bodies"
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                immutable INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_access)")
+        self._conn.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _body_path(self, url: str) -> Path:
+        """Fichier contenant le corps d'une réponse"""
+        return self.bodies / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+    
+    def get(self, url: str, load_body: bool = True) -> Optional[CachedResponse]:
+        """
+        Recherche une réponse en cache
+        
+        Args:
+            url: URL de la requête
+            load_body: Charge le corps en mémoire (sinon seul son chemin est fourni)
+        
+        Returns:
+            Réponse conservée (immutable: utilisable sans requête) ou None
+        """
+        path = self._body_path(url)
+        body = None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, immutable, size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                try:
+                    body = path.read_bytes() if load_body else None
+                    if not path.exists():
+                        raise FileNotFoundError(path)
+                except OSError:
+                    # Corps supprimé hors du cache: l'entrée est oubliée
+                    self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    self._conn.commit()
+                    row = None
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+            if row[2]:
+                self.hits += 1
+                self.bytes_saved += row[3]
+        
+        return CachedResponse(body=body, etag=row[0], last_modified=row[1], immutable=bool(row[2]), path=path)
+    
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Enregistre une réponse
+        
+        Une archive mensuelle téléchargée après la fin de son mois est
+        marquée définitive: elle ne sera plus jamais redemandée.
+        
+        Args:
+            url: URL de la requête
+            body: Corps de la réponse
+            etag: En-tête ETag de la réponse
+            last_modified: En-tête Last-Modified de la réponse
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.bodies)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        self.put_file(url, temp_path, etag, last_modified)
+    
+    def new_body_file(self) -> str:
+        """
+        Crée un fichier temporaire dans le cache, à remplir puis passer à put_file()
+        
+        Returns:
+            Chemin du fichier (sur le même système de fichiers que le cache)
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.bodies)
+        os.close(fd)
+        return temp_path
+    
+    def put_file(self, url: str, temp_path: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Enregistre une réponse déjà écrite dans un fichier (ex: corps reçu en flux)
+        
+        Args:
+            url: URL de la requête
+            temp_path: Fichier contenant le corps, déplacé dans le cache
+            etag: En-tête ETag de la réponse
+            last_modified: En-tête Last-Modified de la réponse
+        """
+        now = time.time()
+        closed_at = archive_closed_at(url)
+        immutable = closed_at is not None and now >= closed_at
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, self._body_path(url))
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, etag, last_modified, fetched_at, immutable, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, now, int(immutable), size, now)
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def mark_revalidated(self, url: str):
+        """
+        Enregistre une réponse 304: le corps en cache reste valable
+        
+        Args:
+            url: URL de la requête
+        """
+        now = time.time()
+        closed_at = archive_closed_at(url)
+        with self._lock:
+            self.revalidated += 1
+            row = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self.bytes_saved += row[0] if row else 0
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, immutable = ? WHERE url = ?",
+                (now, int(closed_at is not None and now >= closed_at), url)
+            )
+            self._conn.commit()
+    
+    def _evict(self):
+        """Supprime les réponses les moins récemment utilisées au-delà de max_bytes (verrou tenu)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        # Évince un peu plus que nécessaire pour ne pas le refaire à chaque écriture
+        target = int(self.max_bytes * 0.9)
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            try:
+                self._body_path(url).unlink()
+            except OSError:
+                pass
+            total -= size
+    
+    def stats(self) -> Dict:
+        """
+        Statistiques d'utilisation du cache
+        
+        Returns:
+            Dictionnaire avec hits (sans requête), revalidated (304),
+            misses, bytes_saved, entries et size
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "entries": entries,
+            "size": size
+        }
+    
+    def close(self):
+        """Ferme l'index"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
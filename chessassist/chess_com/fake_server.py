@@ -0,0 +1,366 @@
+"""
+Serveur local imitant l'API publique chess.com (tests hors ligne et benchmarks)
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+from datetime import datetime, timezone
+from email.utils import formatdate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import chess
+from aiohttp import web
+
+# Routes de l'API servies par le faux serveur (chemins après /pub)
+ROUTES = [
+    ("profile", re.compile(r"^/player/([^/]+)$")),
+    ("stats", re.compile(r"^/player/([^/]+)/stats$")),
+    ("archives", re.compile(r"^/player/([^/]+)/games/archives$")),
+    ("monthly", re.compile(r"^/player/([^/]+)/games/(\d{4})/(\d{2})$")),
+    ("pgn", re.compile(r"^/player/([^/]+)/games/(\d{4})/(\d{2})/pgn$")),
+    ("members", re.compile(r"^/club/([^/]+)/members$"))
+]
+
+# Issues possibles d'une partie: (résultat des blancs, résultat des noirs, score PGN)
+OUTCOMES = [
+    ("win", "checkmated", "1-0"),
+    ("win", "resigned", "1-0"),
+    ("timeout", "win", "0-1"),
+    ("resigned", "win", "0-1"),
+    ("agreed", "agreed", "1/2-1/2"),
+    ("repetition", "repetition", "1/2-1/2")
+]
+
+TIME_CONTROLS = [("60", "bullet"), ("180+2", "blitz"), ("600", "rapid")]
+
+ECO_CODES = ["B01", "B20", "C00", "C20", "C50", "D02", "D30", "E60", "A04", "A45"]
+
+def month_range(months: int, until: Optional[datetime] = None) -> List[Tuple[int, int]]:
+    """
+    Derniers mois calendaires, du plus ancien au mois courant inclus
+    
+    Args:
+        months: Nombre de mois
+        until: Date du dernier mois (par défaut: maintenant, UTC)
+    
+    Returns:
+        Couples (année, mois)
+    """
+    until = until or datetime.now(timezone.utc)
+    index = until.year * 12 + until.month - 1
+    return [(value // 12, value % 12 + 1) for value in range(index - months + 1, index + 1)]
+
+def synthetic_move_texts(count: int, plies: int, seed: int = 0) -> List[str]:
+    """
+    Génère des suites de coups aléatoires mais reproductibles
+    
+    Args:
+        count: Nombre de suites
+        plies: Nombre maximal de demi-coups par suite
+        seed: Graine du générateur
+    
+    Returns:
+        Coups en notation SAN numérotée (ex: "1. e4 e5 2. Nf3")
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        board = chess.Board()
+        moves = []
+        for _ in range(plies):
+            legal = sorted(board.legal_moves, key=lambda move: move.uci())
+            if not legal:
+                break
+            move = rng.choice(legal)
+            moves.append(move)
+            board.push(move)
+        texts.append(chess.Board().variation_san(moves))
+    return texts
+
+class FakeChessComServer:
+    """
+    Faux serveur chess.com exécuté dans un thread, avec pannes injectables
+    
+    Les réponses viennent des fixtures (réponse JSON par chemin) ou sont
+    générées de façon déterministe: tout nom d'utilisateur (ou ceux de
+    `usernames`) possède `months` mois d'archives jusqu'au mois courant.
+    Le client testé est dirigé vers le serveur par son URL de base:
+    
+        with FakeChessComServer(latency=0.02) as server:
+            api = ChessComAPI(base_url=server.base_url)
+    """
+    
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Dict]] = None,
+        usernames: Optional[Iterable[str]] = None,
+        clubs: Optional[Dict[str, List[str]]] = None,
+        months: int = 12,
+        games_per_month: int = 30,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        error_every: int = 0,
+        retry_after: float = 0.05,
+        etag: bool = True,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Initialise le serveur (démarré par start() ou le gestionnaire de contexte)
+        
+        Args:
+            fixtures: Réponses JSON imposées, par chemin (ex: "/player/alice")
+            usernames: Joueurs existants (par défaut: tous, générés à la demande)
+            clubs: Membres de chaque club, par identifiant
+            months: Mois d'archives par joueur, jusqu'au mois courant
+            games_per_month: Parties générées par joueur et par mois
+            latency: Délai ajouté à chaque réponse (secondes)
+            throttle_every: Répond 429 à une requête sur N (0: jamais)
+            error_every: Répond 503 à une requête sur N (0: jamais)
+            retry_after: Valeur de Retry-After des réponses 429
+            etag: Envoie ETag / Last-Modified et répond 304 aux requêtes conditionnelles
+            seed: Graine des parties générées
+            host: Adresse d'écoute
+            port: Port d'écoute (0: port libre choisi par le système)
+        """
+        self.fixtures = fixtures or {}
+        self.usernames = {name.lower() for name in usernames} if usernames is not None else None
+        self.clubs = clubs or {}
+        self.archive_months = month_range(months)
+        self.games_per_month = games_per_month
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.error_every = error_every
+        self.retry_after = retry_after
+        self.etag = etag
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.base_url: Optional[str] = None
+        
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.paths: List[str] = []
+        
+        self._move_texts = synthetic_move_texts(32, 40, seed)
+        self._bodies: Dict[str, Tuple[bytes, str, str]] = {}
+        self._started_at = formatdate(usegmt=True)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+    
+    def start(self) -> str:
+        """
+        Démarre le serveur dans un thread dédié
+        
+        Returns:
+            URL de base de l'API (équivalent de ChessComAPI.BASE_URL)
+        """
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        
+        async def serve():
+            app = web.Application()
+            app.router.add_get("/pub/{path:.*}", self._handle)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://{self.host}:{self.port}/pub"
+        
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(serve())
+            ready.set()
+            self._loop.run_forever()
+        
+        self._thread = threading.Thread(target=run, name="fake-chess-com", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.base_url
+    
+    def stop(self):
+        """Arrête le serveur et son thread"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+    
+    def stats(self) -> Dict:
+        """Compteurs de requêtes (total, 429, 5xx, 304)"""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "not_modified": self.not_modified
+        }
+    
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Répond à une requête, pannes injectées comprises"""
+        self.requests += 1
+        count = self.requests
+        path = "/" + request.match_info["path"]
+        self.paths.append(path)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        
+        if self.throttle_every and count % self.throttle_every == 0:
+            self.throttled += 1
+            return web.json_response(
+                {"code": 0, "message": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+        if self.error_every and count % self.error_every == 0:
+            self.errors += 1
+            return web.json_response({"code": 0, "message": "Service unavailable"}, status=503)
+        
+        resolved = self._body(path)
+        if resolved is None:
+            return web.json_response({"code": 0, "message": "Data provider not found"}, status=404)
+        body, content_type, tag = resolved
+        
+        headers = {}
+        if self.etag:
+            headers = {"ETag": tag, "Last-Modified": self._started_at}
+            if request.headers.get("If-None-Match") == tag:
+                self.not_modified += 1
+                return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type=content_type, headers=headers)
+    
+    def _body(self, path: str) -> Optional[Tuple[bytes, str, str]]:
+        """Corps, type et ETag de la réponse à un chemin (mémorisés)"""
+        if path in self._bodies:
+            return self._bodies[path]
+        
+        if path in self.fixtures:
+            content = json.dumps(self.fixtures[path]).encode("utf-8")
+            content_type = "application/json"
+        else:
+            for name, pattern in ROUTES:
+                match = pattern.match(path)
+                if match:
+                    break
+            else:
+                return None
+            data = self._generate(name, *match.groups())
+            if data is None:
+                return None
+            if name == "pgn":
+                content, content_type = data.encode("utf-8"), "application/x-chess-pgn"
+            else:
+                content, content_type = json.dumps(data).encode("utf-8"), "application/json"
+        
+        resolved = (content, content_type, '"' + hashlib.sha1(content).hexdigest()[:16] + '"')
+        self._bodies[path] = resolved
+        return resolved
+    
+    def _generate(self, name: str, key: str, *args: str):
+        """Données synthétiques d'une route (None: ressource inexistante)"""
+        if name == "members":
+            if key not in self.clubs:
+                return None
+            return {
+                "weekly": [{"username": username, "joined": 0} for username in self.clubs[key]],
+                "monthly": [],
+                "all_time": []
+            }
+        
+        username = key.lower()
+        if self.usernames is not None and username not in self.usernames:
+            return None
+        
+        if name == "profile":
+            return {
+                "@id": f"{self.base_url}/player/{username}",
+                "url": f"https://www.chess.com/member/{username}",
+                "username": username,
+                "player_id": int(hashlib.sha1(username.encode("utf-8")).hexdigest()[:8], 16),
+                "status": "basic",
+                "joined": 1_500_000_000
+            }
+        if name == "stats":
+            rng = random.Random(f"{self.seed}/{username}")
+            return {
+                f"chess_{time_class}": {"last": {"rating": rng.randint(800, 2400), "date": 1_700_000_000}}
+                for _, time_class in TIME_CONTROLS
+            }
+        if name == "archives":
+            return {"archives": [
+                f"{self.base_url}/player/{username}/games/{year:04d}/{month:02d}"
+                for year, month in self.archive_months
+            ]}
+        
+        games = self.monthly_games(username, int(args[0]), int(args[1]))
+        if name == "pgn":
+            return "\n\n".join(game["pgn"] for game in games) + "\n" if games else ""
+        return {"games": games}
+    
+    def monthly_games(self, username: str, year: int, month: int) -> List[Dict]:
+        """
+        Parties générées d'un joueur pour un mois (vide hors des archives)
+        
+        Args:
+            username: Nom d'utilisateur
+            year: Année
+            month: Mois (1-12)
+        
+        Returns:
+            Parties au format de l'API, de la plus ancienne à la plus récente
+        """
+        if (year, month) not in self.archive_months:
+            return []
+        
+        rng = random.Random(f"{self.seed}/{username}/{year}/{month}")
+        start = datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+        # Le mois courant n'est couvert que jusqu'à maintenant
+        end = min(start + 27 * 24 * 3600, datetime.now(timezone.utc).timestamp())
+        step = (end - start) / max(1, self.games_per_month)
+        games = []
+        for index in range(self.games_per_month):
+            end_time = int(start + index * step + rng.random() * step)
+            opponent = f"opponent{rng.randint(1, 500)}"
+            white, black = (username, opponent) if rng.random() < 0.5 else (opponent, username)
+            white_result, black_result, score = rng.choice(OUTCOMES)
+            time_control, time_class = rng.choice(TIME_CONTROLS)
+            game_id = hashlib.sha1(f"{username}/{year}/{month}/{index}".encode("utf-8")).hexdigest()
+            url = f"https://www.chess.com/game/live/{int(game_id[:10], 16)}"
+            date = datetime.fromtimestamp(end_time, timezone.utc).strftime("%Y.%m.%d")
+            pgn = (
+                f'[Event "Live Chess"]\n[Site "Chess.com"]\n[Date "{date}"]\n'
+                f'[White "{white}"]\n[Black "{black}"]\n[Result "{score}"]\n'
+                f'[ECO "{rng.choice(ECO_CODES)}"]\n[TimeControl "{time_control}"]\n'
+                f'[Link "{url}"]\n\n{rng.choice(self._move_texts)} {score}'
+            )
+            games.append({
+                "uuid": game_id,
+                "url": url,
+                "pgn": pgn,
+                "white": {"username": white, "rating": rng.randint(800, 2400), "result": white_result},
+                "black": {"username": black, "rating": rng.randint(800, 2400), "result": black_result},
+                "time_control": time_control,
+                "time_class": time_class,
+                "end_time": end_time,
+                "rated": rng.random() < 0.9,
+                "rules": "chess"
+            })
+        games.sort(key=lambda game: game["end_time"])
+        return games
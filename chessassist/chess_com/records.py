@@ -0,0 +1,267 @@
+"""
+Représentations des parties chess.com: détaillée, compacte et en colonnes
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+@dataclass
+class GameInfo:
+    """Informations sur une partie"""
+    game_id: str
+    url: str
+    pgn: str
+    white_player: str
+    black_player: str
+    white_rating: int
+    black_rating: int
+    time_control: str
+    end_time: datetime
+    result: str
+    rated: bool
+
+class GameRecord:
+    """Partie au format compact: seuls les champs utiles sont conservés"""
+    
+    __slots__ = (
+        "game_id", "url", "pgn", "white_player", "black_player", "white_rating",
+        "black_rating", "time_control", "end_timestamp", "result", "rated"
+    )
+    
+    def __init__(self, data: Dict):
+        """
+        Initialise l'enregistrement
+        
+        Args:
+            data: Données brutes de la partie (non conservées)
+        """
+        white = data.get("white", {})
+        black = data.get("black", {})
+        self.game_id: str = data.get("uuid", "")
+        self.url: str = data.get("url", "")
+        self.pgn: str = data.get("pgn", "")
+        self.white_player: str = white.get("username", "Unknown")
+        self.black_player: str = black.get("username", "Unknown")
+        self.white_rating: int = white.get("rating", 0)
+        self.black_rating: int = black.get("rating", 0)
+        self.time_control: str = data.get("time_control", "")
+        # Fin de la partie (timestamp brut, sans conversion)
+        self.end_timestamp: int = data.get("end_time") or 0
+        # Résultat du point de vue des blancs
+        self.result: str = white.get("result", "unknown")
+        self.rated: bool = data.get("rated", False)
+    
+    def __repr__(self) -> str:
+        return f"GameRecord({self.game_id!r})"
+    
+    @property
+    def end_time(self) -> datetime:
+        return datetime.fromtimestamp(self.end_timestamp)
+    
+    def to_info(self) -> GameInfo:
+        """Décode tous les champs"""
+        return GameInfo(
+            game_id=self.game_id,
+            url=self.url,
+            pgn=self.pgn,
+            white_player=self.white_player,
+            black_player=self.black_player,
+            white_rating=self.white_rating,
+            black_rating=self.black_rating,
+            time_control=self.time_control,
+            end_time=self.end_time,
+            result=self.result,
+            rated=self.rated
+        )
+
+# Colonnes triables et filtrables; les chaînes sont codées par index de vocabulaire
+BATCH_DTYPE = np.dtype([
+    ("end_time", np.int64),
+    ("white_rating", np.int32),
+    ("black_rating", np.int32),
+    ("white", np.uint32),  # Index dans GameBatch.players
+    ("black", np.uint32),
+    ("time_control", np.uint16),  # Index dans GameBatch.time_controls
+    ("rated", np.bool_)
+])
+
+class GameBatch:
+    """Lot de parties en colonnes (numpy), décodées seulement à l'accès"""
+    
+    def __init__(self, columns: np.ndarray, games: Sequence[Dict], players: List[str], time_controls: List[str]):
+        """
+        Initialise le lot
+        
+        Args:
+            columns: Enregistrements BATCH_DTYPE, un par partie
+            games: Données brutes des parties, dans le même ordre
+            players: Vocabulaire des joueurs (minuscules)
+            time_controls: Vocabulaire des cadences
+        """
+        self.columns = columns
+        self.games = games
+        self.players = players
+        self.time_controls = time_controls
+    
+    @classmethod
+    def from_games(cls, games: Iterable[Dict]) -> "GameBatch":
+        """
+        Construit le lot à partir de parties au format de l'API
+        
+        Args:
+            games: Données brutes des parties (ex: get_monthly_games)
+        
+        Returns:
+            Lot contenant les parties, dans l'ordre
+        """
+        games = list(games)
+        players: Dict[str, int] = {}
+        time_controls: Dict[str, int] = {}
+        whites = [game_data.get("white", {}) for game_data in games]
+        blacks = [game_data.get("black", {}) for game_data in games]
+        columns = np.array(list(zip(
+            [game_data.get("end_time") or 0 for game_data in games],
+            [white.get("rating", 0) for white in whites],
+            [black.get("rating", 0) for black in blacks],
+            [players.setdefault(white.get("username", "Unknown").lower(), len(players)) for white in whites],
+            [players.setdefault(black.get("username", "Unknown").lower(), len(players)) for black in blacks],
+            [time_controls.setdefault(game_data.get("time_control", ""), len(time_controls)) for game_data in games],
+            [bool(game_data.get("rated", False)) for game_data in games]
+        )), dtype=BATCH_DTYPE)
+        return cls(columns, games, list(players), list(time_controls))
+    
+    def __len__(self) -> int:
+        return len(self.columns)
+    
+    def __getitem__(self, index: int) -> GameRecord:
+        return GameRecord(self.games[index])
+    
+    def __iter__(self) -> Iterator[GameRecord]:
+        for game_data in self.games:
+            yield GameRecord(game_data)
+    
+    def take(self, indices: np.ndarray) -> "GameBatch":
+        """
+        Sous-lot des parties d'indices donnés (masque booléen ou indices)
+        
+        Args:
+            indices: Sélection applicable aux colonnes
+        
+        Returns:
+            Lot partageant les vocabulaires et les données brutes
+        """
+        indices = np.arange(len(self))[indices]
+        return GameBatch(self.columns[indices], [self.games[i] for i in indices], self.players, self.time_controls)
+    
+    def ratings(self, player: Optional[str] = None) -> np.ndarray:
+        """
+        Classement de chaque partie
+        
+        Args:
+            player: Joueur dont on veut le classement (sinon moyenne des deux joueurs)
+        
+        Returns:
+            Classements (float64); NaN si le joueur n'a pas joué la partie
+        """
+        white = self.columns["white_rating"].astype(np.float64)
+        black = self.columns["black_rating"].astype(np.float64)
+        if player is None:
+            return (white + black) / 2
+        code = self._code(self.players, player.lower())
+        return np.where(self.columns["white"] == code, white, np.where(self.columns["black"] == code, black, np.nan))
+    
+    @staticmethod
+    def _code(vocabulary: List[str], value: str) -> int:
+        """Code d'une valeur du vocabulaire (-1 si absente: ne correspond à aucune ligne)"""
+        try:
+            return vocabulary.index(value)
+        except ValueError:
+            return -1
+    
+    def filter(
+        self,
+        player: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        time_control: Optional[str] = None,
+        rated: Optional[bool] = None
+    ) -> "GameBatch":
+        """
+        Sélectionne des parties par comparaisons vectorisées sur les colonnes
+        
+        Args:
+            player: Joueur (blancs ou noirs)
+            since: Date de fin minimale
+            until: Date de fin maximale
+            min_rating: Classement minimal (de `player` s'il est donné,
+                moyenne des deux joueurs sinon)
+            max_rating: Classement maximal (même convention)
+            time_control: Cadence chess.com (ex: "600", "180+2")
+            rated: Parties classées (True) ou amicales (False)
+        
+        Returns:
+            Sous-lot, dans l'ordre d'origine
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if player is not None:
+            code = self._code(self.players, player.lower())
+            mask &= (self.columns["white"] == code) | (self.columns["black"] == code)
+        if since is not None:
+            mask &= self.columns["end_time"] >= int(since.timestamp())
+        if until is not None:
+            mask &= self.columns["end_time"] <= int(until.timestamp())
+        if min_rating is not None or max_rating is not None:
+            ratings = self.ratings(player)
+            if min_rating is not None:
+                mask &= ratings >= min_rating
+            if max_rating is not None:
+                mask &= ratings <= max_rating
+        if time_control is not None:
+            mask &= self.columns["time_control"] == self._code(self.time_controls, time_control)
+        if rated is not None:
+            mask &= self.columns["rated"] == rated
+        return self.take(mask)
+    
+    def sort(self, column: str = "end_time", descending: bool = True) -> "GameBatch":
+        """
+        Trie le lot sur une colonne (tri stable)
+        
+        Args:
+            column: Colonne de BATCH_DTYPE (ex: "end_time", "white_rating")
+            descending: Ordre décroissant
+        
+        Returns:
+            Lot trié
+        """
+        values = self.columns[column]
+        order = np.argsort(-values.astype(np.int64) if descending else values, kind="stable")
+        return self.take(order)
+    
+    def newest(self, limit: int) -> "GameBatch":
+        """
+        Parties les plus récentes, de la plus récente à la plus ancienne
+        
+        Seules les `limit` dernières parties sont triées (sélection
+        partielle): le coût reste linéaire pour un grand lot.
+        
+        Args:
+            limit: Nombre maximal de parties
+        
+        Returns:
+            Lot d'au plus `limit` parties
+        """
+        if limit <= 0:
+            return self.take(np.zeros(0, dtype=np.intp))
+        if limit < len(self):
+            selected = np.argpartition(-self.columns["end_time"], limit - 1)[:limit]
+            return self.take(np.sort(selected)).sort()
+        return self.sort()
+    
+    def to_infos(self) -> List[GameInfo]:
+        """Décode toutes les parties du lot"""
+        return [GameRecord(game_data).to_info() for game_data in self.games]
@@ -0,0 +1,263 @@
+"""
+Base locale des parties chess.com (SQLite), synchronisée de façon incrémentale
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from chessassist.chess_com.api import ChessComAPI, GameInfo
+
+# En-tête ECO du PGN fourni par chess.com
+ECO_HEADER = re.compile(r'\[ECO "([^"]*)"\]')
+
+class GameStore:
+    """Parties chess.com conservées sur disque et indexées pour les requêtes"""
+    
+    def __init__(self, path: Union[str, Path] = "chessassist_games.sqlite"):
+        """
+        Ouvre (ou crée) la base
+        
+        Args:
+            path: Chemin du fichier SQLite
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS games (
+                uuid TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                pgn TEXT NOT NULL,
+                white TEXT NOT NULL COLLATE NOCASE,
+                black TEXT NOT NULL COLLATE NOCASE,
+                white_rating INTEGER NOT NULL,
+                black_rating INTEGER NOT NULL,
+                white_result TEXT NOT NULL,
+                black_result TEXT NOT NULL,
+                time_control TEXT NOT NULL,
+                time_class TEXT,
+                eco TEXT,
+                end_time INTEGER NOT NULL,
+                rated INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS games_white ON games(white, end_time);
+            CREATE INDEX IF NOT EXISTS games_black ON games(black, end_time);
+            CREATE INDEX IF NOT EXISTS games_end_time ON games(end_time);
+            CREATE INDEX IF NOT EXISTS games_time_control ON games(time_control);
+            CREATE INDEX IF NOT EXISTS games_eco ON games(eco);
+            CREATE INDEX IF NOT EXISTS games_result ON games(white_result, black_result);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                username TEXT PRIMARY KEY COLLATE NOCASE,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                synced_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def last_synced_month(self, username: str) -> Optional[Tuple[int, int]]:
+        """
+        Dernier mois synchronisé pour un joueur
+        
+        Args:
+            username: Nom d'utilisateur chess.com
+        
+        Returns:
+            Couple (année, mois) ou None si le joueur n'a jamais été synchronisé
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT year, month FROM sync_state WHERE username = ?", (username,)
+            ).fetchone()
+        return tuple(row) if row else None
+    
+    def add_games(self, games: Iterable[Dict], username: Optional[str] = None, month: Optional[Tuple[int, int]] = None) -> int:
+        """
+        Ajoute des parties au format de l'API (les doublons par uuid sont ignorés)
+        
+        Args:
+            games: Données brutes des parties
+            username: Joueur synchronisé (pour enregistrer l'avancement)
+            month: Mois (année, mois) dont les parties sont complètes
+        
+        Returns:
+            Nombre de nouvelles parties
+        """
+        rows = []
+        for game_data in games:
+            if not game_data.get("uuid"):
+                continue
+            white = game_data.get("white", {})
+            black = game_data.get("black", {})
+            eco = ECO_HEADER.search(game_data.get("pgn", ""))
+            rows.append((
+                game_data["uuid"],
+                game_data.get("url", ""),
+                game_data.get("pgn", ""),
+                white.get("username", "Unknown"),
+                black.get("username", "Unknown"),
+                white.get("rating", 0),
+                black.get("rating", 0),
+                white.get("result", "unknown"),
+                black.get("result", "unknown"),
+                game_data.get("time_control", ""),
+                game_data.get("time_class"),
+                eco.group(1) if eco else None,
+                game_data.get("end_time", 0),
+                int(bool(game_data.get("rated", False)))
+            ))
+        
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            added = self._conn.total_changes - before
+            if username is not None and month is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                    (username, month[0], month[1], datetime.now().timestamp())
+                )
+            self._conn.commit()
+        return added
+    
+    def sync(self, api: ChessComAPI, username: str) -> int:
+        """
+        Synchronise les parties d'un joueur depuis chess.com
+        
+        Seuls les mois postérieurs au dernier mois synchronisé sont
+        téléchargés; ce dernier est redemandé car il pouvait être en
+        cours lors de la synchronisation précédente.
+        
+        Args:
+            api: Client chess.com (idéalement avec un ResponseCache)
+            username: Nom d'utilisateur chess.com
+        
+        Returns:
+            Nombre de nouvelles parties
+        """
+        last = self.last_synced_month(username)
+        months = [month for month in api.get_archives(username) if last is None or month >= last]
+        
+        added = 0
+        # Du plus ancien au plus récent: une interruption ne saute aucun mois
+        for year, month in sorted(months):
+            added += self.add_games(api.get_monthly_games(username, year, month), username, (year, month))
+        return added
+    
+    def games(
+        self,
+        player: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        time_control: Optional[str] = None,
+        time_class: Optional[str] = None,
+        eco: Optional[str] = None,
+        result: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[GameInfo]:
+        """
+        Recherche des parties, de la plus récente à la plus ancienne
+        
+        Args:
+            player: Joueur (blancs ou noirs)
+            since: Date de fin minimale
+            until: Date de fin maximale
+            time_control: Cadence chess.com (ex: "600", "180+2")
+            time_class: Catégorie de cadence (ex: "blitz", "rapid")
+            eco: Code ECO ou préfixe (ex: "C5")
+            result: Résultat chess.com (ex: "win", "checkmated"), du point
+                de vue de `player` s'il est donné, des blancs sinon
+            limit: Nombre maximal de parties
+        
+        Returns:
+            Parties au format GameInfo
+        """
+        clauses, params = [], []
+        if player is not None:
+            if result is not None:
+                clauses.append("((white = ? AND white_result = ?) OR (black = ? AND black_result = ?))")
+                params += [player, result, player, result]
+            else:
+                clauses.append("(white = ? OR black = ?)")
+                params += [player, player]
+        elif result is not None:
+            clauses.append("white_result = ?")
+            params.append(result)
+        if since is not None:
+            clauses.append("end_time >= ?")
+            params.append(int(since.timestamp()))
+        if until is not None:
+            clauses.append("end_time <= ?")
+            params.append(int(until.timestamp()))
+        if time_control is not None:
+            clauses.append("time_control = ?")
+            params.append(time_control)
+        if time_class is not None:
+            clauses.append("time_class = ?")
+            params.append(time_class)
+        if eco is not None:
+            clauses.append("eco LIKE ?")
+            params.append(eco + "%")
+        
+        query = (
+            "SELECT uuid, url, pgn, white, black, white_rating, black_rating, "
+            "time_control, end_time, white_result, rated FROM games"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY end_time DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [
+            GameInfo(
+                game_id=row[0],
+                url=row[1],
+                pgn=row[2],
+                white_player=row[3],
+                black_player=row[4],
+                white_rating=row[5],
+                black_rating=row[6],
+                time_control=row[7],
+                end_time=datetime.fromtimestamp(row[8]),
+                result=row[9],
+                rated=bool(row[10])
+            )
+            for row in rows
+        ]
+    
+    def recent_games(self, username: str, limit: int = 10) -> List[GameInfo]:
+        """Équivalent hors ligne de ChessComAPI.get_recent_games"""
+        return self.games(player=username, limit=limit)
+    
+    def count(self, player: Optional[str] = None) -> int:
+        """Nombre de parties en base (d'un joueur ou au total)"""
+        with self._lock:
+            if player is None:
+                return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM games WHERE white = ? OR black = ?", (player, player)
+            ).fetchone()[0]
@@ -3,6 +3,8 @@ Commandes CLI pour ChessAssist
 """
 
 import click
+import subprocess
+import sys
 from rich.console import Console
 from rich.table import Table
 from rich.progress import track
@@ -94,4 +96,55 @@ def stats(username, period):
     console.print("\n[bold]Points d'amélioration détectés:[/bold]")
     console.print("• Finales de tours - 23% d'erreurs")
     console.print("• Ouvertures avec les noirs - 31% de précision")
-    console.print("• Gestion du temps - 12% de parties perdues au temps")
\ No newline at end of file
+    console.print("• Gestion du temps - 12% de parties perdues au temps")
+
+@click.command()
+@click.option('--stockfish', 'stockfish_path', help='Chemin vers l\'exécutable Stockfish')
+@click.option('--socket', 'socket_path', help='Chemin du socket Unix du démon')
+@click.option('--engines', default=1, show_default=True, help='Nombre de moteurs gardés en mémoire')
+@click.option('--threads', default=1, show_default=True, help='Option UCI Threads de chaque moteur')
+@click.option('--hash', 'hash_mb', default=128, show_default=True, help='Option UCI Hash de chaque moteur (Mo)')
+@click.option('--idle-timeout', default=600.0, show_default=True, help='Arrêt après ce délai sans requête (secondes)')
+@click.option('--detach', is_flag=True, help='Lance le démon en arrière-plan')
+def daemon(stockfish_path, socket_path, engines, threads, hash_mb, idle_timeout, detach):
+    """Lancer le démon d'analyse (moteurs Stockfish persistants)"""
+    from chessassist.core.analyzer import GameAnalyzer
+    from chessassist.core.daemon import AnalysisDaemon, default_socket_path
+    
+    stockfish_path = stockfish_path or GameAnalyzer().stockfish_path
+    socket_path = socket_path or default_socket_path()
+    
+    if detach:
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "chessassist", "daemon",
+                "--stockfish", stockfish_path,
+                "--socket", socket_path,
+                "--engines", str(engines),
+                "--threads", str(threads),
+                "--hash", str(hash_mb),
+                "--idle-timeout", str(idle_timeout)
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        console.print(f"[bold green]Démon d'analyse lancé en arrière-plan[/bold green] ({socket_path})")
+        return
+    
+    console.print(f"[bold green]Démon d'analyse[/bold green] en écoute sur {socket_path}")
+    console.print(f"Moteurs: {engines} - arrêt après {idle_timeout:.0f}s d'inactivité")
+    
+    server = AnalysisDaemon(
+        stockfish_path,
+        socket_path=socket_path,
+        engines=engines,
+        engine_options={"Threads": threads, "Hash": hash_mb},
+        idle_timeout=idle_timeout
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    console.print(f"Démon arrêté après {server.requests} requêtes")
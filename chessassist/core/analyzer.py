@@ -5,51 +5,281 @@ Analyseur de parties d'échecs utilisant Stockfish
 import chess
 import chess.engine
 import chess.pgn
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+import io
 import os
+import shutil
+import time
 from dataclasses import dataclass
+from chessassist.core.cache import EvaluationCache, engine_key
+from chessassist.core.daemon import connect_daemon
+from chessassist.core.metrics import AnalysisMetrics
+from chessassist.core.pgn_stream import HeaderFilter, iter_games
+from chessassist.openings.book import OpeningBook
+
+# Score attribué à un mat (en centipions), diminué de la distance au mat
+MATE_SCORE = 10000
+
+# Temps de recherche minimal par position en mode budget (en secondes)
+MIN_SEARCH_TIME = 0.01
+
+# Précision d'un coup selon sa perte d'évaluation: (perte maximale en pions, précision)
+ACCURACY_STEPS = ((0.0, 100.0), (0.1, 95.0), (0.3, 85.0), (0.6, 70.0), (1.0, 50.0))
+BLUNDER_ACCURACY = 25.0
+
+# Précision minimale de excellent, good, inaccuracy et mistake (en deçà: blunder)
+CLASSIFICATION_THRESHOLDS = (95.0, 85.0, 70.0, 50.0)
 
 @dataclass
 class MoveAnalysis:
     """Résultat d'analyse d'un coup"""
     move: str
-    evaluation: float
+    evaluation: float  # En pions, du point de vue des blancs
     best_move: str
     accuracy: float
-    classification: str  # "excellent", "good", "inaccuracy", "mistake", "blunder"
+    classification: str  # "book", "excellent", "good", "inaccuracy", "mistake", "blunder"
+    time_spent: float = 0.0  # Temps moteur consacré au coup, en secondes
+
+def find_stockfish() -> str:
+    """Trouve automatiquement le chemin vers Stockfish"""
+    common_paths = [
+        "/usr/local/bin/stockfish",
+        "/usr/bin/stockfish",
+        "/opt/homebrew/bin/stockfish",
+        "stockfish"
+    ]
+    
+    for path in common_paths:
+        if os.path.exists(path) or os.system(f"which {path} > /dev/null 2>&1") == 0:
+            return path
+    
+    raise FileNotFoundError("Stockfish introuvable. Installez-le ou spécifiez le chemin.")
+
+def same_engine(first, second) -> bool:
+    """Indique si deux chemins (ou commandes) désignent le même exécutable"""
+    def resolve(path):
+        if isinstance(path, str):
+            return os.path.realpath(shutil.which(path) or path)
+        return path
+    
+    return first is not None and second is not None and resolve(first) == resolve(second)
+
+def read_game(pgn: Union[str, chess.pgn.Game]) -> chess.pgn.Game:
+    """Lit une partie PGN (texte ou partie déjà lue)"""
+    if isinstance(pgn, chess.pgn.Game):
+        return pgn
+    
+    game = chess.pgn.read_game(io.StringIO(pgn))
+    if not game:
+        raise ValueError("Format PGN invalide")
+    return game
+
+def book_entry() -> Dict:
+    """Entrée d'une position théorique, non évaluée par le moteur"""
+    return {"evaluation": 0.0, "best_move": None, "depth": 0, "nodes": 0, "book": True}
+
+def terminal_entry(board: chess.Board) -> Optional[Dict]:
+    """Évalue une position terminale sans moteur (None si la partie continue)"""
+    if board.is_checkmate():
+        mated = -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
+        return {"evaluation": mated / 100.0, "best_move": None, "depth": 0, "nodes": 0}
+    if board.is_game_over():
+        return {"evaluation": 0.0, "best_move": None, "depth": 0, "nodes": 0}
+    return None
+
+def entry_from_info(board: chess.Board, info: Dict) -> Dict:
+    """Convertit les informations du moteur en évaluation du point de vue des blancs"""
+    score = info.get("score", chess.engine.PovScore(chess.engine.Cp(0), board.turn))
+    best_move = info.get("pv", [None])[0]
+    
+    return {
+        "evaluation": score.white().score(mate_score=MATE_SCORE) / 100.0,
+        "best_move": str(best_move) if best_move else None,
+        "depth": info.get("depth", 0),
+        "nodes": info.get("nodes", 0)
+    }
+
+def position_result(board: chess.Board, info: Dict) -> Dict:
+    """Met en forme le résultat d'analyse_position (point de vue du trait)"""
+    evaluation = info.get("score", chess.engine.PovScore(chess.engine.Cp(0), board.turn))
+    if evaluation.is_mate():
+        eval_value = float('inf') if evaluation.relative.mate() > 0 else float('-inf')
+    else:
+        eval_value = evaluation.relative.score() / 100.0
+    
+    best_move = info.get("pv", [None])[0]
+    
+    return {
+        "evaluation": eval_value,
+        "best_move": str(best_move) if best_move else None,
+        "depth": info.get("depth", 0),
+        "seldepth": info.get("seldepth", 0),
+        "nodes": info.get("nodes", 0),
+        "nps": info.get("nps", 0),
+        "time": info.get("time", 0.0),
+        "tbhits": info.get("tbhits", 0),
+        "hashfull": info.get("hashfull", 0),
+        "cached": info.get("cached", False)
+    }
+
+def fill_forced_entries(moves: List[chess.Move], entries: List[Optional[Dict]]):
+    """
+    Complète les positions à coup unique à partir de la position suivante
+    
+    Args:
+        moves: Coups joués
+        entries: Évaluations des positions, None pour les coups forcés
+    """
+    for index in range(len(moves) - 1, -1, -1):
+        if entries[index] is None or entries[index].get("forced"):
+            following = entries[index + 1]
+            entries[index] = {
+                "evaluation": following.get("evaluation", 0.0),
+                "best_move": str(moves[index]),
+                "depth": following.get("depth", 0),
+                "nodes": 0,
+                "time": 0.0,
+                "forced": True
+            }
+
+def build_analyses(turn: bool, moves: List[chess.Move], entries: List[Dict]) -> List[MoveAnalysis]:
+    """
+    Construit les analyses des coups à partir des évaluations des positions
+    
+    Args:
+        turn: Couleur au trait dans la position initiale
+        moves: Coups joués
+        entries: Évaluations des positions (une de plus que de coups)
+    
+    Returns:
+        Liste des analyses de chaque coup
+    """
+    analyses = []
+    
+    for index, (move, before, after) in enumerate(zip(moves, entries, entries[1:])):
+        if before.get("book"):
+            # Coup théorique: ni recherche ni perte
+            accuracy = 100.0
+        elif str(move) == before.get("best_move"):
+            # Le coup joué est celui du moteur: aucune perte possible
+            accuracy = 100.0
+        else:
+            accuracy = calculate_accuracy(
+                before.get("evaluation", 0),
+                after.get("evaluation", 0),
+                turn  # Couleur qui joue le coup
+            )
+        
+        analyses.append(MoveAnalysis(
+            move=str(move),
+            evaluation=after.get("evaluation", 0),
+            best_move=before.get("best_move", ""),
+            accuracy=accuracy,
+            classification="book" if before.get("book") else classify_move(accuracy),
+            # La recherche de la position initiale est comptée avec le premier coup
+            time_spent=after.get("time", 0.0) + (before.get("time", 0.0) if index == 0 else 0.0)
+        ))
+        turn = not turn
+    
+    return analyses
+
+def calculate_accuracy(eval_before: float, eval_after: float, turn: bool) -> float:
+    """
+    Calcule la précision d'un coup
+    
+    Args:
+        eval_before: Évaluation avant le coup (point de vue des blancs)
+        eval_after: Évaluation après le coup (point de vue des blancs)
+        turn: True si ce sont les blancs qui jouent le coup
+    
+    Returns:
+        Précision entre 0 et 100
+    """
+    # Ajuste l'évaluation selon la couleur
+    if not turn:  # Si c'est aux noirs
+        eval_before = -eval_before
+        eval_after = -eval_after
+    
+    # Calcule la perte d'évaluation
+    eval_loss = eval_before - eval_after
+    
+    # Convertit en pourcentage de précision (coup parfait, excellent, bon,
+    # imprécision, erreur, sinon gaffe)
+    for max_loss, accuracy in ACCURACY_STEPS:
+        if eval_loss <= max_loss:
+            return accuracy
+    return BLUNDER_ACCURACY
+
+def classify_move(accuracy: float) -> str:
+    """Classifie un coup selon sa précision (seuils CLASSIFICATION_THRESHOLDS)"""
+    for name, threshold in zip(("excellent", "good", "inaccuracy", "mistake"), CLASSIFICATION_THRESHOLDS):
+        if accuracy >= threshold:
+            return name
+    return "blunder"
 
 class GameAnalyzer:
     """Analyseur de parties d'échecs"""
     
-    def __init__(self, stockfish_path: Optional[str] = None):
+    def __init__(
+        self,
+        stockfish_path: Optional[str] = None,
+        engine_options: Optional[Dict] = None,
+        cache: Optional[EvaluationCache] = None,
+        book: Optional[OpeningBook] = None,
+        use_daemon: bool = False,
+        daemon_socket: Optional[str] = None,
+        max_restarts: int = 3
+    ):
         """
         Initialise l'analyseur
         
         Args:
             stockfish_path: Chemin vers l'exécutable Stockfish
+            engine_options: Options UCI à appliquer au moteur (ex: Threads, Hash)
+            cache: Cache persistant des évaluations (optionnel)
+            book: Livre d'ouvertures; les coups théoriques ne sont pas cherchés
+            use_daemon: Utilise le démon d'analyse s'il est lancé avec le
+                même exécutable Stockfish (désactivé par défaut)
+            daemon_socket: Socket du démon (par défaut: default_socket_path())
+            max_restarts: Nombre de relances successives du moteur après un
+                arrêt inattendu (remis à zéro après chaque recherche réussie)
         """
         self.stockfish_path = stockfish_path or self._find_stockfish()
+        self.engine_options = engine_options or {}
+        self.cache = cache
+        self.book = book
+        self.use_daemon = use_daemon
+        self.daemon_socket = daemon_socket
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.metrics = AnalysisMetrics()
+        self.last_game_metrics: Optional[AnalysisMetrics] = None
+        self._game_metrics: Optional[AnalysisMetrics] = None
         self.engine = None
+        self._engine_key = None
     
-    def _find_stockfish(self) -> str:
-        """Trouve automatiquement le chemin vers Stockfish"""
-        common_paths = [
-            "/usr/local/bin/stockfish",
-            "/usr/bin/stockfish",
-            "/opt/homebrew/bin/stockfish",
-            "stockfish"
-        ]
+    def __enter__(self):
+        """
+        Démarre le moteur Stockfish
         
-        for path in common_paths:
-            if os.path.exists(path) or os.system(f"which {path} > /dev/null 2>&1") == 0:
-                return path
+        Avec use_daemon, si le démon d'analyse est lancé avec le même
+        exécutable, ses moteurs déjà chauds sont utilisés à la place d'un
+        nouveau processus. Un démon lancé avec un autre moteur est ignoré;
+        les options moteur propres à l'analyseur imposent aussi un
+        processus dédié.
+        """
+        if self.use_daemon and not self.engine_options:
+            daemon = connect_daemon(self.daemon_socket)
+            if daemon is not None and same_engine(daemon.path, self.stockfish_path):
+                self.engine = daemon
+                return self
+            if daemon is not None:
+                daemon.quit()
         
-        raise FileNotFoundError("Stockfish introuvable. Installez-le ou spécifiez le chemin.")
-    
-    def __enter__(self):
-        """Démarre le moteur Stockfish"""
         try:
             self.engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
+            if self.engine_options:
+                self.engine.configure(self.engine_options)
             return self
         except Exception as e:
             raise RuntimeError(f"Impossible de démarrer Stockfish: {e}")
@@ -58,6 +288,102 @@ class GameAnalyzer:
         """Ferme le moteur Stockfish"""
         if self.engine:
             self.engine.quit()
+        self._engine_key = None
+    
+    def restart_engine(self):
+        """Relance le moteur (ou se reconnecte au démon) après un arrêt inattendu"""
+        if self.engine:
+            try:
+                self.engine.quit()
+            except (chess.engine.EngineError, OSError):
+                pass  # Processus déjà mort
+        self.engine = None
+        self._engine_key = None
+        self.restarts += 1
+        self._increment("engine_restarts")
+        self.__enter__()
+    
+    def _analyse(self, board: chess.Board, limit: chess.engine.Limit, min_depth: int = 0) -> Dict:
+        """
+        Lance une recherche moteur sur une position
+        
+        Args:
+            board: Position à analyser
+            limit: Limite de recherche (temps, profondeur, noeuds)
+            min_depth: Profondeur minimale d'une entrée du cache reprise ou
+                d'un résultat enregistré dans le cache
+            
+        Returns:
+            Informations brutes retournées par le moteur
+        """
+        if not self.engine:
+            raise RuntimeError("Moteur Stockfish non initialisé")
+        
+        start = time.perf_counter()
+        cached = self._cache_lookup(board, limit, self.engine, min_depth)
+        if cached is not None:
+            cached["cached"] = True
+            self._record_search(time.perf_counter() - start, cached)
+            return cached
+        
+        try:
+            info = self.engine.analyse(board, limit)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        
+        self._record_search(time.perf_counter() - start, info)
+        if info.get("depth", 0) >= min_depth:
+            self._cache_store(board, limit, info)
+        return info
+    
+    def _active_metrics(self) -> List[AnalysisMetrics]:
+        """Métriques à mettre à jour: cumul de l'analyseur et partie en cours"""
+        if self._game_metrics is None:
+            return [self.metrics]
+        return [self.metrics, self._game_metrics]
+    
+    def _record_search(self, elapsed: float, info: Dict):
+        """Enregistre une recherche terminée dans les métriques"""
+        for metrics in self._active_metrics():
+            metrics.record_search(elapsed, info, cached=info.get("cached", False))
+    
+    def _record_error(self, error: BaseException):
+        """Enregistre une recherche en échec dans les métriques"""
+        for metrics in self._active_metrics():
+            metrics.record_error(error)
+    
+    def _increment(self, counter: str):
+        """Incrémente un compteur des métriques"""
+        for metrics in self._active_metrics():
+            metrics.increment(counter)
+    
+    def _cache_lookup(self, board: chess.Board, limit: chess.engine.Limit, engine, min_depth: int = 0) -> Optional[Dict]:
+        """
+        Cherche une évaluation réutilisable dans le cache
+        
+        Args:
+            board: Position à analyser
+            limit: Limite de recherche demandée
+            engine: Moteur qui ferait la recherche (pour son identifiant)
+            min_depth: Profondeur minimale supplémentaire
+            
+        Returns:
+            Informations en cache ou None
+        """
+        if self.cache is None:
+            return None
+        
+        if self._engine_key is None:
+            self._engine_key = engine_key(dict(engine.id), self.engine_options)
+        
+        # Une entrée n'est réutilisée que si elle est au moins aussi profonde
+        return self.cache.lookup(board, self._engine_key, limit, min_depth)
+    
+    def _cache_store(self, board: chess.Board, limit: chess.engine.Limit, info: Dict):
+        """Enregistre le résultat d'une recherche dans le cache"""
+        if self.cache is not None and self._engine_key is not None:
+            self.cache.store(board, self._engine_key, limit, info)
     
     def analyze_position(self, board: chess.Board, time_limit: float = 1.0) -> Dict:
         """
@@ -74,22 +400,11 @@ class GameAnalyzer:
             raise RuntimeError("Moteur Stockfish non initialisé")
         
         try:
-            info = self.engine.analyse(board, chess.engine.Limit(time=time_limit))
-            
-            evaluation = info.get("score", chess.engine.Cp(0))
-            if evaluation.is_mate():
-                eval_value = float('inf') if evaluation.mate() > 0 else float('-inf')
-            else:
-                eval_value = evaluation.relative.cp / 100.0 if evaluation.relative.cp else 0.0
-            
-            best_move = info.get("pv", [None])[0]
-            
-            return {
-                "evaluation": eval_value,
-                "best_move": str(best_move) if best_move else None,
-                "depth": info.get("depth", 0),
-                "nodes": info.get("nodes", 0)
-            }
+            start = time.perf_counter()
+            info = self._analyse(board, chess.engine.Limit(time=time_limit))
+            result = position_result(board, info)
+            result["elapsed"] = time.perf_counter() - start
+            return result
         except Exception as e:
             return {
                 "evaluation": 0.0,
@@ -97,98 +412,383 @@ class GameAnalyzer:
                 "error": str(e)
             }
     
-    def analyze_game(self, pgn_text: str, time_per_move: float = 1.0) -> List[MoveAnalysis]:
+    def _evaluate(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        adaptive: bool = False,
+        min_depth: int = 0
+    ) -> Dict:
+        """
+        Évalue une position du point de vue des blancs
+        
+        Les positions terminales (mat, pat, nulle) sont évaluées sans
+        appel au moteur. Les mats sont ramenés à un score fini
+        (MATE_SCORE moins la distance au mat) pour rester comparables.
+        
+        Args:
+            board: Position à évaluer
+            limit: Limite de recherche
+            adaptive: Arrête la recherche dès que l'évaluation est stable
+            min_depth: Profondeur minimale des résultats repris du cache
+                ou enregistrés dans le cache (voir _analyse)
+            
+        Returns:
+            Dictionnaire contenant l'évaluation (en pions, point de vue
+            des blancs), le meilleur coup, la profondeur, les noeuds et
+            le temps passé
+        """
+        entry = self._terminal_entry(board)
+        if entry is not None:
+            return entry
+        
+        start = time.perf_counter()
+        while True:
+            try:
+                if adaptive:
+                    info = self._adaptive_search(board, limit)
+                else:
+                    info = self._analyse(board, limit, min_depth)
+                break
+            except chess.engine.EngineTerminatedError as e:
+                if self.restarts >= self.max_restarts:
+                    raise RuntimeError(f"Stockfish arrêté {self.restarts + 1} fois de suite: {e}") from e
+                self.restart_engine()
+            except Exception as e:
+                return {"evaluation": 0.0, "best_move": None, "error": str(e)}
+        
+        self.restarts = 0
+        entry = entry_from_info(board, info)
+        entry["time"] = time.perf_counter() - start
+        return entry
+    
+    def _adaptive_search(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        min_depth: int = 8,
+        stable_depths: int = 3,
+        tolerance: int = 20
+    ) -> Dict:
+        """
+        Recherche interrompue dès que l'évaluation se stabilise
+        
+        La recherche s'arrête quand les scores des dernières profondeurs
+        d'approfondissement itératif restent dans une fenêtre de
+        `tolerance` centipions; sinon elle va jusqu'à `limit`.
+        
+        Args:
+            board: Position à analyser
+            limit: Limite maximale de recherche
+            min_depth: Profondeur minimale avant tout arrêt anticipé
+            stable_depths: Nombre de profondeurs consécutives à comparer
+            tolerance: Écart maximal entre ces scores (en centipions)
+            
+        Returns:
+            Informations brutes retournées par le moteur
+        """
+        if not self.engine:
+            raise RuntimeError("Moteur Stockfish non initialisé")
+        
+        if not hasattr(self.engine, "analysis"):
+            # Le démon ne diffuse pas les infos intermédiaires
+            return self._analyse(board, limit)
+        
+        start = time.perf_counter()
+        cached = self._cache_lookup(board, limit, self.engine)
+        if cached is not None:
+            cached["cached"] = True
+            self._record_search(time.perf_counter() - start, cached)
+            return cached
+        
+        try:
+            info = self._stable_analysis(board, limit, min_depth, stable_depths, tolerance)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        
+        elapsed = time.perf_counter() - start
+        self._record_search(elapsed, info)
+        # Recherche souvent arrêtée avant la limite: seul le temps réellement
+        # passé est enregistré, pour qu'une recherche plus longue ne s'en
+        # contente pas (voir EvaluationCache.get)
+        self._cache_store(board, chess.engine.Limit(time=min(limit.time, elapsed)) if limit.time else limit, info)
+        return info
+    
+    def _stable_analysis(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        min_depth: int,
+        stable_depths: int,
+        tolerance: int
+    ) -> Dict:
+        """Suit l'approfondissement itératif et l'arrête une fois le score stable"""
+        scores = {}
+        with self.engine.analysis(board, limit) as analysis:
+            for info in analysis:
+                if "score" not in info or "depth" not in info or info.get("multipv", 1) != 1:
+                    continue
+                
+                scores[info["depth"]] = info["score"].relative.score(mate_score=MATE_SCORE)
+                depth = info["depth"]
+                recent = [scores.get(d) for d in range(depth - stable_depths + 1, depth + 1)]
+                if depth >= min_depth and None not in recent and max(recent) - min(recent) <= tolerance:
+                    analysis.stop()
+                    break
+            
+            analysis.wait()
+            return dict(analysis.info)
+    
+    def _terminal_entry(self, board: chess.Board) -> Optional[Dict]:
+        """Évalue une position terminale sans moteur (None si la partie continue)"""
+        if board.is_game_over():
+            self._increment("terminal_positions")
+        return terminal_entry(board)
+    
+    def analyze_game(
+        self,
+        pgn_text: Union[str, chess.pgn.Game],
+        time_per_move: Optional[float] = 1.0,
+        depth: Optional[int] = None,
+        nodes: Optional[int] = None,
+        budget: Optional[float] = None,
+        triage_depth: Optional[int] = None,
+        triage_threshold: float = 0.2,
+        checkpoint=None
+    ) -> List[MoveAnalysis]:
         """
         Analyse complète d'une partie
         
+        Chaque position n'est cherchée qu'une seule fois: l'évaluation
+        après le coup N sert d'évaluation avant le coup N+1. Une position
+        où un seul coup est légal n'est pas cherchée: elle prend
+        l'évaluation de la position suivante. Si un livre d'ouvertures
+        est configuré, les coups théoriques sont classés "book" sans
+        recherche et l'analyse commence à la première nouveauté.
+        
+        Avec `budget`, le temps total de la partie est réparti entre les
+        positions restant à chercher (les positions théoriques, forcées
+        ou reprises d'un point de reprise ne comptent pas); chaque
+        recherche s'arrête dès que l'évaluation est stable et le temps
+        économisé profite aux positions suivantes. `time_per_move` est
+        alors ignoré; `depth` et `nodes` restent des plafonds par recherche.
+        
+        Avec `triage_depth`, toute la partie est d'abord balayée à faible
+        profondeur; seules les positions encadrant un coup suspect
+        (variation d'évaluation d'au moins `triage_threshold` pions) sont
+        ensuite recherchées avec les limites complètes, jusqu'à ce
+        qu'aucun nouveau coup suspect n'apparaisse.
+        
         Args:
-            pgn_text: Partie au format PGN
-            time_per_move: Temps d'analyse par coup en secondes
+            pgn_text: Partie au format PGN (ou partie déjà lue)
+            time_per_move: Temps d'analyse par coup en secondes (None: sans
+                limite de temps, `depth` ou `nodes` est alors requis)
+            depth: Profondeur maximale de recherche (optionnel)
+            nodes: Nombre maximal de noeuds par recherche (optionnel)
+            budget: Temps total alloué à la partie en secondes (mode adaptatif)
+            triage_depth: Profondeur du balayage rapide (mode deux passes)
+            triage_threshold: Variation d'évaluation (en pions) déclenchant
+                une recherche complète en mode deux passes
+            checkpoint: Point de reprise (voir journal.GameCheckpoint): les
+                positions déjà évaluées sont reprises, les autres y sont
+                enregistrées au fur et à mesure
             
         Returns:
             Liste des analyses de chaque coup
         """
-        game = chess.pgn.read_game(chess.pgn.StringIO(pgn_text))
-        if not game:
-            raise ValueError("Format PGN invalide")
+        if budget is not None and triage_depth is not None:
+            raise ValueError("Les modes budget et deux passes sont exclusifs")
+        if budget is None and time_per_move is None and depth is None and nodes is None:
+            # chess.engine.Limit() sans borne: recherche infinie
+            raise ValueError("Aucune limite de recherche: indiquez time_per_move, depth, nodes ou budget")
         
+        game = read_game(pgn_text)
+        self._game_metrics = AnalysisMetrics()
+        try:
+            return self._analyze_mainline(
+                game, time_per_move, depth, nodes, budget, triage_depth, triage_threshold, checkpoint
+            )
+        finally:
+            self.last_game_metrics = self._game_metrics
+            self._game_metrics = None
+    
+    def _analyze_mainline(
+        self,
+        game: chess.pgn.Game,
+        time_per_move: Optional[float],
+        depth: Optional[int],
+        nodes: Optional[int],
+        budget: Optional[float],
+        triage_depth: Optional[int] = None,
+        triage_threshold: float = 0.2,
+        checkpoint=None
+    ) -> List[MoveAnalysis]:
+        """Analyse la ligne principale d'une partie (voir analyze_game)"""
         board = game.board()
-        analyses = []
+        moves = list(game.mainline_moves())
+        positions = len(moves) + 1
+        book_plies = self.book.book_plies(board, moves) if self.book else 0
+        full_limit = chess.engine.Limit(time=time_per_move, depth=depth, nodes=nodes)
+        boards = []
+        entries = []
+        spent = 0.0
+        remaining = self._searched_positions(game, moves, book_plies, checkpoint) if budget is not None else 0
         
-        for move_num, move in enumerate(game.mainline_moves()):
-            # Analyse avant le coup
-            position_before = self.analyze_position(board, time_per_move)
+        # Une recherche par position: N coups donnent N+1 positions
+        for index in range(positions):
+            if index:
+                board.push(moves[index - 1])
+            if triage_depth is not None:
+                boards.append(board.copy())
             
-            # Joue le coup
-            board.push(move)
+            if index < book_plies:
+                self._increment("book_plies")
+                entries.append(book_entry())
+                continue
             
-            # Analyse après le coup
-            position_after = self.analyze_position(board, time_per_move)
+            if index < len(moves) and board.legal_moves.count() == 1:
+                self._increment("forced_plies")
+                entries.append(None)  # Déduite de la position suivante
+                continue
             
-            # Calcule la précision du coup
-            accuracy = self._calculate_accuracy(
-                position_before.get("evaluation", 0),
-                position_after.get("evaluation", 0),
-                board.turn  # Couleur qui vient de jouer
-            )
-            
-            classification = self._classify_move(accuracy)
+            if checkpoint is not None and index in checkpoint.positions:
+                entry = checkpoint.positions[index]
+            elif triage_depth is not None:
+                entry = self._evaluate(board, chess.engine.Limit(depth=triage_depth))
+            elif budget is None:
+                entry = self._evaluate(board, full_limit)
+            else:
+                # Jusqu'au double de la part moyenne des recherches restantes
+                share = max(budget - spent, 0.0) / max(remaining, 1)
+                limit = chess.engine.Limit(time=max(2 * share, MIN_SEARCH_TIME), depth=depth, nodes=nodes)
+                entry = self._evaluate(board, limit, adaptive=True)
+                remaining -= 1
             
-            analysis = MoveAnalysis(
-                move=str(move),
-                evaluation=position_after.get("evaluation", 0),
-                best_move=position_before.get("best_move", ""),
-                accuracy=accuracy,
-                classification=classification
+            if checkpoint is not None and index not in checkpoint.positions:
+                checkpoint.record(index, entry)
+            spent += entry.get("time", 0.0)
+            entries.append(entry)
+        
+        fill_forced_entries(moves, entries)
+        if triage_depth is not None:
+            self._deepen_suspicious(
+                game.board().turn, moves, boards, entries, full_limit, triage_threshold, triage_depth
             )
-            
-            analyses.append(analysis)
+        return build_analyses(game.board().turn, moves, entries)
+    
+    def _searched_positions(
+        self,
+        game: chess.pgn.Game,
+        moves: List[chess.Move],
+        book_plies: int,
+        checkpoint=None
+    ) -> int:
+        """Nombre de positions que _analyze_mainline cherchera (ni théoriques, ni forcées, ni reprises)"""
+        board = game.board()
+        count = 0
+        for index in range(len(moves) + 1):
+            if index:
+                board.push(moves[index - 1])
+            if index < book_plies or (checkpoint is not None and index in checkpoint.positions):
+                continue
+            if index < len(moves) and board.legal_moves.count() == 1:
+                continue
+            count += 1
+        return count
+    
+    def _deepen_suspicious(
+        self,
+        turn: bool,
+        moves: List[chess.Move],
+        boards: List[chess.Board],
+        entries: List[Dict],
+        limit: chess.engine.Limit,
+        threshold: float,
+        triage_depth: int = 0
+    ):
+        """
+        Seconde passe du mode deux passes: recherche complète des coups suspects
+        
+        Les positions avant et après chaque coup suspect sont recherchées
+        avec `limit`. Une nouvelle évaluation pouvant rendre suspect un
+        coup voisin, l'opération est répétée jusqu'à stabilité; les coups
+        finalement classés reposent donc sur des évaluations complètes.
+        Les évaluations du balayage ne peuvent pas répondre depuis le
+        cache: seule une entrée plus profonde que `triage_depth` est
+        reprise, et seul un résultat plus profond remplace l'évaluation
+        du balayage.
         
-        return analyses
+        Args:
+            turn: Couleur au trait dans la position initiale
+            moves: Coups joués
+            boards: Positions de la partie (une de plus que de coups)
+            entries: Évaluations issues du balayage, mises à jour sur place
+            limit: Limite de recherche complète
+            threshold: Variation d'évaluation (en pions) rendant un coup suspect
+            triage_depth: Profondeur du balayage
+        """
+        deep = set()
+        while True:
+            targets = set()
+            mover = turn
+            for index, move in enumerate(moves):
+                before, after = entries[index], entries[index + 1]
+                if not before.get("book") and abs(self._eval_loss(move, before, after, mover)) >= threshold:
+                    for position in (index, index + 1):
+                        # Une position forcée dépend de la suivante
+                        while entries[position].get("forced"):
+                            position += 1
+                        if position not in deep:
+                            targets.add(position)
+                mover = not mover
+            
+            if not targets:
+                return
+            
+            for position in sorted(targets):
+                self._increment("triage_researches")
+                entry = self._evaluate(boards[position], limit, min_depth=triage_depth + 1)
+                if entry.get("depth", 0) > entries[position].get("depth", 0):
+                    entries[position] = entry
+                deep.add(position)
+            fill_forced_entries(moves, entries)
     
-    def _calculate_accuracy(self, eval_before: float, eval_after: float, turn: bool) -> float:
+    def _eval_loss(self, move: chess.Move, before: Dict, after: Dict, turn: bool) -> float:
+        """Perte d'évaluation (en pions) du coup pour le camp qui le joue"""
+        if str(move) == before.get("best_move"):
+            return 0.0
+        loss = before.get("evaluation", 0) - after.get("evaluation", 0)
+        return loss if turn == chess.WHITE else -loss
+    
+    def analyze_pgn_file(
+        self,
+        path: str,
+        header_filter: Optional[HeaderFilter] = None,
+        **kwargs
+    ) -> Iterator[Tuple[chess.pgn.Headers, List[MoveAnalysis]]]:
         """
-        Calcule la précision d'un coup
+        Analyse les parties d'un fichier PGN au fil de la lecture
         
         Args:
-            eval_before: Évaluation avant le coup
-            eval_after: Évaluation après le coup
-            turn: True si c'est aux blancs de jouer
+            path: Chemin du fichier PGN (une ou plusieurs parties)
+            header_filter: Filtre sur les en-têtes, appliqué avant la lecture des coups
+            **kwargs: Arguments supplémentaires pour analyze_game
             
-        Returns:
-            Précision entre 0 et 100
-        """
-        # Ajuste l'évaluation selon la couleur
-        if not turn:  # Si c'est aux noirs
-            eval_before = -eval_before
-            eval_after = -eval_after
-        
-        # Calcule la perte d'évaluation
-        eval_loss = eval_before - eval_after
-        
-        # Convertit en pourcentage de précision
-        if eval_loss <= 0:
-            return 100.0  # Coup parfait ou meilleur que prévu
-        elif eval_loss <= 0.1:
-            return 95.0   # Excellent
-        elif eval_loss <= 0.3:
-            return 85.0   # Bon
-        elif eval_loss <= 0.6:
-            return 70.0   # Imprécision
-        elif eval_loss <= 1.0:
-            return 50.0   # Erreur
-        else:
-            return 25.0   # Gaffe
+        Yields:
+            Tuples (en-têtes, analyses) partie par partie
+        """
+        for game in iter_games(path, header_filter):
+            yield game.headers, self.analyze_game(game, **kwargs)
+    
+    def _find_stockfish(self) -> str:
+        """Trouve automatiquement le chemin vers Stockfish (voir find_stockfish)"""
+        return find_stockfish()
+    
+    def _calculate_accuracy(self, eval_before: float, eval_after: float, turn: bool) -> float:
+        """Calcule la précision d'un coup (voir calculate_accuracy)"""
+        return calculate_accuracy(eval_before, eval_after, turn)
     
     def _classify_move(self, accuracy: float) -> str:
-        """Classifie un coup selon sa précision"""
-        if accuracy >= 95:
-            return "excellent"
-        elif accuracy >= 85:
-            return "good"
-        elif accuracy >= 70:
-            return "inaccuracy"
-        elif accuracy >= 50:
-            return "mistake"
-        else:
-            return "blunder"
\ No newline at end of file
+        """Classifie un coup selon sa précision (voir classify_move)"""
+        return classify_move(accuracy)
@@ -0,0 +1,248 @@
+"""
+Analyseur asynchrone basé sur le protocole asyncio de chess.engine
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import chess
+import chess.engine
+import chess.pgn
+
+from chessassist.core.analyzer import (
+    MoveAnalysis, book_entry, build_analyses, entry_from_info, find_stockfish,
+    position_result, read_game, terminal_entry
+)
+from chessassist.core.cache import EvaluationCache, engine_key
+from chessassist.core.metrics import AnalysisMetrics
+from chessassist.openings.book import OpeningBook
+
+class AsyncGameAnalyzer:
+    """
+    Analyseur de parties non bloquant, utilisable dans une boucle asyncio
+    
+    Toutes ses méthodes d'analyse sont des coroutines; il partage avec
+    GameAnalyzer les fonctions de calcul du module analyzer mais n'en
+    hérite pas.
+    """
+    
+    def __init__(
+        self,
+        stockfish_path: Optional[str] = None,
+        engine_options: Optional[Dict] = None,
+        cache: Optional[EvaluationCache] = None,
+        book: Optional[OpeningBook] = None,
+        engines: int = 1
+    ):
+        """
+        Initialise l'analyseur
+        
+        Args:
+            stockfish_path: Chemin vers l'exécutable Stockfish
+            engine_options: Options UCI à appliquer aux moteurs
+            cache: Cache persistant des évaluations (optionnel)
+            book: Livre d'ouvertures; les coups théoriques ne sont pas cherchés
+            engines: Nombre de processus moteur partagés par les analyses
+        """
+        self.stockfish_path = stockfish_path or find_stockfish()
+        self.engine_options = engine_options or {}
+        self.cache = cache
+        self.book = book
+        self.metrics = AnalysisMetrics()
+        self.size = max(1, engines)
+        self.engines: List[Tuple[asyncio.SubprocessTransport, chess.engine.UciProtocol]] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._engine_key: Optional[str] = None
+    
+    async def __aenter__(self):
+        """Démarre les moteurs Stockfish"""
+        results = await asyncio.gather(
+            *(chess.engine.popen_uci(self.stockfish_path) for _ in range(self.size)),
+            return_exceptions=True
+        )
+        
+        errors = [result for result in results if isinstance(result, BaseException)]
+        self.engines = [result for result in results if not isinstance(result, BaseException)]
+        if errors:
+            await self.__aexit__(None, None, None)
+            raise RuntimeError(f"Impossible de démarrer Stockfish: {errors[0]}")
+        
+        self._idle = asyncio.Queue()
+        for _, protocol in self.engines:
+            if self.engine_options:
+                await protocol.configure(self.engine_options)
+            self._idle.put_nowait(protocol)
+        
+        # Premier moteur: sert d'identifiant pour le cache
+        self._engine_key = engine_key(dict(self.engines[0][1].id), self.engine_options)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Ferme les moteurs Stockfish"""
+        for _, protocol in self.engines:
+            try:
+                await protocol.quit()
+            except chess.engine.EngineError:
+                pass
+        self.engines = []
+        self._engine_key = None
+    
+    async def _analyse(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        Lance une recherche sur le premier moteur libre
+        
+        En cas d'annulation ou de dépassement du délai, la recherche en
+        cours est arrêtée (stop UCI) et le moteur est rendu au pool.
+        
+        Args:
+            board: Position à analyser
+            limit: Limite de recherche
+            timeout: Délai maximal d'attente en secondes (optionnel)
+        
+        Returns:
+            Informations brutes retournées par le moteur
+        """
+        if self._idle is None:
+            raise RuntimeError("Moteur Stockfish non initialisé")
+        
+        start = time.perf_counter()
+        cached = self.cache.lookup(board, self._engine_key, limit) if self.cache is not None else None
+        if cached is not None:
+            cached["cached"] = True
+            self.metrics.record_search(time.perf_counter() - start, cached, cached=True)
+            return cached
+        
+        protocol = await self._idle.get()
+        try:
+            info = await asyncio.wait_for(protocol.analyse(board, limit), timeout)
+        except Exception as e:
+            self.metrics.record_error(e)
+            raise
+        finally:
+            self._idle.put_nowait(protocol)
+        
+        self.metrics.record_search(time.perf_counter() - start, info)
+        if self.cache is not None:
+            self.cache.store(board, self._engine_key, limit, info)
+        return info
+    
+    async def analyze_position(
+        self,
+        board: chess.Board,
+        time_limit: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        Analyse une position donnée
+        
+        Args:
+            board: Position à analyser
+            time_limit: Temps d'analyse en secondes
+            timeout: Délai maximal d'attente en secondes (lève asyncio.TimeoutError)
+        
+        Returns:
+            Dictionnaire contenant l'évaluation et le meilleur coup
+        """
+        try:
+            info = await self._analyse(board, chess.engine.Limit(time=time_limit), timeout)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            return {
+                "evaluation": 0.0,
+                "best_move": None,
+                "error": str(e)
+            }
+        
+        return position_result(board, info)
+    
+    async def _evaluate(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """Évalue une position du point de vue des blancs (voir GameAnalyzer._evaluate)"""
+        entry = terminal_entry(board)
+        if entry is not None:
+            self.metrics.increment("terminal_positions")
+            return entry
+        
+        try:
+            info = await self._analyse(board, limit, timeout)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            return {"evaluation": 0.0, "best_move": None, "error": str(e)}
+        
+        return entry_from_info(board, info)
+    
+    async def analyze_game(
+        self,
+        pgn_text: Union[str, chess.pgn.Game],
+        time_per_move: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[MoveAnalysis]:
+        """
+        Analyse une partie en produisant les coups au fur et à mesure
+        
+        Args:
+            pgn_text: Partie au format PGN (ou partie déjà lue)
+            time_per_move: Temps d'analyse par coup en secondes
+            timeout: Délai maximal par position en secondes
+        
+        Yields:
+            Analyse de chaque coup, dans l'ordre de la partie
+        """
+        game = read_game(pgn_text)
+        
+        board = game.board()
+        moves = list(game.mainline_moves())
+        book_plies = self.book.book_plies(board, moves) if self.book else 0
+        limit = chess.engine.Limit(time=time_per_move)
+        before = book_entry() if book_plies else await self._evaluate(board, limit, timeout)
+        
+        for index, move in enumerate(moves):
+            turn = board.turn
+            board.push(move)
+            if index + 1 < book_plies:
+                after = book_entry()
+            else:
+                after = await self._evaluate(board, limit, timeout)
+            
+            yield build_analyses(turn, [move], [before, after])[0]
+            before = after
+    
+    async def analyze_games(
+        self,
+        pgns: Iterable[str],
+        time_per_move: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, List[MoveAnalysis]]]:
+        """
+        Analyse plusieurs parties simultanément sur les moteurs disponibles
+        
+        Args:
+            pgns: Parties au format PGN ou parties déjà lues (ex: iter_games)
+            time_per_move: Temps d'analyse par coup en secondes
+            timeout: Délai maximal par position en secondes
+        
+        Yields:
+            Tuples (index de la partie, analyses) dans l'ordre de fin d'analyse
+        """
+        async def collect(index: int, pgn: str) -> Tuple[int, List[MoveAnalysis]]:
+            return index, [analysis async for analysis in self.analyze_game(pgn, time_per_move, timeout)]
+        
+        tasks = [asyncio.ensure_future(collect(index, pgn)) for index, pgn in enumerate(pgns)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
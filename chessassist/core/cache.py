@@ -0,0 +1,290 @@
+"""
+Cache persistant des évaluations de positions (SQLite, clé Zobrist)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import chess
+import chess.engine
+import chess.polyglot
+
+# Options UCI qui n'influencent que la vitesse de recherche, pas le résultat
+PERFORMANCE_OPTIONS = {"Threads", "Hash", "Ponder", "MultiPV", "Debug Log File"}
+
+def engine_key(engine_id: Dict, options: Optional[Dict] = None) -> str:
+    """
+    Calcule l'identifiant d'un moteur pour le cache
+    
+    Le nom (qui contient la version) et les options influençant
+    l'évaluation font partie de la clé: une mise à jour de Stockfish ou un
+    changement d'options invalide donc les entrées correspondantes.
+    
+    Args:
+        engine_id: Identification UCI du moteur (engine.id)
+        options: Options UCI configurées
+    
+    Returns:
+        Empreinte hexadécimale de 16 caractères
+    """
+    relevant = {
+        name: value for name, value in (options or {}).items()
+        if name not in PERFORMANCE_OPTIONS
+    }
+    payload = json.dumps(
+        {"name": engine_id.get("name", ""), "options": relevant},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _signed_key(board: chess.Board) -> int:
+    """Hash Zobrist ramené dans l'intervalle des entiers SQLite (64 bits signés)"""
+    key = chess.polyglot.zobrist_hash(board)
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+class EvaluationCache:
+    """Cache disque des évaluations, réutilisées si assez profondes"""
+    
+    def __init__(
+        self,
+        path: Union[str, Path] = "chessassist_cache.sqlite",
+        max_entries: int = 1_000_000,
+        min_depth: int = 0
+    ):
+        """
+        Ouvre (ou crée) le cache
+        
+        Args:
+            path: Chemin du fichier SQLite
+            max_entries: Nombre maximal d'entrées avant éviction LRU
+            min_depth: Profondeur à partir de laquelle une entrée répond à
+                une recherche limitée en temps seulement, quelle que soit la
+                durée de la recherche qui l'a produite (0: seules les entrées
+                issues d'une recherche au moins aussi longue sont acceptées)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.min_depth = min_depth
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._pending_writes = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS evaluations (
+                zobrist INTEGER NOT NULL,
+                engine TEXT NOT NULL,
+                score_cp INTEGER,
+                score_mate INTEGER,
+                best_move TEXT,
+                depth INTEGER NOT NULL,
+                nodes INTEGER NOT NULL,
+                search_time REAL NOT NULL DEFAULT 0,
+                last_access INTEGER NOT NULL,
+                PRIMARY KEY (zobrist, engine)
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(evaluations)")}
+        if "search_time" not in columns:
+            # Cache créé par une version antérieure
+            self._conn.execute("ALTER TABLE evaluations ADD COLUMN search_time REAL NOT NULL DEFAULT 0")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS evaluations_lru ON evaluations(last_access)"
+        )
+        row = self._conn.execute("SELECT MAX(last_access) FROM evaluations").fetchone()
+        self._clock = row[0] or 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _tick(self) -> int:
+        """Horloge logique utilisée pour l'ordre LRU"""
+        self._clock += 1
+        return self._clock
+    
+    def get(
+        self,
+        board: chess.Board,
+        engine: str,
+        min_depth: int = 0,
+        min_nodes: int = 0,
+        min_time: float = 0.0
+    ) -> Optional[Dict]:
+        """
+        Recherche une évaluation en cache
+        
+        Args:
+            board: Position recherchée
+            engine: Identifiant du moteur (voir engine_key)
+            min_depth: Profondeur minimale acceptée
+            min_nodes: Nombre de noeuds minimal accepté
+            min_time: Durée de la recherche demandée (recherche limitée en
+                temps seulement): l'entrée doit venir d'une recherche au
+                moins aussi longue, ou atteindre la profondeur min_depth
+                du cache
+        
+        Returns:
+            Informations au format chess.engine (score, pv, depth, nodes)
+            ou None si absente ou trop superficielle
+        """
+        key = _signed_key(board)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score_cp, score_mate, best_move, depth, nodes, search_time "
+                "FROM evaluations WHERE zobrist = ? AND engine = ?",
+                (key, engine)
+            ).fetchone()
+            
+            if row is None or row[3] < min_depth or row[4] < min_nodes or self._too_short(row, min_time):
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE evaluations SET last_access = ? WHERE zobrist = ? AND engine = ?",
+                (self._tick(), key, engine)
+            )
+        
+        score_cp, score_mate, best_move, depth, nodes, _ = row
+        relative = chess.engine.Mate(score_mate) if score_mate is not None else chess.engine.Cp(score_cp)
+        info = {
+            "score": chess.engine.PovScore(relative, board.turn),
+            "depth": depth,
+            "nodes": nodes
+        }
+        if best_move:
+            info["pv"] = [chess.Move.from_uci(best_move)]
+        return info
+    
+    def _too_short(self, row: tuple, min_time: float) -> bool:
+        """Entrée trop superficielle pour une recherche limitée en temps à min_time"""
+        if not min_time or row[5] >= min_time:
+            return False
+        return self.min_depth == 0 or row[3] < self.min_depth
+    
+    def put(self, board: chess.Board, engine: str, info: Dict, search_time: float = 0.0):
+        """
+        Enregistre le résultat d'une recherche
+        
+        Une entrée existante n'est remplacée que par une recherche au
+        moins aussi profonde; elle garde alors la plus longue des deux
+        durées de recherche.
+        
+        Args:
+            board: Position analysée
+            engine: Identifiant du moteur (voir engine_key)
+            info: Informations retournées par le moteur
+            search_time: Limite de temps de la recherche (0: sans limite de temps)
+        """
+        score = info.get("score")
+        if score is None or "depth" not in info:
+            return
+        
+        relative = score.relative
+        pv = info.get("pv") or [None]
+        row = (
+            _signed_key(board),
+            engine,
+            None if relative.is_mate() else relative.score(),
+            relative.mate(),
+            pv[0].uci() if pv[0] else None,
+            info["depth"],
+            info.get("nodes", 0),
+            search_time
+        )
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO evaluations "
+                "(zobrist, engine, score_cp, score_mate, best_move, depth, nodes, search_time, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(zobrist, engine) DO UPDATE SET "
+                "score_cp = excluded.score_cp, score_mate = excluded.score_mate, "
+                "best_move = excluded.best_move, depth = excluded.depth, "
+                "nodes = excluded.nodes, last_access = excluded.last_access, "
+                "search_time = MAX(excluded.search_time, evaluations.search_time) "
+                "WHERE excluded.depth >= evaluations.depth",
+                row + (self._tick(),)
+            )
+            self._pending_writes += 1
+            if self._pending_writes >= 100:
+                self._flush()
+    
+    def lookup(self, board: chess.Board, engine: str, limit: chess.engine.Limit, min_depth: int = 0) -> Optional[Dict]:
+        """
+        Recherche une évaluation au moins aussi profonde qu'une recherche limitée par `limit`
+        
+        Sans limite de profondeur ni de noeuds, l'entrée doit venir d'une
+        recherche au moins aussi longue (ou atteindre min_depth du cache).
+        
+        Args:
+            board: Position recherchée
+            engine: Identifiant du moteur (voir engine_key)
+            limit: Limite de la recherche demandée
+            min_depth: Profondeur minimale supplémentaire
+        
+        Returns:
+            Informations au format chess.engine ou None
+        """
+        return self.get(
+            board,
+            engine,
+            min_depth=max(limit.depth or 0, min_depth),
+            min_nodes=limit.nodes or 0,
+            min_time=0.0 if limit.depth or limit.nodes else (limit.time or 0.0)
+        )
+    
+    def store(self, board: chess.Board, engine: str, limit: chess.engine.Limit, info: Dict):
+        """Enregistre le résultat d'une recherche limitée par `limit` (voir put)"""
+        self.put(board, engine, info, search_time=limit.time or 0.0)
+    
+    def _flush(self):
+        """Applique l'éviction LRU et valide les écritures (verrou tenu)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        if count > self.max_entries:
+            # Évince un peu plus que nécessaire pour ne pas le refaire à chaque écriture
+            excess = count - int(self.max_entries * 0.9)
+            self._conn.execute(
+                "DELETE FROM evaluations WHERE rowid IN "
+                "(SELECT rowid FROM evaluations ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+        self._conn.commit()
+        self._pending_writes = 0
+    
+    def stats(self) -> Dict:
+        """
+        Statistiques d'utilisation du cache
+        
+        Returns:
+            Dictionnaire avec hits, misses, hit_rate et entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries
+        }
+    
+    def close(self):
+        """Valide les écritures en attente et ferme la base"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,271 @@
+"""
+Démon d'analyse: moteurs Stockfish persistants partagés via un socket Unix
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import chess
+import chess.engine
+
+# Variable d'environnement permettant de choisir le socket du démon
+SOCKET_ENV = "CHESSASSIST_DAEMON_SOCKET"
+
+def default_socket_path() -> str:
+    """Chemin du socket du démon (par utilisateur)"""
+    if os.getenv(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"chessassist-{uid}.sock")
+
+def _encode_score(score: chess.engine.PovScore) -> Dict:
+    """Sérialise un score relatif au camp au trait"""
+    relative = score.relative
+    return {"mate": relative.mate()} if relative.is_mate() else {"cp": relative.score()}
+
+def _decode_score(data: Dict, turn: bool) -> chess.engine.PovScore:
+    """Désérialise un score relatif au camp au trait"""
+    relative = chess.engine.Mate(data["mate"]) if "mate" in data else chess.engine.Cp(data["cp"])
+    return chess.engine.PovScore(relative, turn)
+
+class DaemonEngine:
+    """Client du démon, utilisable à la place d'un SimpleEngine pour analyse()"""
+    
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        """
+        Se connecte au démon
+        
+        Args:
+            socket_path: Chemin du socket Unix du démon
+            timeout: Délai maximal d'attente d'une réponse (secondes)
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self._reader = self.sock.makefile("r", encoding="utf-8")
+        self._lock = threading.Lock()
+        response = self._request({"op": "id"})
+        self.id = response["id"]
+        self.path = response.get("path")  # Moteur lancé par le démon
+    
+    def _request(self, payload: Dict) -> Dict:
+        """Envoie une requête JSON et attend la réponse"""
+        with self._lock:
+            self.sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            line = self._reader.readline()
+        if not line:
+            raise chess.engine.EngineTerminatedError("Connexion au démon interrompue")
+        
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise chess.engine.EngineError(response.get("error", "Erreur du démon"))
+        return response
+    
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> Dict:
+        """
+        Analyse une position sur un moteur du démon
+        
+        Args:
+            board: Position à analyser (l'historique est transmis)
+            limit: Limite de recherche
+        
+        Returns:
+            Informations au format chess.engine
+        """
+        response = self._request({
+            "op": "analyse",
+            "fen": board.root().fen(),
+            "moves": [move.uci() for move in board.move_stack],
+            "limit": {"time": limit.time, "depth": limit.depth, "nodes": limit.nodes}
+        })
+        
+        info = {key: value for key, value in response["info"].items() if key not in ("score", "pv")}
+        if "score" in response["info"]:
+            info["score"] = _decode_score(response["info"]["score"], board.turn)
+        info["pv"] = [chess.Move.from_uci(move) for move in response["info"].get("pv", [])]
+        return info
+    
+    def quit(self):
+        """Ferme la connexion (le démon et ses moteurs restent actifs)"""
+        self._reader.close()
+        self.sock.close()
+
+def connect_daemon(socket_path: Optional[str] = None) -> Optional[DaemonEngine]:
+    """
+    Se connecte au démon s'il est lancé
+    
+    Args:
+        socket_path: Chemin du socket (par défaut: default_socket_path())
+    
+    Returns:
+        Client connecté ou None si aucun démon n'écoute
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    
+    socket_path = socket_path or default_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    
+    try:
+        return DaemonEngine(socket_path)
+    except (OSError, ValueError, chess.engine.EngineError):
+        return None
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Traite les requêtes JSON d'une connexion cliente"""
+    
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.analysis_daemon.handle_request(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+class AnalysisDaemon:
+    """Serveur d'analyse gardant des moteurs chauds entre les requêtes"""
+    
+    def __init__(
+        self,
+        stockfish_path: str,
+        socket_path: Optional[str] = None,
+        engines: int = 1,
+        engine_options: Optional[Dict] = None,
+        idle_timeout: float = 600.0
+    ):
+        """
+        Initialise le démon
+        
+        Args:
+            stockfish_path: Chemin vers l'exécutable Stockfish
+            socket_path: Chemin du socket Unix (par défaut: default_socket_path())
+            engines: Nombre de moteurs gardés en mémoire
+            engine_options: Options UCI des moteurs (ex: Threads, Hash)
+            idle_timeout: Arrêt automatique après ce délai sans requête (secondes)
+        """
+        self.stockfish_path = stockfish_path
+        self.socket_path = socket_path or default_socket_path()
+        self.size = max(1, engines)
+        self.engine_options = engine_options or {}
+        self.idle_timeout = idle_timeout
+        self.engine_id: Dict = {}
+        self.requests = 0
+        
+        self._engines: "queue.Queue[chess.engine.SimpleEngine]" = queue.Queue()
+        self._all_engines: List[chess.engine.SimpleEngine] = []
+        self._last_activity = time.monotonic()
+        self._active = 0
+        self._state_lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+    
+    def _start_engine(self) -> chess.engine.SimpleEngine:
+        """Lance et configure un moteur"""
+        engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
+        if self.engine_options:
+            engine.configure(self.engine_options)
+        self._all_engines.append(engine)
+        return engine
+    
+    def handle_request(self, request: Dict) -> Dict:
+        """
+        Traite une requête cliente
+        
+        Args:
+            request: Requête décodée ("id", "ping" ou "analyse")
+        
+        Returns:
+            Réponse à renvoyer au client
+        """
+        op = request.get("op")
+        if op == "id":
+            return {"ok": True, "id": self.engine_id, "path": self.stockfish_path}
+        if op == "ping":
+            return {"ok": True}
+        if op != "analyse":
+            return {"ok": False, "error": f"Opération inconnue: {op}"}
+        
+        board = chess.Board(request["fen"])
+        for move in request.get("moves", []):
+            board.push_uci(move)
+        limit = chess.engine.Limit(**{key: value for key, value in request["limit"].items() if value is not None})
+        
+        with self._state_lock:
+            self._active += 1
+            self.requests += 1
+        engine = self._engines.get()
+        try:
+            info = engine.analyse(board, limit)
+        except chess.engine.EngineTerminatedError:
+            # Moteur mort: il est remplacé avant d'être rendu au pool
+            self._all_engines.remove(engine)
+            engine = self._start_engine()
+            raise
+        finally:
+            self._engines.put(engine)
+            with self._state_lock:
+                self._active -= 1
+                self._last_activity = time.monotonic()
+        
+        payload = {key: value for key, value in info.items() if isinstance(value, (int, float, str))}
+        if "score" in info:
+            payload["score"] = _encode_score(info["score"])
+        payload["pv"] = [move.uci() for move in info.get("pv", [])]
+        return {"ok": True, "info": payload}
+    
+    def _watch_idle(self):
+        """Arrête le serveur après idle_timeout secondes sans activité"""
+        while True:
+            time.sleep(min(1.0, self.idle_timeout))
+            with self._state_lock:
+                idle = time.monotonic() - self._last_activity
+                if self._active == 0 and idle >= self.idle_timeout:
+                    break
+        self._server.shutdown()
+    
+    def serve_forever(self):
+        """Démarre les moteurs et sert les requêtes jusqu'au délai d'inactivité"""
+        if os.path.exists(self.socket_path):
+            running = connect_daemon(self.socket_path)
+            if running is not None:
+                running.quit()
+                raise RuntimeError(f"Un démon écoute déjà sur {self.socket_path}")
+            # Socket orphelin laissé par un démon arrêté brutalement
+            os.unlink(self.socket_path)
+        
+        try:
+            for _ in range(self.size):
+                self._engines.put(self._start_engine())
+            self.engine_id = dict(self._all_engines[0].id)
+            
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _RequestHandler)
+            self._server.daemon_threads = True
+            self._server.analysis_daemon = self
+            os.chmod(self.socket_path, 0o600)
+            
+            self._last_activity = time.monotonic()
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+            self._server.serve_forever()
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Ferme le socket et les moteurs"""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        for engine in self._all_engines:
+            try:
+                engine.quit()
+            except chess.engine.EngineError:
+                pass
+        self._all_engines = []
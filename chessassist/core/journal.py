@@ -0,0 +1,167 @@
+"""
+Journal de reprise des analyses par lot (une ligne JSON par position ou partie)
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import chess
+import chess.pgn
+
+from chessassist.core.analyzer import GameAnalyzer, MoveAnalysis, read_game
+
+def game_key(game: chess.pgn.Game) -> str:
+    """
+    Identifiant stable d'une partie: position de départ et coups joués
+    
+    Args:
+        game: Partie lue
+    
+    Returns:
+        Empreinte hexadécimale
+    """
+    moves = " ".join(move.uci() for move in game.mainline_moves())
+    return hashlib.sha1(f"{game.board().fen()}|{moves}".encode("utf-8")).hexdigest()
+
+class GameCheckpoint:
+    """Point de reprise d'une partie en cours d'analyse"""
+    
+    def __init__(self, journal: "AnalysisJournal", key: str, positions: Dict[int, Dict]):
+        """
+        Initialise le point de reprise
+        
+        Args:
+            journal: Journal où enregistrer les positions
+            key: Identifiant de la partie
+            positions: Évaluations déjà journalisées, par index de position
+        """
+        self.journal = journal
+        self.key = key
+        self.positions = positions
+        self.failed = False
+    
+    def record(self, index: int, entry: Dict):
+        """Journalise l'évaluation d'une position (sauf recherche en échec)"""
+        if "error" in entry:
+            self.failed = True
+            return
+        self.positions[index] = entry
+        self.journal._write({"type": "position", "game": self.key, "index": index, "entry": entry})
+
+class AnalysisJournal:
+    """Journal d'avancement persistant d'une analyse par lot"""
+    
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Ouvre (ou crée) le journal et relit l'avancement déjà enregistré
+        
+        Args:
+            path: Chemin du fichier journal (JSON lines)
+            sync: Force l'écriture sur disque (fsync) après chaque ligne
+        """
+        self.path = path
+        self.sync = sync
+        self.games: Dict[str, List[MoveAnalysis]] = {}
+        self.positions: Dict[str, Dict[int, Dict]] = {}
+        self._load()
+        self._file = open(path, "a", encoding="utf-8")
+    
+    def _load(self):
+        """
+        Relit le journal
+        
+        Une dernière ligne tronquée (arrêt brutal) est ignorée et retirée du
+        fichier, pour que la prochaine ligne ajoutée ne s'y colle pas.
+        """
+        if not os.path.exists(self.path):
+            return
+        
+        end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                
+                if record["type"] == "game":
+                    self.games[record["game"]] = [MoveAnalysis(**analysis) for analysis in record["analyses"]]
+                    self.positions.pop(record["game"], None)
+                elif record["game"] not in self.games:
+                    self.positions.setdefault(record["game"], {})[record["index"]] = record["entry"]
+        
+        if end < os.path.getsize(self.path):
+            os.truncate(self.path, end)
+    
+    def _write(self, record: Dict):
+        """Ajoute une ligne au journal"""
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Ferme le fichier journal"""
+        self._file.close()
+    
+    def completed(self, key: str) -> Optional[List[MoveAnalysis]]:
+        """Analyses d'une partie terminée lors d'une exécution précédente"""
+        return self.games.get(key)
+    
+    def checkpoint(self, key: str) -> GameCheckpoint:
+        """Point de reprise d'une partie (positions déjà évaluées comprises)"""
+        return GameCheckpoint(self, key, self.positions.setdefault(key, {}))
+    
+    def record_game(self, key: str, analyses: List[MoveAnalysis]):
+        """Journalise une partie terminée"""
+        self.games[key] = analyses
+        self.positions.pop(key, None)
+        self._write({"type": "game", "game": key, "analyses": [asdict(analysis) for analysis in analyses]})
+
+def analyze_batch(
+    analyzer: GameAnalyzer,
+    pgns: Iterable[Union[str, chess.pgn.Game]],
+    journal: AnalysisJournal,
+    **kwargs
+) -> Iterator[Tuple[int, List[MoveAnalysis]]]:
+    """
+    Analyse un lot de parties en journalisant l'avancement
+    
+    Une exécution relancée avec le même journal reprend les parties
+    terminées sans recherche et poursuit une partie interrompue à partir
+    de la dernière position évaluée. Un moteur arrêté en cours de route
+    est relancé par l'analyseur (voir GameAnalyzer.max_restarts).
+    
+    Args:
+        analyzer: Analyseur démarré
+        pgns: Parties au format PGN ou parties déjà lues (ex: iter_games)
+        journal: Journal d'avancement
+        **kwargs: Arguments supplémentaires pour GameAnalyzer.analyze_game
+    
+    Yields:
+        Tuples (index de la partie, analyses) dans l'ordre du lot
+    """
+    for index, pgn in enumerate(pgns):
+        game = read_game(pgn)
+        key = game_key(game)
+        
+        analyses = journal.completed(key)
+        if analyses is None:
+            checkpoint = journal.checkpoint(key)
+            analyses = analyzer.analyze_game(game, checkpoint=checkpoint, **kwargs)
+            # Une partie incomplète sera reprise à la prochaine exécution
+            if not checkpoint.failed:
+                journal.record_game(key, analyses)
+        yield index, analyses
@@ -0,0 +1,158 @@
+"""
+Métriques d'analyse: compteurs et histogrammes des recherches moteur
+"""
+
+import asyncio
+import bisect
+import concurrent.futures
+import json
+import threading
+from typing import Dict, List, Optional
+
+# Bornes supérieures des intervalles de chaque histogramme
+HISTOGRAM_BOUNDS = {
+    "latency_ms": [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000],
+    "depth": [5, 10, 15, 20, 25, 30, 40, 60],
+    "seldepth": [5, 10, 15, 20, 30, 40, 60, 80],
+    "nodes": [1e3, 1e4, 1e5, 1e6, 1e7, 1e8],
+    "nps": [1e4, 1e5, 5e5, 1e6, 2e6, 5e6, 1e7, 5e7],
+    "hashfull": [100, 250, 500, 750, 900, 1000]
+}
+
+# Erreurs comptées comme dépassements de délai
+TIMEOUT_ERRORS = (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)
+
+class Histogram:
+    """Histogramme à intervalles fixes"""
+    
+    def __init__(self, bounds: List[float]):
+        """
+        Initialise l'histogramme
+        
+        Args:
+            bounds: Bornes supérieures croissantes (un dernier intervalle
+                reçoit les valeurs au-delà)
+        """
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def observe(self, value: float):
+        """Ajoute une valeur"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: "Histogram"):
+        """Ajoute les valeurs d'un autre histogramme de mêmes bornes"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable en JSON"""
+        return {
+            "bounds": self.bounds,
+            "counts": self.counts,
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max
+        }
+
+class AnalysisMetrics:
+    """Compteurs et histogrammes des recherches d'un analyseur"""
+    
+    def __init__(self):
+        """Initialise des métriques vides"""
+        self.counters: Dict[str, int] = {
+            "searches": 0,
+            "engine_calls": 0,
+            "cache_hits": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "terminal_positions": 0,
+            "book_plies": 0,
+            "forced_plies": 0,
+            "triage_researches": 0,
+            "transpositions": 0,
+            "engine_restarts": 0
+        }
+        self.errors_by_type: Dict[str, int] = {}
+        self.histograms = {name: Histogram(bounds) for name, bounds in HISTOGRAM_BOUNDS.items()}
+        self._lock = threading.Lock()
+    
+    def increment(self, name: str, amount: int = 1):
+        """Incrémente un compteur"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record_search(self, elapsed: float, info: Dict, cached: bool = False):
+        """
+        Enregistre une recherche terminée
+        
+        Args:
+            elapsed: Durée mesurée de l'appel en secondes
+            info: Informations retournées par le moteur
+            cached: True si le résultat vient du cache
+        """
+        with self._lock:
+            self.counters["searches"] += 1
+            self.counters["cache_hits" if cached else "engine_calls"] += 1
+            self.histograms["latency_ms"].observe(elapsed * 1000)
+            if cached:
+                return
+            for name in ("depth", "seldepth", "nodes", "nps", "hashfull"):
+                if name in info:
+                    self.histograms[name].observe(info[name])
+    
+    def record_error(self, error: BaseException):
+        """
+        Enregistre une recherche en échec
+        
+        Args:
+            error: Exception levée par le moteur
+        """
+        with self._lock:
+            self.counters["timeouts" if isinstance(error, TIMEOUT_ERRORS) else "errors"] += 1
+            name = type(error).__name__
+            self.errors_by_type[name] = self.errors_by_type.get(name, 0) + 1
+    
+    def merge(self, other: "AnalysisMetrics"):
+        """Ajoute les métriques d'un autre analyseur (ex: moteurs d'un pool)"""
+        with self._lock:
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, value in other.errors_by_type.items():
+                self.errors_by_type[name] = self.errors_by_type.get(name, 0) + value
+            for name, histogram in other.histograms.items():
+                self.histograms[name].merge(histogram)
+    
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable en JSON"""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "errors_by_type": dict(self.errors_by_type),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+            }
+    
+    def dump_json(self, path: str):
+        """
+        Écrit les métriques dans un fichier JSON
+        
+        Args:
+            path: Chemin du fichier de sortie
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,204 @@
+"""
+Lecture paresseuse de fichiers PGN volumineux
+"""
+
+import functools
+import io
+import re
+from typing import BinaryIO, Callable, Iterator, List, Optional, TextIO, Tuple, Union
+from pathlib import Path
+
+import chess.pgn
+
+# Taille du tampon de lecture (les exports chess.com dépassent souvent le Go)
+READ_BUFFER_SIZE = 1 << 20
+
+HeaderFilter = Callable[[chess.pgn.Headers], bool]
+
+# Délimiteurs de commentaires dans le texte des coups
+COMMENT_TOKEN = re.compile(rb"[{};]")
+
+# Partie écartée par le filtre (distincte de None, fin de fichier)
+_REJECTED = object()
+
+def match_headers(**criteria: str) -> HeaderFilter:
+    """
+    Construit un filtre sur les en-têtes PGN
+    
+    Args:
+        **criteria: Valeurs attendues par en-tête (ex: White="magnus")
+    
+    Returns:
+        Filtre acceptant les parties dont les en-têtes correspondent
+        (comparaison insensible à la casse)
+    """
+    expected = {name: value.lower() for name, value in criteria.items()}
+    
+    def accept(headers: chess.pgn.Headers) -> bool:
+        return all(headers.get(name, "").lower() == value for name, value in expected.items())
+    
+    return accept
+
+class _HeadersGameBuilder(chess.pgn.GameBuilder):
+    """Construit une partie à partir de ses coups, les en-têtes étant déjà lus"""
+    
+    def __init__(self, headers: chess.pgn.Headers):
+        super().__init__()
+        self._headers = headers
+    
+    def begin_headers(self) -> chess.pgn.Headers:
+        # En-têtes repris tels quels (position de départ et variante comprises)
+        self.game.headers.update(self._headers)
+        return self.game.headers
+
+class _FilteredGameBuilder(chess.pgn.GameBuilder):
+    """Construit une partie, ou saute ses coups si ses en-têtes sont refusés"""
+    
+    def __init__(self, header_filter: HeaderFilter):
+        super().__init__()
+        self._filter = header_filter
+        self._rejected = False
+    
+    def end_headers(self):
+        if not self._filter(self.game.headers):
+            self._rejected = True
+            return chess.pgn.SKIP
+        return None
+    
+    def result(self):
+        return _REJECTED if self._rejected else super().result()
+
+def _scan(
+    handle: BinaryIO,
+    header_filter: Optional[HeaderFilter],
+    keep_movetext: bool
+) -> Iterator[Tuple[int, chess.pgn.Headers, Optional[List[bytes]]]]:
+    """
+    Découpe un fichier PGN binaire en parties, ligne par ligne
+    
+    Les positions sont calculées en additionnant la longueur des lignes:
+    aucun appel à tell(), coûteux en mode texte.
+    
+    Args:
+        handle: Fichier PGN ouvert en mode binaire
+        header_filter: Filtre optionnel sur les en-têtes
+        keep_movetext: Conserve les lignes de coups des parties acceptées
+    
+    Yields:
+        Tuples (position en octets, en-têtes, lignes de coups ou None)
+    """
+    offset = 0
+    line = handle.readline()
+    if line.startswith(b"\xef\xbb\xbf"):
+        offset, line = 3, line[3:]
+    
+    while line:
+        # Lignes vides et commentaires entre les parties
+        if line.isspace() or line.startswith((b"%", b";")):
+            offset += len(line)
+            line = handle.readline()
+            continue
+        
+        start = offset
+        headers = chess.pgn.Headers({})
+        blank = False
+        while line and (line.startswith(b"[") or (line.isspace() and not blank)):
+            # Au plus une ligne vide entre deux en-têtes (comme chess.pgn)
+            blank = line.isspace()
+            if not blank:
+                match = chess.pgn.TAG_REGEX.match(line.decode("utf-8", errors="replace"))
+                if match:
+                    headers[match.group(1)] = match.group(2)
+            offset += len(line)
+            line = handle.readline()
+        
+        accepted = header_filter is None or header_filter(headers)
+        movetext = [] if accepted and keep_movetext else None
+        in_comment = False
+        while line and (in_comment or not line.isspace()):
+            if movetext is not None:
+                movetext.append(line)
+            if not line.startswith((b"%", b";")):
+                # Une ligne vide dans un commentaire ne termine pas la partie
+                in_comment = _inside_comment(line, in_comment)
+            offset += len(line)
+            line = handle.readline()
+        
+        if accepted:
+            yield start, headers, movetext
+
+def _inside_comment(line: bytes, in_comment: bool) -> bool:
+    """Indique si un commentaire {...} reste ouvert à la fin de la ligne"""
+    if b"{" not in line and b"}" not in line:
+        return in_comment
+    for match in COMMENT_TOKEN.finditer(line):
+        token = match.group()
+        if in_comment:
+            in_comment = token != b"}"
+        elif token == b"{":
+            in_comment = True
+        elif token == b";":
+            break
+    return in_comment
+
+def scan_games(handle: BinaryIO, header_filter: Optional[HeaderFilter] = None) -> Iterator[Tuple[int, chess.pgn.Headers]]:
+    """
+    Parcourt les en-têtes des parties sans analyser les coups
+    
+    Args:
+        handle: Fichier PGN ouvert en mode binaire
+        header_filter: Filtre optionnel sur les en-têtes
+    
+    Yields:
+        Tuples (position de la partie dans le fichier en octets, en-têtes)
+    """
+    for offset, headers, _ in _scan(handle, header_filter, keep_movetext=False):
+        yield offset, headers
+
+def _build_game(headers: chess.pgn.Headers, movetext: List[bytes]) -> chess.pgn.Game:
+    """Analyse les coups d'une partie dont les en-têtes sont déjà lus"""
+    text = b"".join(movetext).decode("utf-8", errors="replace")
+    game = chess.pgn.read_game(io.StringIO(text), Visitor=functools.partial(_HeadersGameBuilder, headers))
+    if game is None:
+        # Partie sans coups
+        game = chess.pgn.Game()
+        game.headers.update(headers)
+    return game
+
+def iter_games(
+    source: Union[str, Path, BinaryIO, TextIO],
+    header_filter: Optional[HeaderFilter] = None
+) -> Iterator[chess.pgn.Game]:
+    """
+    Lit les parties d'un fichier PGN une à une
+    
+    Seules les parties acceptées par le filtre sont entièrement
+    analysées, une seule fois; les autres sont sautées après lecture des
+    en-têtes. Un chemin ou un fichier binaire est découpé en octets, un
+    fichier texte est lu directement par chess.pgn. La mémoire utilisée
+    ne dépend pas de la taille du fichier.
+    
+    Args:
+        source: Chemin du fichier PGN ou fichier déjà ouvert
+        header_filter: Filtre optionnel sur les en-têtes
+    
+    Yields:
+        Parties PGN
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb", buffering=READ_BUFFER_SIZE) as handle:
+            yield from iter_games(handle, header_filter)
+        return
+    
+    if isinstance(source.read(0), bytes):
+        for _, headers, movetext in _scan(source, header_filter, keep_movetext=True):
+            yield _build_game(headers, movetext)
+        return
+    
+    visitor = chess.pgn.GameBuilder if header_filter is None else functools.partial(_FilteredGameBuilder, header_filter)
+    while True:
+        game = chess.pgn.read_game(source, Visitor=visitor)
+        if game is None:
+            return
+        if game is not _REJECTED:
+            yield game
@@ -0,0 +1,186 @@
+"""
+Pool de moteurs Stockfish pour l'analyse de parties en parallèle
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import chess.pgn
+
+from chessassist.core.analyzer import GameAnalyzer, MoveAnalysis
+from chessassist.core.metrics import AnalysisMetrics
+
+def default_pool_size(threads_per_engine: int = 1) -> int:
+    """
+    Calcule le nombre de moteurs à lancer selon les CPU disponibles
+    
+    Args:
+        threads_per_engine: Valeur de l'option UCI Threads de chaque moteur
+    
+    Returns:
+        Nombre de processus moteur (au moins 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(1, cpus // max(1, threads_per_engine))
+
+class EnginePool:
+    """Pool de processus Stockfish partagés entre plusieurs parties"""
+    
+    def __init__(
+        self,
+        stockfish_path: Optional[str] = None,
+        size: Optional[int] = None,
+        threads: int = 1,
+        hash_mb: int = 16,
+        **analyzer_kwargs
+    ):
+        """
+        Initialise le pool
+        
+        Args:
+            stockfish_path: Chemin vers l'exécutable Stockfish
+            size: Nombre de moteurs (par défaut: CPU disponibles / threads)
+            threads: Option UCI Threads de chaque moteur
+            hash_mb: Option UCI Hash de chaque moteur (en Mo)
+            **analyzer_kwargs: Arguments supplémentaires pour chaque GameAnalyzer
+        """
+        self.size = size or default_pool_size(threads)
+        self.engine_options = {"Threads": threads, "Hash": hash_mb}
+        self.stockfish_path = stockfish_path
+        self.analyzer_kwargs = analyzer_kwargs
+        self.analyzers: List[GameAnalyzer] = []
+        self._idle: "queue.Queue[GameAnalyzer]" = queue.Queue()
+    
+    def __enter__(self):
+        """Démarre les moteurs du pool en parallèle"""
+        analyzers = [
+            GameAnalyzer(self.stockfish_path, engine_options=self.engine_options, **self.analyzer_kwargs)
+            for _ in range(self.size)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(analyzer.__enter__) for analyzer in analyzers]
+        
+        errors = [future.exception() for future in futures if future.exception()]
+        for analyzer, future in zip(analyzers, futures):
+            if not future.exception():
+                self.analyzers.append(analyzer)
+        
+        if errors:
+            self.__exit__(None, None, None)
+            raise errors[0]
+        
+        for analyzer in self.analyzers:
+            self._idle.put(analyzer)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Ferme tous les moteurs du pool"""
+        for analyzer in self.analyzers:
+            analyzer.__exit__(exc_type, exc_val, exc_tb)
+        self.analyzers = []
+        self._idle = queue.Queue()
+    
+    def metrics(self) -> AnalysisMetrics:
+        """
+        Agrège les métriques de tous les moteurs du pool
+        
+        Returns:
+            Métriques cumulées du lot
+        """
+        total = AnalysisMetrics()
+        for analyzer in self.analyzers:
+            total.merge(analyzer.metrics)
+        return total
+    
+    def run(self, task: Callable[[GameAnalyzer], object]) -> object:
+        """
+        Exécute une tâche sur un moteur libre du pool
+        
+        Args:
+            task: Fonction recevant le GameAnalyzer emprunté
+        
+        Returns:
+            Résultat de la tâche
+        """
+        analyzer = self._idle.get()
+        try:
+            return task(analyzer)
+        finally:
+            self._idle.put(analyzer)
+    
+    def analyze_games(
+        self,
+        pgns: Iterable[Union[str, chess.pgn.Game]],
+        time_per_move: float = 1.0,
+        **kwargs
+    ) -> Iterator[Tuple[int, List[MoveAnalysis]]]:
+        """
+        Analyse plusieurs parties en parallèle
+        
+        Les parties sont distribuées sur les moteurs libres au fur et à
+        mesure; seules 2 x size parties sont en cours à un instant donné,
+        ce qui permet de consommer un itérable arbitrairement long.
+        
+        Args:
+            pgns: Parties au format PGN ou parties déjà lues (ex: iter_games)
+            time_per_move: Temps d'analyse par coup en secondes
+            **kwargs: Arguments supplémentaires pour GameAnalyzer.analyze_game
+        
+        Yields:
+            Tuples (index de la partie, analyses) dans l'ordre de fin d'analyse
+        """
+        if not self.analyzers:
+            raise RuntimeError("Pool de moteurs non initialisé")
+        
+        def analyze(pgn: Union[str, chess.pgn.Game]) -> List[MoveAnalysis]:
+            return self.run(lambda analyzer: analyzer.analyze_game(pgn, time_per_move, **kwargs))
+        
+        max_pending = 2 * self.size
+        pending: Dict = {}
+        
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for index, pgn in enumerate(pgns):
+                pending[executor.submit(analyze, pgn)] = index
+                
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+def analyze_games(
+    pgns: Iterable[str],
+    jobs: Optional[int] = None,
+    time_per_move: float = 1.0,
+    stockfish_path: Optional[str] = None,
+    threads: int = 1,
+    hash_mb: int = 16,
+    **kwargs
+) -> Iterator[Tuple[int, List[MoveAnalysis]]]:
+    """
+    Analyse un lot de parties avec un pool de moteurs temporaire
+    
+    Args:
+        pgns: Parties au format PGN ou parties déjà lues (ex: iter_games)
+        jobs: Nombre de moteurs (par défaut: CPU disponibles / threads)
+        time_per_move: Temps d'analyse par coup en secondes
+        stockfish_path: Chemin vers l'exécutable Stockfish
+        threads: Option UCI Threads de chaque moteur
+        hash_mb: Option UCI Hash de chaque moteur (en Mo)
+        **kwargs: Arguments supplémentaires pour GameAnalyzer.analyze_game
+    
+    Yields:
+        Tuples (index de la partie, analyses) dans l'ordre de fin d'analyse
+    """
+    with EnginePool(stockfish_path, size=jobs, threads=threads, hash_mb=hash_mb) as pool:
+        yield from pool.analyze_games(pgns, time_per_move, **kwargs)
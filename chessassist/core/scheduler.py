@@ -0,0 +1,228 @@
+"""
+Planificateur d'analyse de corpus: chaque position unique n'est cherchée qu'une fois
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import chess
+import chess.engine
+import chess.pgn
+import chess.polyglot
+
+from chessassist.core.analyzer import (
+    GameAnalyzer, MoveAnalysis, book_entry, build_analyses, fill_forced_entries, read_game
+)
+from chessassist.core.pool import EnginePool
+
+# Clé d'une recherche: hash Zobrist de la position et critères de sa limite
+SearchKey = Tuple[int, Tuple[str, ...]]
+
+# Position d'une partie: recherche à effectuer, évaluation connue
+# d'avance (livre, fin de partie) ou None pour un coup forcé
+Slot = Union[SearchKey, Dict, None]
+
+def limit_criteria(limit: chess.engine.Limit) -> Tuple[str, ...]:
+    """Critères renseignés d'une limite de recherche (parmi time, depth, nodes)"""
+    return tuple(name for name in ("time", "depth", "nodes") if getattr(limit, name) is not None)
+
+def merge_limits(current: chess.engine.Limit, requested: chess.engine.Limit) -> chess.engine.Limit:
+    """
+    Combine deux limites de recherche en gardant la plus exigeante
+    
+    La recherche s'arrête dès qu'un critère est atteint: seules des
+    limites portant sur les mêmes critères se combinent, chaque critère
+    prenant la plus grande des deux valeurs. Ajouter un critère que
+    l'autre limite n'a pas l'affaiblirait (ex: depth=8 et nodes=1000
+    s'arrêtent aux 1000 noeuds, bien avant la profondeur 8).
+    
+    Args:
+        current: Limite déjà retenue pour la position
+        requested: Limite demandée par une nouvelle occurrence
+    
+    Returns:
+        Limite couvrant les deux demandes
+    
+    Raises:
+        ValueError: Si les deux limites ne portent pas sur les mêmes critères
+    """
+    criteria = limit_criteria(current)
+    if limit_criteria(requested) != criteria:
+        raise ValueError("Limites de recherche incompatibles: critères différents")
+    return chess.engine.Limit(**{name: max(getattr(current, name), getattr(requested, name)) for name in criteria})
+
+@dataclass
+class _Position:
+    """Position unique du corpus et sa recherche"""
+    board: chess.Board
+    limit: chess.engine.Limit
+    entry: Optional[Dict] = None
+
+class CorpusScheduler:
+    """
+    Analyse un lot de parties en dédupliquant les positions par hash Zobrist
+    
+    Une position demandée avec des critères de recherche différents (ex:
+    profondeur pour une partie, noeuds pour une autre) fait l'objet de
+    recherches séparées, chacune respectant sa limite.
+    """
+    
+    def __init__(self, analyzer: GameAnalyzer):
+        """
+        Initialise le planificateur
+        
+        Args:
+            analyzer: Analyseur démarré (fournit le moteur, le livre et le cache)
+        """
+        self.analyzer = analyzer
+        self.positions: Dict[SearchKey, _Position] = {}
+        self._games: List[Tuple[bool, List[chess.Move], List[Slot]]] = []
+    
+    def add_game(
+        self,
+        pgn: Union[str, chess.pgn.Game],
+        time_per_move: Optional[float] = 1.0,
+        depth: Optional[int] = None,
+        nodes: Optional[int] = None
+    ):
+        """
+        Ajoute une partie au lot sans lancer de recherche
+        
+        Les positions déjà rencontrées (ouvertures communes, répétitions)
+        avec les mêmes critères de recherche ne sont pas ajoutées une
+        seconde fois; si la nouvelle occurrence demande une recherche plus
+        poussée, c'est elle qui est retenue.
+        
+        Args:
+            pgn: Partie au format PGN ou partie déjà lue
+            time_per_move: Temps d'analyse par position en secondes
+            depth: Profondeur maximale de recherche (optionnel)
+            nodes: Nombre maximal de noeuds par recherche (optionnel)
+        
+        Raises:
+            ValueError: Si aucune limite de recherche n'est indiquée
+        """
+        if time_per_move is None and depth is None and nodes is None:
+            # chess.engine.Limit() sans borne: recherche infinie
+            raise ValueError("Aucune limite de recherche: indiquez time_per_move, depth ou nodes")
+        
+        analyzer = self.analyzer
+        game = read_game(pgn)
+        board = game.board()
+        moves = list(game.mainline_moves())
+        book_plies = analyzer.book.book_plies(board, moves) if analyzer.book else 0
+        limit = chess.engine.Limit(time=time_per_move, depth=depth, nodes=nodes)
+        criteria = limit_criteria(limit)
+        slots: List[Slot] = []
+        
+        for index in range(len(moves) + 1):
+            if index:
+                board.push(moves[index - 1])
+            
+            if index < book_plies:
+                analyzer._increment("book_plies")
+                slots.append(book_entry())
+                continue
+            
+            if index < len(moves) and board.legal_moves.count() == 1:
+                analyzer._increment("forced_plies")
+                slots.append(None)
+                continue
+            
+            # Les fins de partie dépendent de l'historique (répétitions, 75 coups)
+            terminal = analyzer._terminal_entry(board)
+            if terminal is not None:
+                slots.append(terminal)
+                continue
+            
+            key = (chess.polyglot.zobrist_hash(board), criteria)
+            position = self.positions.get(key)
+            if position is None:
+                self.positions[key] = _Position(board.copy(), limit)
+            else:
+                analyzer._increment("transpositions")
+                merged = merge_limits(position.limit, limit)
+                if merged != position.limit:
+                    position.limit = merged
+                    position.entry = None
+            slots.append(key)
+        
+        self._games.append((game.board().turn, moves, slots))
+    
+    def pending(self) -> int:
+        """Nombre de positions uniques restant à chercher"""
+        return sum(1 for position in self.positions.values() if position.entry is None)
+    
+    def run(self, pool: Optional[EnginePool] = None) -> List[List[MoveAnalysis]]:
+        """
+        Cherche les positions uniques puis construit les analyses des parties
+        
+        Les positions restent en mémoire: un lot ajouté ensuite ne
+        cherche que les positions nouvelles.
+        
+        Args:
+            pool: Pool de moteurs démarré pour répartir les recherches (optionnel)
+        
+        Returns:
+            Analyses des parties ajoutées depuis le dernier appel, dans
+            l'ordre d'ajout
+        """
+        searches = [position for position in self.positions.values() if position.entry is None]
+        if pool is None:
+            for position in searches:
+                position.entry = self.analyzer._evaluate(position.board, position.limit)
+        else:
+            def search(position: _Position) -> Dict:
+                return pool.run(lambda analyzer: analyzer._evaluate(position.board, position.limit))
+            
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                for position, entry in zip(searches, executor.map(search, searches)):
+                    position.entry = entry
+        
+        results = []
+        seen = set()
+        for turn, moves, slots in self._games:
+            entries = []
+            for slot in slots:
+                if isinstance(slot, tuple):
+                    entry = dict(self.positions[slot].entry)
+                    if slot in seen:
+                        # Le temps de recherche n'est compté qu'une fois
+                        entry["time"] = 0.0
+                    seen.add(slot)
+                    slot = entry
+                entries.append(slot)
+            
+            fill_forced_entries(moves, entries)
+            results.append(build_analyses(turn, moves, entries))
+        
+        self._games = []
+        return results
+
+def analyze_corpus(
+    analyzer: GameAnalyzer,
+    pgns: Iterable[Union[str, chess.pgn.Game]],
+    time_per_move: Optional[float] = 1.0,
+    depth: Optional[int] = None,
+    nodes: Optional[int] = None,
+    pool: Optional[EnginePool] = None
+) -> List[List[MoveAnalysis]]:
+    """
+    Analyse un corpus de parties en cherchant chaque position unique une fois
+    
+    Args:
+        analyzer: Analyseur démarré
+        pgns: Parties au format PGN ou parties déjà lues (ex: iter_games)
+        time_per_move: Temps d'analyse par position en secondes
+        depth: Profondeur maximale de recherche (optionnel)
+        nodes: Nombre maximal de noeuds par recherche (optionnel)
+        pool: Pool de moteurs démarré pour répartir les recherches (optionnel)
+    
+    Returns:
+        Analyses de chaque partie, dans l'ordre du corpus
+    """
+    scheduler = CorpusScheduler(analyzer)
+    for pgn in pgns:
+        scheduler.add_game(pgn, time_per_move, depth, nodes)
+    return scheduler.run(pool)
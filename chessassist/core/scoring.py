@@ -0,0 +1,245 @@
+"""
+Notation vectorisée des coups: probabilités de gain, précision et classification
+
+Les fonctions travaillent sur des tableaux NumPy couvrant une partie
+entière ou un corpus, sans appel moteur: changer les seuils et
+renoter des centaines de milliers de coups prend quelques millisecondes.
+
+Par défaut, précision et classification sont celles de GameAnalyzer
+(perte d'évaluation en pions, mêmes paliers et mêmes seuils); le modèle
+"win" note les coups sur la probabilité de gain perdue.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from chessassist.core.analyzer import (
+    ACCURACY_STEPS, BLUNDER_ACCURACY, CLASSIFICATION_THRESHOLDS, MATE_SCORE, MoveAnalysis
+)
+
+# Classifications, dans l'ordre de leurs codes
+CLASSIFICATIONS = ("excellent", "good", "inaccuracy", "mistake", "blunder", "book")
+BOOK = CLASSIFICATIONS.index("book")
+
+# Précision minimale de chaque classification (excellent, good, inaccuracy,
+# mistake): les seuils de GameAnalyzer
+DEFAULT_THRESHOLDS = CLASSIFICATION_THRESHOLDS
+
+# Modèles de précision: perte en pions (GameAnalyzer) ou perte de probabilité de gain
+ACCURACY_MODELS = ("loss", "win")
+
+# Pente de la sigmoïde centipions -> probabilité de gain (calibrée sur des parties réelles)
+WIN_PROBABILITY_SLOPE = 0.00368208
+
+# Évaluation (centipions) au-delà de laquelle la sigmoïde est saturée
+MAX_CENTIPAWNS = 1000
+
+# Évaluations (en pions) plus grandes sont des mats encodés par l'analyseur
+MATE_THRESHOLD = (MATE_SCORE - 1000) / 100.0
+
+def split_evaluations(evaluations) -> tuple:
+    """
+    Sépare des évaluations en pions en centipions et distances de mat
+    
+    Les mats encodés par l'analyseur (±(MATE_SCORE - n) / 100) et les
+    valeurs infinies deviennent des distances de mat signées.
+    
+    Args:
+        evaluations: Évaluations du point de vue des blancs (en pions)
+    
+    Returns:
+        Tuple (centipions int32, mat int16: 0 si pas de mat, > 0 si les blancs matent)
+    """
+    evaluations = np.asarray(evaluations, dtype=np.float64)
+    is_mate = np.abs(evaluations) >= MATE_THRESHOLD
+    finite = np.where(np.isfinite(evaluations), evaluations, np.sign(evaluations) * MATE_SCORE / 100.0)
+    distance = np.maximum(MATE_SCORE - np.rint(np.abs(finite) * 100), 1)
+    
+    centipawns = np.where(is_mate, 0, np.rint(finite * 100)).astype(np.int32)
+    mate = np.where(is_mate, np.sign(finite) * distance, 0).astype(np.int16)
+    return centipawns, mate
+
+def win_probability(centipawns, mate=None) -> np.ndarray:
+    """
+    Probabilité de gain des blancs (0 à 100) pour chaque évaluation
+    
+    Args:
+        centipawns: Évaluations en centipions (point de vue des blancs)
+        mate: Distances de mat signées (0: pas de mat), optionnel
+    
+    Returns:
+        Tableau float64 de probabilités en pourcentage
+    """
+    centipawns = np.clip(np.asarray(centipawns, dtype=np.float64), -MAX_CENTIPAWNS, MAX_CENTIPAWNS)
+    probability = 100.0 / (1.0 + np.exp(-WIN_PROBABILITY_SLOPE * centipawns))
+    if mate is not None:
+        mate = np.asarray(mate)
+        probability = np.where(mate > 0, 100.0, np.where(mate < 0, 0.0, probability))
+    return probability
+
+def loss_accuracy(before, after, white) -> np.ndarray:
+    """
+    Précision de chaque coup selon sa perte d'évaluation (paliers de GameAnalyzer)
+    
+    Args:
+        before: Évaluations avant les coups (pions, point de vue des blancs)
+        after: Évaluations après les coups
+        white: True pour les coups joués par les blancs
+    
+    Returns:
+        Précisions, identiques à calculate_accuracy coup par coup
+    """
+    before = np.asarray(before, dtype=np.float64)
+    after = np.asarray(after, dtype=np.float64)
+    loss = np.where(white, before - after, after - before)
+    bounds = np.array([max_loss for max_loss, _ in ACCURACY_STEPS])
+    values = np.array([accuracy for _, accuracy in ACCURACY_STEPS] + [BLUNDER_ACCURACY])
+    return values[np.searchsorted(bounds, loss, side="left")]
+
+def move_accuracy(win_before, win_after, white) -> np.ndarray:
+    """
+    Précision de chaque coup à partir de la probabilité de gain perdue
+    
+    Args:
+        win_before: Probabilités de gain des blancs avant les coups
+        win_after: Probabilités de gain des blancs après les coups
+        white: True pour les coups joués par les blancs
+    
+    Returns:
+        Précisions entre 0 et 100
+    """
+    win_before = np.asarray(win_before, dtype=np.float64)
+    win_after = np.asarray(win_after, dtype=np.float64)
+    loss = np.where(white, win_before - win_after, win_after - win_before)
+    accuracy = 103.1668 * np.exp(-0.04354 * np.maximum(loss, 0.0)) - 3.1669
+    return np.clip(accuracy, 0.0, 100.0)
+
+def classify(accuracy, thresholds: Sequence[float] = DEFAULT_THRESHOLDS) -> np.ndarray:
+    """
+    Codes de classification (indices de CLASSIFICATIONS) des précisions
+    
+    Args:
+        accuracy: Précisions entre 0 et 100
+        thresholds: Précisions minimales décroissantes de excellent, good,
+            inaccuracy et mistake
+    
+    Returns:
+        Tableau uint8 de codes
+    """
+    ascending = np.sort(np.asarray(thresholds, dtype=np.float64))
+    reached = np.searchsorted(ascending, np.asarray(accuracy, dtype=np.float64), side="right")
+    return (len(ascending) - reached).astype(np.uint8)
+
+def class_names(codes) -> List[str]:
+    """Noms des classifications correspondant à des codes"""
+    return [CLASSIFICATIONS[code] for code in np.asarray(codes).tolist()]
+
+@dataclass
+class GameScores:
+    """Notes d'une partie, alignées sur la liste des coups"""
+    win_probability: np.ndarray  # Une valeur par position (coups + 1)
+    accuracy: np.ndarray
+    classification: np.ndarray
+
+def score_moves(
+    before,
+    after,
+    white,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    book=None,
+    best=None,
+    model: str = "loss"
+) -> tuple:
+    """
+    Note des coups indépendants (ex: un corpus entier concaténé)
+    
+    Args:
+        before: Évaluations avant chaque coup (pions, point de vue des blancs)
+        after: Évaluations après chaque coup
+        white: True pour les coups joués par les blancs
+        thresholds: Seuils de classification
+        book: Masque des coups théoriques (optionnel)
+        best: Masque des coups identiques au meilleur coup du moteur (optionnel)
+        model: Modèle de précision ("loss": celui de GameAnalyzer, "win":
+            probabilité de gain perdue)
+    
+    Returns:
+        Tuple (précisions, codes de classification)
+    """
+    if model not in ACCURACY_MODELS:
+        raise ValueError(f"Modèle de précision inconnu: {model}")
+    
+    white = np.asarray(white, dtype=bool)
+    if model == "loss":
+        accuracy = loss_accuracy(before, after, white)
+    else:
+        win_before = win_probability(*split_evaluations(before))
+        win_after = win_probability(*split_evaluations(after))
+        accuracy = move_accuracy(win_before, win_after, white)
+    if best is not None:
+        accuracy = np.where(best, 100.0, accuracy)
+    if book is not None:
+        accuracy = np.where(book, 100.0, accuracy)
+    
+    codes = classify(accuracy, thresholds)
+    if book is not None:
+        codes = np.where(book, BOOK, codes).astype(np.uint8)
+    return accuracy, codes
+
+def score_game(
+    evaluations,
+    white_first: bool = True,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    book=None,
+    best=None,
+    model: str = "loss"
+) -> GameScores:
+    """
+    Note tous les coups d'une partie en une passe
+    
+    Args:
+        evaluations: Évaluations des positions (coups + 1, pions, point de vue des blancs)
+        white_first: True si les blancs jouent le premier coup
+        thresholds: Seuils de classification
+        book: Masque des coups théoriques (optionnel)
+        best: Masque des coups identiques au meilleur coup du moteur (optionnel)
+        model: Modèle de précision (voir score_moves)
+    
+    Returns:
+        Notes de la partie
+    """
+    evaluations = np.asarray(evaluations, dtype=np.float64)
+    white = (np.arange(len(evaluations) - 1) % 2 == 0) == white_first
+    accuracy, codes = score_moves(evaluations[:-1], evaluations[1:], white, thresholds, book, best, model)
+    return GameScores(
+        win_probability=win_probability(*split_evaluations(evaluations)),
+        accuracy=accuracy,
+        classification=codes
+    )
+
+def score_analyses(
+    analyses: List[MoveAnalysis],
+    white_first: bool = True,
+    initial_evaluation: float = 0.0,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    model: str = "loss"
+) -> GameScores:
+    """
+    Renote des analyses existantes sans moteur
+    
+    Args:
+        analyses: Analyses des coups d'une partie (ex: GameAnalyzer.analyze_game)
+        white_first: True si les blancs jouent le premier coup
+        initial_evaluation: Évaluation de la position initiale (non stockée)
+        thresholds: Seuils de classification
+        model: Modèle de précision (voir score_moves)
+    
+    Returns:
+        Notes de la partie
+    """
+    evaluations = [initial_evaluation] + [analysis.evaluation for analysis in analyses]
+    book = np.array([analysis.classification == "book" for analysis in analyses], dtype=bool)
+    best = np.array([analysis.move == analysis.best_move for analysis in analyses], dtype=bool)
+    return score_game(evaluations, white_first, thresholds, book, best, model)
@@ -0,0 +1,194 @@
+"""
+Stockage compact et en colonnes des analyses de parties
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from pathlib import Path
+
+import chess
+import numpy as np
+
+from chessassist.core.analyzer import MATE_SCORE, MoveAnalysis
+from chessassist.core.scoring import CLASSIFICATIONS, split_evaluations
+
+# Une colonne contiguë par champ, une ligne par coup analysé (les parties
+# sont délimitées par AnalysisStore.offsets)
+COLUMNS = {
+    "move": np.dtype(np.uint16),
+    "best_move": np.dtype(np.uint16),
+    "evaluation": np.dtype(np.int16),  # Centipions, ou distance de mat signée si "mate"
+    "mate": np.dtype(np.bool_),
+    "accuracy": np.dtype(np.float32),
+    "classification": np.dtype(np.uint8),
+    "time_spent": np.dtype(np.float32)
+}
+
+# Début de chaque partie dans les colonnes, plus la fin de la dernière
+OFFSETS_FILE = "offsets.npy"
+
+def encode_move(uci: Optional[str]) -> int:
+    """
+    Encode un coup UCI sur 16 bits (0: aucun coup)
+    
+    Args:
+        uci: Coup en notation UCI (ex: "e7e8q") ou None
+    
+    Returns:
+        Case de départ, case d'arrivée et promotion sur 6 + 6 + 3 bits
+    """
+    if not uci:
+        return 0
+    move = chess.Move.from_uci(uci)
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+def decode_move(code: int) -> Optional[str]:
+    """Décode un coup encodé par encode_move"""
+    if not code:
+        return None
+    promotion = code >> 12
+    return chess.Move(code & 63, code >> 6 & 63, promotion or None).uci()
+
+class GameView:
+    """Vue paresseuse sur les analyses d'une partie stockée"""
+    
+    __slots__ = ("columns",)
+    
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Initialise la vue
+        
+        Args:
+            columns: Tranches des colonnes couvrant la partie (sans copie)
+        """
+        self.columns = columns
+    
+    def __len__(self) -> int:
+        return len(self.columns["move"])
+    
+    def __getitem__(self, index: int) -> MoveAnalysis:
+        """Construit le MoveAnalysis d'un coup à la demande"""
+        columns = self.columns
+        return MoveAnalysis(
+            move=decode_move(int(columns["move"][index])),
+            evaluation=float(_evaluations(columns["evaluation"][index], columns["mate"][index])),
+            best_move=decode_move(int(columns["best_move"][index])),
+            accuracy=float(columns["accuracy"][index]),
+            classification=CLASSIFICATIONS[columns["classification"][index]],
+            time_spent=float(columns["time_spent"][index])
+        )
+    
+    def __iter__(self) -> Iterator[MoveAnalysis]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    @property
+    def evaluations(self) -> np.ndarray:
+        """Évaluations après chaque coup (pions, point de vue des blancs)"""
+        return _evaluations(self.columns["evaluation"], self.columns["mate"])
+    
+    @property
+    def accuracy(self) -> np.ndarray:
+        """Précision de chaque coup"""
+        return self.columns["accuracy"].astype(np.float64)
+    
+    @property
+    def classification(self) -> np.ndarray:
+        """Codes de classification (indices de CLASSIFICATIONS)"""
+        return self.columns["classification"]
+
+def _evaluations(evaluation, mate) -> np.ndarray:
+    """Reconstruit les évaluations en pions (mats encodés comme dans l'analyseur)"""
+    evaluation = np.asarray(evaluation, dtype=np.float64)
+    mated = np.sign(evaluation) * (MATE_SCORE - np.abs(evaluation))
+    return np.where(mate, mated, evaluation) / 100.0
+
+class AnalysisStore:
+    """Analyses d'un ensemble de parties, une colonne contiguë par champ"""
+    
+    def __init__(self, columns: Dict[str, np.ndarray], offsets: np.ndarray):
+        """
+        Initialise le stockage
+        
+        Args:
+            columns: Colonnes COLUMNS, de même longueur, triées par partie
+            offsets: Début de chaque partie dans les colonnes, plus la fin
+                de la dernière (parties sans coup comprises)
+        """
+        self.columns = columns
+        self.offsets = offsets
+    
+    @classmethod
+    def from_games(cls, games: Iterable[List[MoveAnalysis]]) -> "AnalysisStore":
+        """
+        Construit le stockage à partir d'analyses de parties
+        
+        Args:
+            games: Analyses de chaque partie (ex: résultats de analyze_game)
+        
+        Returns:
+            Stockage contenant toutes les parties, dans l'ordre
+        """
+        games = list(games)
+        offsets = np.zeros(len(games) + 1, dtype=np.int64)
+        np.cumsum([len(analyses) for analyses in games], out=offsets[1:])
+        analyses = [analysis for game in games for analysis in game]
+        
+        centipawns, mate = split_evaluations([analysis.evaluation for analysis in analyses])
+        values = {
+            "move": [encode_move(analysis.move) for analysis in analyses],
+            "best_move": [encode_move(analysis.best_move) for analysis in analyses],
+            "evaluation": np.where(mate != 0, mate, np.clip(centipawns, -32767, 32767)),
+            "mate": mate != 0,
+            "accuracy": [analysis.accuracy for analysis in analyses],
+            "classification": [CLASSIFICATIONS.index(analysis.classification) for analysis in analyses],
+            "time_spent": [analysis.time_spent for analysis in analyses]
+        }
+        columns = {name: np.asarray(values[name], dtype=dtype).reshape(len(analyses)) for name, dtype in COLUMNS.items()}
+        return cls(columns, offsets)
+    
+    def __len__(self) -> int:
+        """Nombre de parties"""
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index: int) -> GameView:
+        """Vue sur les analyses d'une partie"""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return GameView({name: column[start:end] for name, column in self.columns.items()})
+    
+    def __iter__(self) -> Iterator[GameView]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def save(self, path: Union[str, Path]):
+        """
+        Écrit le stockage dans un répertoire, un fichier .npy par colonne
+        
+        Args:
+            path: Chemin du répertoire (créé si besoin)
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, OFFSETS_FILE), self.offsets, allow_pickle=False)
+        for name, column in self.columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), column, allow_pickle=False)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "AnalysisStore":
+        """
+        Charge un répertoire écrit par save()
+        
+        Args:
+            path: Chemin du répertoire
+            mmap: Projette les fichiers en mémoire au lieu de les lire (sans copie)
+        
+        Returns:
+            Stockage en lecture seule si mmap
+        """
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode, allow_pickle=False)
+            for name in COLUMNS
+        }
+        return cls(columns, np.load(os.path.join(path, OFFSETS_FILE), allow_pickle=False))
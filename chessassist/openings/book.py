@@ -0,0 +1,160 @@
+"""
+Livre d'ouvertures: détection des coups théoriques sans moteur
+"""
+
+import re
+from typing import Iterable, List, Optional, Set
+
+import chess
+import chess.polyglot
+
+from chessassist.openings.eco import EcoIndex
+from chessassist.openings.recommender import OpeningRecommender
+
+# Numéros de coups dans une notation "1.e4 e5 2.Nf3" ou "1... e5"
+MOVE_NUMBER = re.compile(r"\d+\.(\.\.)?")
+
+def parse_move_text(moves: str) -> List[str]:
+    """
+    Découpe une suite de coups en notation algébrique
+    
+    Args:
+        moves: Notation des coups (ex: "1.e4 e5 2.Nf3")
+    
+    Returns:
+        Liste des coups SAN (ex: ["e4", "e5", "Nf3"])
+    """
+    return MOVE_NUMBER.sub(" ", moves).split()
+
+class OpeningBook:
+    """Livre d'ouvertures basé sur des lignes théoriques ou un fichier Polyglot"""
+    
+    def __init__(self, positions: Optional[Set[int]] = None, polyglot_path: Optional[str] = None):
+        """
+        Initialise le livre
+        
+        Args:
+            positions: Hash Zobrist des positions théoriques
+            polyglot_path: Chemin vers un livre Polyglot (.bin)
+        """
+        self.positions = positions or set()
+        self.reader = chess.polyglot.open_reader(polyglot_path) if polyglot_path else None
+    
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "OpeningBook":
+        """
+        Construit un livre à partir de lignes théoriques
+        
+        Args:
+            lines: Suites de coups en notation algébrique
+        
+        Returns:
+            Livre contenant toutes les positions de ces lignes
+        """
+        positions = set()
+        for line in lines:
+            board = chess.Board()
+            for san in parse_move_text(line):
+                try:
+                    board.push_san(san)
+                except ValueError:
+                    break
+                positions.add(chess.polyglot.zobrist_hash(board))
+        return cls(positions)
+    
+    @classmethod
+    def from_recommender(cls, recommender: Optional[OpeningRecommender] = None) -> "OpeningBook":
+        """
+        Construit un livre à partir des ouvertures connues du recommandeur
+        
+        Args:
+            recommender: Système de recommandation (par défaut: base intégrée)
+        
+        Returns:
+            Livre d'ouvertures
+        """
+        recommender = recommender or OpeningRecommender()
+        return cls.from_lines(opening.moves for opening in recommender.openings)
+    
+    @classmethod
+    def from_eco_index(cls, index: Optional[EcoIndex] = None) -> "OpeningBook":
+        """
+        Construit un livre à partir de la table ECO
+        
+        Args:
+            index: Index ECO (par défaut: tables livrées avec le paquet)
+        
+        Returns:
+            Livre contenant toutes les positions des lignes ECO
+        """
+        if index is None:
+            index = EcoIndex.default()
+        return cls.from_lines(entry.moves for entry in index.entries.values())
+    
+    @classmethod
+    def from_polyglot(cls, path: str) -> "OpeningBook":
+        """
+        Ouvre un livre Polyglot
+        
+        Args:
+            path: Chemin vers le fichier .bin
+        
+        Returns:
+            Livre d'ouvertures
+        """
+        return cls(polyglot_path=path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Ferme le fichier Polyglot éventuel"""
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+    
+    def is_book_move(self, board: chess.Board, move: chess.Move) -> bool:
+        """
+        Indique si un coup est théorique dans une position
+        
+        Args:
+            board: Position avant le coup
+            move: Coup joué
+        
+        Returns:
+            True si le coup figure dans le livre
+        """
+        if self.reader is not None and any(entry.move == move for entry in self.reader.find_all(board)):
+            return True
+        
+        if not self.positions:
+            return False
+        
+        board.push(move)
+        try:
+            return chess.polyglot.zobrist_hash(board) in self.positions
+        finally:
+            board.pop()
+    
+    def book_plies(self, board: chess.Board, moves: Iterable[chess.Move]) -> int:
+        """
+        Compte les demi-coups théoriques au début d'une partie
+        
+        Args:
+            board: Position initiale (non modifiée)
+            moves: Coups de la partie
+        
+        Returns:
+            Nombre de demi-coups joués avant la première nouveauté
+        """
+        board = board.copy()
+        plies = 0
+        for move in moves:
+            if not self.is_book_move(board, move):
+                break
+            board.push(move)
+            plies += 1
+        return plies
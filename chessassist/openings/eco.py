@@ -0,0 +1,276 @@
+"""
+Classification ECO des parties par position, indépendante de la notation
+"""
+
+import csv
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import chess
+import chess.pgn
+
+# Tables ECO livrées avec le paquet (format TSV eco/name/pgn des tables
+# lichess chess-openings: les fichiers a.tsv à e.tsv peuvent y être déposés)
+DATA_DIRECTORY = Path(__file__).parent / "data"
+
+# En-têtes PGN en début de texte
+HEADER_SECTION = re.compile(r"\s*(?:\[[^\n]*\n\s*)*")
+FEN_HEADER = re.compile(r'\[FEN "')
+
+# Éléments du texte des coups: commentaires, NAG, numéros, variantes, coups
+MOVETEXT_TOKEN = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+|\d+\.+|[()]|[^\s(){};$]+")
+
+RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+@dataclass(frozen=True)
+class EcoEntry:
+    """Ligne de la table ECO"""
+    eco: str
+    name: str
+    moves: str
+    plies: int
+
+# Clé exacte d'une position (pièces, trait, roques, prise en passant)
+PositionKey = Tuple[int, ...]
+
+def position_key(board: chess.Board) -> PositionKey:
+    """
+    Clé d'une position, équivalente à un EPD ou à un hash Zobrist sans collision
+
+    Construite directement à partir des bitboards: bien moins coûteuse
+    que chess.polyglot.zobrist_hash lors du classement de nombreuses parties.
+
+    Args:
+        board: Position
+
+    Returns:
+        Tuple hachable
+    """
+    ep_square = board.ep_square if board.ep_square is not None and board.has_legal_en_passant() else -1
+    return (
+        board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+        board.occupied_co[chess.WHITE], board.turn, board.clean_castling_rights(), ep_square
+    )
+
+def iter_san_tokens(text: str) -> Iterator[str]:
+    """
+    Extrait les coups de la ligne principale d'un PGN ou d'une suite de coups
+    
+    En-têtes, commentaires (ex: {[%clk 0:09:58]}), NAG, numéros de coups
+    et variantes sont ignorés; les annotations (!, ?) et les symboles
+    d'échec sont retirés, si bien que deux notations d'une même partie
+    donnent les mêmes coups.
+    
+    Args:
+        text: Partie PGN ou coups (ex: "1.e4 e5 2.Nf3")
+    
+    Yields:
+        Coups SAN normalisés (ex: "e4", "O-O")
+    """
+    depth = 0
+    for match in MOVETEXT_TOKEN.finditer(text, HEADER_SECTION.match(text).end()):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth or token[0] in "{;$":
+            continue
+        elif token in RESULTS:
+            return
+        elif token[0].isdigit() and token[-1] == ".":
+            continue
+        else:
+            token = token.rstrip("+#!?")
+            yield token.replace("0", "O") if token.startswith("0-0") else token
+
+class EcoIndex:
+    """Index des positions de la table ECO, avec mémoire des préfixes déjà classés"""
+    
+    def __init__(self, entries: Dict[PositionKey, EcoEntry], book: Set[PositionKey], max_off_book: int = 6, cache_size: int = 200_000):
+        """
+        Initialise l'index
+        
+        Args:
+            entries: Ligne ECO de chaque position (voir position_key) terminant une ligne
+            book: Clés de toutes les positions des lignes ECO
+            max_off_book: Demi-coups consécutifs hors table avant d'arrêter la
+                recherche d'une transposition
+            cache_size: Nombre maximal de préfixes de parties mémorisés
+        """
+        self.entries = entries
+        self.book = book
+        self.max_off_book = max_off_book
+        self.cache_size = cache_size
+        self.max_plies = max((entry.plies for entry in entries.values()), default=0) + max_off_book
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """Vide la mémoire des préfixes (le nœud 0 est la position initiale)"""
+        # Nœud: (position, ligne ECO la plus profonde atteinte, demi-coups hors table);
+        # la position est None quand la recherche s'arrête à ce nœud
+        self._nodes: List[Tuple[Optional[chess.Board], Optional[EcoEntry], int]] = [
+            (chess.Board(), self.entries.get(position_key(chess.Board())), 0)
+        ]
+        self._children: Dict[Tuple[int, str], int] = {}
+    
+    @classmethod
+    def from_lines(cls, lines: Iterable[Tuple[str, str, str]], **kwargs) -> "EcoIndex":
+        """
+        Construit l'index à partir de lignes (code ECO, nom, coups)
+        
+        Args:
+            lines: Lignes de la table (coups en notation algébrique)
+            **kwargs: Arguments supplémentaires pour EcoIndex
+        
+        Returns:
+            Index des positions; une position atteinte par plusieurs lignes
+            garde la plus longue (puis la première)
+        """
+        entries: Dict[PositionKey, EcoEntry] = {}
+        book: Set[PositionKey] = set()
+        for eco, name, moves in lines:
+            board = chess.Board()
+            try:
+                for san in iter_san_tokens(moves):
+                    board.push_san(san)
+                    book.add(position_key(board))
+            except ValueError:
+                continue
+            
+            key = position_key(board)
+            entry = EcoEntry(eco=eco, name=name, moves=moves, plies=len(board.move_stack))
+            if key not in entries or entries[key].plies < entry.plies:
+                entries[key] = entry
+        return cls(entries, book, **kwargs)
+    
+    @classmethod
+    def from_tsv(cls, paths: Iterable[Union[str, Path]], **kwargs) -> "EcoIndex":
+        """
+        Construit l'index à partir de fichiers TSV (colonnes eco, name, pgn)
+        
+        Args:
+            paths: Fichiers TSV (ex: tables lichess chess-openings)
+            **kwargs: Arguments supplémentaires pour EcoIndex
+        
+        Returns:
+            Index des positions
+        """
+        def lines() -> Iterator[Tuple[str, str, str]]:
+            for path in paths:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    for row in csv.DictReader(f, delimiter="\t"):
+                        yield row["eco"], row["name"], row["pgn"]
+        
+        return cls.from_lines(lines(), **kwargs)
+    
+    @classmethod
+    def default(cls) -> "EcoIndex":
+        """Index partagé des tables livrées avec le paquet (construit au premier appel)"""
+        global _DEFAULT_INDEX
+        if _DEFAULT_INDEX is None:
+            _DEFAULT_INDEX = cls.from_tsv(sorted(DATA_DIRECTORY.glob("*.tsv")))
+        return _DEFAULT_INDEX
+    
+    def __len__(self) -> int:
+        """Nombre de positions nommées"""
+        return len(self.entries)
+    
+    def lookup(self, board: chess.Board) -> Optional[EcoEntry]:
+        """Ligne ECO terminant exactement sur une position"""
+        return self.entries.get(position_key(board))
+    
+    def _child(self, node: int, token: str, san: bool) -> Optional[int]:
+        """Nœud atteint en jouant un coup depuis un nœud (verrou tenu)"""
+        child = self._children.get((node, token))
+        if child is not None:
+            return child
+        
+        board, entry, off_book = self._nodes[node]
+        board = board.copy(stack=False)
+        try:
+            if san:
+                board.push_san(token)
+            else:
+                board.push_uci(token)
+        except ValueError:
+            return None
+        
+        key = position_key(board)
+        entry = self.entries.get(key, entry)
+        off_book = 0 if key in self.book else off_book + 1
+        self._nodes.append((board if off_book < self.max_off_book else None, entry, off_book))
+        child = len(self._nodes) - 1
+        self._children[(node, token)] = child
+        return child
+    
+    def _classify(self, tokens: Iterable[str], san: bool) -> Optional[EcoEntry]:
+        """Ligne ECO la plus profonde atteinte par une suite de coups depuis la position initiale"""
+        with self._lock:
+            if len(self._nodes) > self.cache_size:
+                self._reset()
+            
+            node = 0
+            for ply, token in enumerate(tokens):
+                if ply >= self.max_plies or self._nodes[node][0] is None:
+                    break
+                child = self._child(node, token, san)
+                if child is None:
+                    break
+                node = child
+            return self._nodes[node][1]
+    
+    def classify_pgn(self, text: str) -> Optional[EcoEntry]:
+        """
+        Classe une partie PGN ou une suite de coups
+        
+        Seuls les premiers demi-coups sont lus et rejoués; les préfixes
+        déjà vus ne sont pas rejoués, ce qui rend la classification d'un
+        grand nombre de parties presque linéaire en nombre de coups.
+        
+        Args:
+            text: Partie PGN (en-têtes compris) ou coups (ex: "1.e4 e5 2.Nf3")
+        
+        Returns:
+            Ligne ECO la plus profonde atteinte (transpositions comprises),
+            ou None (aucune ligne, ou partie ne partant pas de la position initiale)
+        """
+        if FEN_HEADER.search(text, 0, HEADER_SECTION.match(text).end()):
+            return None
+        return self._classify(iter_san_tokens(text), san=True)
+    
+    def classify_game(self, game: chess.pgn.Game) -> Optional[EcoEntry]:
+        """
+        Classe une partie déjà lue
+        
+        Args:
+            game: Partie PGN
+        
+        Returns:
+            Ligne ECO la plus profonde atteinte, ou None
+        """
+        if game.board() != chess.Board():
+            return None
+        return self.classify_moves(game.mainline_moves())
+    
+    def classify_moves(self, moves: Iterable[chess.Move]) -> Optional[EcoEntry]:
+        """
+        Classe une suite de coups joués depuis la position initiale
+        
+        Args:
+            moves: Coups de la partie
+        
+        Returns:
+            Ligne ECO la plus profonde atteinte, ou None
+        """
+        return self._classify((move.uci() for move in moves), san=False)
+
+_DEFAULT_INDEX: Optional[EcoIndex] = None
+
+def classify_pgn(text: str) -> Optional[EcoEntry]:
+    """Classe une partie PGN avec l'index par défaut (voir EcoIndex.classify_pgn)"""
+    return EcoIndex.default().classify_pgn(text)
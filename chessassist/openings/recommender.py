@@ -2,10 +2,12 @@
 Système de recommandations d'ouvertures d'échecs
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from chessassist.openings.eco import EcoIndex
+
 class Difficulty(Enum):
     """Niveaux de difficulté des ouvertures"""
     BEGINNER = 1
@@ -38,6 +40,7 @@ class OpeningRecommender:
     def __init__(self):
         """Initialise le système avec une base d'ouvertures"""
         self.openings = self._load_opening_database()
+        self._index: Optional[EcoIndex] = None
     
     def _load_opening_database(self) -> List[Opening]:
         """Charge la base de données des ouvertures"""
@@ -348,11 +351,15 @@ class OpeningRecommender:
         Returns:
             Ouverture correspondante ou None
         """
-        # Normalise les coups
-        normalized_moves = moves.strip().lower()
+        # Les coups sont rejoués: l'ouverture est reconnue à sa position,
+        # quels que soient l'ordre des coups et la notation
+        if self._index is None:
+            self._index = EcoIndex.from_lines((o.eco_code, o.name, o.moves) for o in self.openings)
         
+        entry = self._index.classify_pgn(moves)
+        if entry is None:
+            return None
         for opening in self.openings:
-            if opening.moves.lower() in normalized_moves:
+            if opening.eco_code == entry.eco and opening.name == entry.name:
                 return opening
-        
         return None
\ No newline at end of file
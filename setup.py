@@ -38,6 +38,7 @@ setup(
             "chessassist=chessassist.__main__:cli",
         ],
     },
+    package_data={"chessassist.openings": ["data/*.tsv"]},
     include_package_data=True,
     zip_safe=False,
 )
\ No newline at end of file
@@ -2,9 +2,20 @@
 Tests pour le module d'analyse
 """
 
+import asyncio
+import io
+import os
+import sys
+import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+import chess
+import chess.engine
 from chessassist.core.analyzer import GameAnalyzer, MoveAnalysis
+from chessassist.core.async_analyzer import AsyncGameAnalyzer
+from chessassist.core.cache import EvaluationCache
+from chessassist.core.pgn_stream import iter_games, match_headers, scan_games
+from chessassist.openings.book import OpeningBook
 
 class TestGameAnalyzer(unittest.TestCase):
     """Tests pour GameAnalyzer"""
@@ -57,5 +68,318 @@ class TestGameAnalyzer(unittest.TestCase):
         accuracy = analyzer._calculate_accuracy(1.0, -0.5, True)
         self.assertEqual(accuracy, 25.0)
 
+    def test_analyze_game_single_pass(self):
+        """Chaque position n'est cherchée qu'une fois"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        
+        def fake_analyse(board, limit):
+            best = next(iter(board.legal_moves))
+            return {
+                "score": chess.engine.PovScore(chess.engine.Cp(30), chess.WHITE),
+                "pv": [best],
+                "depth": 10,
+                "nodes": 1000
+            }
+        
+        analyzer.engine.analyse.side_effect = fake_analyse
+        analyses = analyzer.analyze_game(self.test_pgn, time_per_move=0.01)
+        
+        self.assertEqual(len(analyses), 10)
+        self.assertEqual(analyzer.engine.analyse.call_count, 11)
+        self.assertTrue(all(isinstance(a, MoveAnalysis) for a in analyses))
+        self.assertEqual(analyses[0].move, "e2e4")
+        self.assertAlmostEqual(analyses[0].evaluation, 0.3)
+    
+    def test_analyze_pgn_file_with_filter(self):
+        """Seules les parties filtrées d'un fichier PGN sont analysées"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        analyzer.engine.analyse.side_effect = lambda board, limit: {
+            "score": chess.engine.PovScore(chess.engine.Cp(0), board.turn),
+            "pv": [next(iter(board.legal_moves))]
+        }
+        
+        other_game = self.test_pgn.replace("Player1", "Player3").replace("1-0", "0-1")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "games.pgn")
+            with open(path, "w") as f:
+                f.write(self.test_pgn + "\n" + other_game + "\n" + self.test_pgn)
+            
+            results = list(analyzer.analyze_pgn_file(path, match_headers(White="player1"), time_per_move=0.01))
+        
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(headers["White"] == "Player1" for headers, _ in results))
+        self.assertEqual(len(results[0][1]), 10)
+    
+    def test_scan_games_byte_offsets(self):
+        """Les parties sont découpées en octets, commentaires multilignes compris"""
+        first = '[Event "Tournoi d\'été"]\n[White "Éloïse"]\n\n1. e4 {premier\n\ncoup} e5 *\n\n'
+        second = '[Event "Blitz"]\n[White "Bob"]\n\n1. d4 d5 *\n'
+        data = (first + second).encode("utf-8")
+        
+        offsets = [offset for offset, _ in scan_games(io.BytesIO(data))]
+        self.assertEqual(offsets, [0, len(first.encode("utf-8"))])
+        
+        games = list(iter_games(io.BytesIO(data), match_headers(White="éloïse")))
+        self.assertEqual(len(games), 1)
+        self.assertEqual(games[0].headers["Event"], "Tournoi d'été")
+        self.assertEqual([move.uci() for move in games[0].mainline_moves()], ["e2e4", "e7e5"])
+    
+    def test_book_moves_not_searched(self):
+        """Les coups théoriques sont classés "book" sans appel au moteur"""
+        analyzer = GameAnalyzer("fake_stockfish_path", book=OpeningBook.from_recommender())
+        analyzer.engine = MagicMock()
+        analyzer.engine.analyse.side_effect = lambda board, limit: {
+            "score": chess.engine.PovScore(chess.engine.Cp(0), board.turn),
+            "pv": [next(iter(board.legal_moves))]
+        }
+        
+        analyses = analyzer.analyze_game(self.test_pgn, time_per_move=0.01)
+        
+        # Partie espagnole: 1.e4 e5 2.Nf3 Nc6 3.Bb5 est théorique
+        self.assertEqual([a.classification for a in analyses[:5]], ["book"] * 5)
+        self.assertNotEqual(analyses[5].classification, "book")
+        self.assertEqual(analyzer.engine.analyse.call_count, 6)
+    
+    def test_forced_move_not_searched(self):
+        """Une position à coup unique prend l'évaluation de la suivante"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        analyzer.engine.analyse.side_effect = lambda board, limit: {
+            "score": chess.engine.PovScore(chess.engine.Cp(-200), chess.BLACK),
+            "pv": [next(iter(board.legal_moves))]
+        }
+        
+        analyses = analyzer.analyze_game("1. e4 f5 2. Qh5+ g6 *", time_per_move=0.01)
+        
+        # 5 positions dont une forcée (après 2. Qh5+)
+        self.assertEqual(analyzer.engine.analyse.call_count, 4)
+        self.assertEqual(analyses[3].best_move, "g7g6")
+        self.assertEqual(analyses[3].accuracy, 100.0)
+        self.assertAlmostEqual(analyses[2].evaluation, 2.0)
+    
+    def test_search_limit_required(self):
+        """Sans aucune limite, l'analyse est refusée au lieu de chercher indéfiniment"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        
+        with self.assertRaises(ValueError):
+            analyzer.analyze_game("1. e4 e5 *", time_per_move=None)
+        analyzer.engine.analyse.assert_not_called()
+    
+    def test_budget_shared_between_searched_positions(self):
+        """Le budget n'est réparti qu'entre les positions réellement cherchées"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock(spec=["analyse", "id", "quit"])
+        analyzer.engine.analyse.side_effect = lambda board, limit: {
+            "score": chess.engine.PovScore(chess.engine.Cp(0), board.turn),
+            "pv": [next(iter(board.legal_moves))]
+        }
+        
+        analyzer.analyze_game("1. e4 f5 2. Qh5+ g6 *", budget=0.4)
+        
+        # 5 positions dont une forcée: 4 recherches, au plus 2 * 0.4 / 4 chacune
+        limits = [call.args[1] for call in analyzer.engine.analyse.call_args_list]
+        self.assertEqual(len(limits), 4)
+        self.assertAlmostEqual(limits[0].time, 0.2)
+    
+    def test_adaptive_search_stops_when_stable(self):
+        """La recherche adaptative s'arrête quand le score est stable"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        board = chess.Board()
+        infos = [
+            {"depth": depth, "score": chess.engine.PovScore(chess.engine.Cp(30), chess.WHITE),
+             "pv": [chess.Move.from_uci("e2e4")]}
+            for depth in range(1, 30)
+        ]
+        
+        analysis = MagicMock()
+        analysis.__enter__.return_value = analysis
+        analysis.__iter__.return_value = iter(infos)
+        analysis.info = infos[7]
+        analyzer.engine.analysis.return_value = analysis
+        
+        entry = analyzer._evaluate(board, chess.engine.Limit(time=5.0), adaptive=True)
+        
+        analysis.stop.assert_called_once()
+        self.assertEqual(entry["depth"], 8)
+        self.assertEqual(entry["best_move"], "e2e4")
+        self.assertIn("time", entry)
+    
+    def test_adaptive_search_caches_time_spent(self):
+        """Une recherche arrêtée tôt n'est pas reprise pour une recherche longue"""
+        with tempfile.TemporaryDirectory() as directory, EvaluationCache(os.path.join(directory, "cache.sqlite")) as cache:
+            analyzer = GameAnalyzer("fake_stockfish_path", cache=cache)
+            analyzer.engine = MagicMock()
+            analyzer.engine.id = {"name": "Stockfish 16"}
+            board = chess.Board()
+            info = {"depth": 8, "score": chess.engine.PovScore(chess.engine.Cp(30), chess.WHITE),
+                    "pv": [chess.Move.from_uci("e2e4")]}
+            analysis = MagicMock()
+            analysis.__enter__.return_value = analysis
+            analysis.__iter__.return_value = iter([info])
+            analysis.info = info
+            analyzer.engine.analysis.return_value = analysis
+            
+            analyzer._evaluate(board, chess.engine.Limit(time=5.0), adaptive=True)
+            
+            self.assertIsNotNone(cache.get(board, analyzer._engine_key))
+            self.assertIsNone(cache.get(board, analyzer._engine_key, min_time=5.0))
+    
+    def test_errors_are_counted(self):
+        """Les erreurs moteur sont comptées au lieu d'être perdues"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        analyzer.engine.analyse.side_effect = chess.engine.EngineTerminatedError("mort")
+        
+        result = analyzer.analyze_position(chess.Board(), time_limit=0.01)
+        
+        self.assertIn("error", result)
+        self.assertEqual(analyzer.metrics.counters["errors"], 1)
+        self.assertEqual(analyzer.metrics.errors_by_type, {"EngineTerminatedError": 1})
+    
+    def test_evaluate_checkmate_without_engine(self):
+        """Les positions de mat sont évaluées sans moteur"""
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        
+        board = chess.Board()
+        for san in ["f3", "e5", "g4", "Qh4#"]:
+            board.push_san(san)
+        
+        entry = analyzer._evaluate(board, chess.engine.Limit(time=0.01))
+        self.assertLess(entry["evaluation"], -90)
+        analyzer.engine.analyse.assert_not_called()
+
+# Moteur UCI simulé utilisé pour les tests de bout en bout
+FAKE_ENGINE = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fake_uci.py"),
+    "--delay", "0.001"
+]
+
+class TestGameAnalyzerWithFakeEngine(unittest.TestCase):
+    """Tests de bout en bout avec le moteur UCI simulé"""
+    
+    def test_analyze_game_depth_limit(self):
+        """Analyse complète limitée en profondeur"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            analyses = analyzer.analyze_game("1. e4 e5 2. Nf3 Nc6 *", time_per_move=None, depth=4)
+        
+        self.assertEqual(len(analyses), 4)
+        self.assertTrue(all(a.best_move for a in analyses))
+    
+    def test_analyze_game_budget(self):
+        """Le mode budget respecte approximativement le temps alloué"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            analyses = analyzer.analyze_game("1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *", budget=0.5)
+        
+        spent = sum(a.time_spent for a in analyses)
+        self.assertEqual(len(analyses), 6)
+        self.assertGreater(spent, 0)
+        self.assertLess(spent, 1.0)
+    
+    def test_metrics(self):
+        """Les métriques par partie et cumulées sont renseignées"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            result = analyzer.analyze_position(chess.Board(), time_limit=0.01)
+            analyzer.analyze_game("1. e4 f5 2. Qh5+ g6 *", time_per_move=None, depth=3)
+        
+        for key in ("seldepth", "nps", "time", "hashfull", "tbhits", "elapsed"):
+            self.assertIn(key, result)
+        self.assertFalse(result["cached"])
+        
+        game = analyzer.last_game_metrics.to_dict()
+        self.assertEqual(game["counters"]["engine_calls"], 4)
+        self.assertEqual(game["counters"]["forced_plies"], 1)
+        self.assertEqual(game["histograms"]["depth"]["max"], 3)
+        self.assertEqual(analyzer.metrics.counters["engine_calls"], 5)
+    
+    def test_triage_researches_only_suspicious_moves(self):
+        """Le mode deux passes ne recherche en profondeur que les coups suspects"""
+        pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            quiet = analyzer.analyze_game(pgn, time_per_move=None, depth=6, triage_depth=2, triage_threshold=100)
+            self.assertEqual(analyzer.last_game_metrics.counters["triage_researches"], 0)
+            self.assertEqual(analyzer.last_game_metrics.histograms["depth"].max, 2)
+            
+            deep = analyzer.analyze_game(pgn, time_per_move=None, depth=6, triage_depth=2, triage_threshold=0)
+            researched = analyzer.last_game_metrics.counters["triage_researches"]
+            full = analyzer.analyze_game(pgn, time_per_move=None, depth=6)
+            
+            with self.assertRaises(ValueError):
+                analyzer.analyze_game(pgn, budget=1.0, triage_depth=2)
+        
+        self.assertEqual(len(quiet), 6)
+        self.assertGreater(researched, 0)
+        self.assertLessEqual(researched, 7)
+        # Les coups suspects sont classés à partir des évaluations complètes
+        for triaged, reference in zip(deep, full):
+            if triaged.move != triaged.best_move:
+                self.assertEqual(triaged.evaluation, reference.evaluation)
+
+    def test_triage_not_answered_by_cache(self):
+        """La seconde passe ne reprend pas du cache les évaluations du balayage"""
+        pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with EvaluationCache(os.path.join(tmpdir, "cache.sqlite"), min_depth=1) as cache:
+                with GameAnalyzer(FAKE_ENGINE, cache=cache) as analyzer:
+                    analyzer.analyze_game(pgn, time_per_move=0.05, triage_depth=2, triage_threshold=0)
+                    metrics = analyzer.last_game_metrics
+        
+        self.assertGreater(metrics.counters["triage_researches"], 0)
+        self.assertEqual(metrics.counters["cache_hits"], 0)
+        self.assertGreater(metrics.histograms["depth"].max, 2)
+
+class TestAsyncGameAnalyzer(unittest.TestCase):
+    """Tests pour AsyncGameAnalyzer"""
+    
+    def _fake_protocol(self, delay=0.0):
+        """Crée un protocole moteur simulé"""
+        protocol = MagicMock()
+        protocol.id = {"name": "Fake"}
+        protocol.quit = AsyncMock()
+        protocol.configure = AsyncMock()
+        
+        async def fake_analyse(board, limit):
+            await asyncio.sleep(delay)
+            return {
+                "score": chess.engine.PovScore(chess.engine.Cp(0), board.turn),
+                "pv": [next(iter(board.legal_moves))]
+            }
+        
+        protocol.analyse.side_effect = fake_analyse
+        return protocol
+    
+    def test_analyze_game_async_generator(self):
+        """Les coups sont produits au fur et à mesure"""
+        async def run():
+            with patch('chessassist.core.async_analyzer.chess.engine.popen_uci', new_callable=AsyncMock) as popen:
+                popen.side_effect = lambda path: (MagicMock(), self._fake_protocol())
+                async with AsyncGameAnalyzer("fake_stockfish_path", engines=2) as analyzer:
+                    moves = [a.move async for a in analyzer.analyze_game("1. e4 e5 2. Nf3 *", 0.01)]
+                    results = [r async for r in analyzer.analyze_games(["1. d4 *", "1. c4 c5 *"], 0.01)]
+            return moves, dict(results), analyzer.metrics.counters["engine_calls"]
+        
+        moves, results, engine_calls = asyncio.run(run())
+        self.assertEqual(moves, ["e2e4", "e7e5", "g1f3"])
+        # Une recherche par position: 4 + 2 + 3
+        self.assertEqual(engine_calls, 9)
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(len(results[1]), 2)
+    
+    def test_analyze_position_timeout(self):
+        """Un dépassement de délai lève asyncio.TimeoutError"""
+        async def run():
+            with patch('chessassist.core.async_analyzer.chess.engine.popen_uci', new_callable=AsyncMock) as popen:
+                popen.return_value = (MagicMock(), self._fake_protocol(delay=1.0))
+                async with AsyncGameAnalyzer("fake_stockfish_path") as analyzer:
+                    await analyzer.analyze_position(chess.Board(), 1.0, timeout=0.01)
+        
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
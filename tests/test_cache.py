@@ -0,0 +1,89 @@
+"""
+Tests pour le cache des évaluations
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import chess
+import chess.engine
+from chessassist.core.analyzer import GameAnalyzer
+from chessassist.core.cache import EvaluationCache, engine_key
+
+class TestEvaluationCache(unittest.TestCase):
+    """Tests pour EvaluationCache"""
+    
+    def setUp(self):
+        """Préparation des tests"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.board = chess.Board()
+        self.info = {
+            "score": chess.engine.PovScore(chess.engine.Cp(25), chess.WHITE),
+            "pv": [chess.Move.from_uci("e2e4")],
+            "depth": 18,
+            "nodes": 50000
+        }
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_depth_requirement(self):
+        """Une entrée n'est réutilisée que si elle est assez profonde"""
+        with EvaluationCache(self.path) as cache:
+            cache.put(self.board, "sf", self.info)
+            
+            self.assertIsNone(cache.get(self.board, "sf", min_depth=20))
+            info = cache.get(self.board, "sf", min_depth=18)
+            self.assertEqual(info["score"].white().score(), 25)
+            self.assertEqual(info["pv"][0].uci(), "e2e4")
+            self.assertIsNone(cache.get(self.board, "other-engine"))
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 2)
+    
+    def test_time_limit_requirement(self):
+        """Une recherche limitée en temps n'accepte pas une entrée plus courte"""
+        with EvaluationCache(self.path) as cache:
+            cache.put(self.board, "sf", dict(self.info, depth=2))
+            self.assertIsNone(cache.get(self.board, "sf", min_time=1.0))
+            
+            cache.put(self.board, "sf", self.info, search_time=1.0)
+            self.assertIsNotNone(cache.get(self.board, "sf", min_time=1.0))
+            self.assertIsNone(cache.get(self.board, "sf", min_time=2.0))
+        
+        with EvaluationCache(self.path, min_depth=18) as cache:
+            # Plancher configuré: l'entrée suffit quelle que soit sa durée
+            self.assertIsNotNone(cache.get(self.board, "sf", min_time=2.0))
+    
+    def test_persistence(self):
+        """Les entrées survivent à la fermeture du cache"""
+        with EvaluationCache(self.path) as cache:
+            cache.put(self.board, "sf", self.info)
+        
+        with EvaluationCache(self.path) as cache:
+            self.assertIsNotNone(cache.get(self.board, "sf"))
+    
+    def test_engine_key(self):
+        """Seules les options influençant l'évaluation changent la clé"""
+        base = engine_key({"name": "Stockfish 16"}, {"Threads": 1})
+        self.assertEqual(base, engine_key({"name": "Stockfish 16"}, {"Threads": 8, "Hash": 256}))
+        self.assertNotEqual(base, engine_key({"name": "Stockfish 17"}))
+        self.assertNotEqual(base, engine_key({"name": "Stockfish 16"}, {"UCI_Elo": 1500}))
+    
+    def test_analyzer_uses_cache(self):
+        """L'analyseur n'interroge le moteur qu'une fois par position"""
+        with EvaluationCache(self.path) as cache:
+            analyzer = GameAnalyzer("fake_stockfish_path", cache=cache)
+            analyzer.engine = MagicMock()
+            analyzer.engine.id = {"name": "Stockfish 16"}
+            analyzer.engine.analyse.return_value = self.info
+            
+            limit = chess.engine.Limit(depth=18)
+            analyzer._analyse(self.board, limit)
+            analyzer._analyse(self.board, limit)
+            
+            self.assertEqual(analyzer.engine.analyse.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
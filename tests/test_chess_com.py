@@ -0,0 +1,580 @@
+"""
+Tests pour les clients de l'API chess.com
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from aiohttp import web
+from chessassist.chess_com.api import ChessComAPI, iter_json_array, months_to_fetch
+from chessassist.chess_com.async_api import AsyncChessComAPI, FairScheduler, TokenBucket, fetch_club, parse_retry_after
+from chessassist.chess_com.store import GameStore
+from chessassist.chess_com.cache import ARCHIVE_GRACE_PERIOD, ResponseCache, archive_closed_at
+from chessassist.chess_com.fake_server import FakeChessComServer
+from chessassist.chess_com.records import GameBatch, GameRecord
+from chessassist.core.pgn_stream import iter_games
+
+def game_data(index: int) -> dict:
+    """Données d'une partie au format de l'API"""
+    return {
+        "uuid": f"game-{index}",
+        "url": f"https://www.chess.com/game/live/{index}",
+        "pgn": "1. e4 e5 *",
+        "white": {"username": "alice", "rating": 1500, "result": "win"},
+        "black": {"username": "bob", "rating": 1480, "result": "checkmated"},
+        "time_control": "600",
+        "end_time": 1_700_000_000 + index,
+        "rated": True
+    }
+
+async def start_server(throttle_every: int = 0) -> tuple:
+    """Démarre un serveur local imitant l'API (une réponse 429 toutes les N requêtes)"""
+    hits = {"count": 0}
+    
+    async def monthly(request):
+        hits["count"] += 1
+        if throttle_every and hits["count"] % throttle_every == 0:
+            return web.json_response({"message": "slow down"}, status=429, headers={"Retry-After": "0.05"})
+        month = int(request.match_info["month"])
+        return web.json_response({"games": [game_data(month * 100 + i) for i in range(3)]})
+    
+    async def profile(request):
+        if request.match_info["username"] == "ghost":
+            return web.json_response({"message": "not found"}, status=404)
+        if request.match_info["username"] == "garbled":
+            return web.Response(text="<html>maintenance</html>", content_type="application/json")
+        return web.json_response({"username": request.match_info["username"]})
+    
+    async def stats(request):
+        return web.json_response({"chess_blitz": {"last": {"rating": 1500}}})
+    
+    async def members(request):
+        return web.json_response({
+            "weekly": [{"username": "alice"}],
+            "monthly": [{"username": "bob"}, {"username": "ghost"}],
+            "all_time": [{"username": "alice"}]
+        })
+    
+    async def archives(request):
+        base = f"{request.scheme}://{request.host}/pub/player/{request.match_info['username']}/games"
+        return web.json_response({"archives": [f"{base}/2023/{month:02d}" for month in (1, 2, 5, 7)]})
+    
+    app = web.Application()
+    app.router.add_get("/pub/player/{username}", profile)
+    app.router.add_get("/pub/player/{username}/stats", stats)
+    app.router.add_get("/pub/club/{club}/members", members)
+    app.router.add_get("/pub/player/{username}/games/archives", archives)
+    app.router.add_get("/pub/player/{username}/games/{year}/{month}", monthly)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/pub", hits
+
+class TestAsyncChessComAPI(unittest.TestCase):
+    """Tests pour AsyncChessComAPI"""
+    
+    def test_parse_retry_after(self):
+        """Retry-After en secondes ou en date HTTP"""
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+    
+    def test_token_bucket_limits_rate(self):
+        """Le limiteur n'autorise que `rate` requêtes par seconde après la rafale"""
+        async def run():
+            bucket = TokenBucket(rate=50, capacity=1)
+            start = time.perf_counter()
+            for _ in range(11):
+                await bucket.acquire()
+            return time.perf_counter() - start
+        
+        self.assertGreaterEqual(asyncio.run(run()), 0.19)
+    
+    def test_token_bucket_backs_off_once_per_window(self):
+        """Des réponses 429 simultanées ne divisent le débit qu'une fois"""
+        bucket = TokenBucket(rate=64)
+        for _ in range(5):
+            bucket.throttle(0.5)
+        self.assertEqual(bucket.rate, 32)
+        
+        bucket._backoff_until = 0.0
+        bucket.throttle(0.5)
+        self.assertEqual(bucket.rate, 16)
+    
+    def test_client_created_outside_loop(self):
+        """Un client créé hors de toute boucle sert dans plusieurs asyncio.run"""
+        api = AsyncChessComAPI(rate=100)
+        
+        async def run():
+            runner, url, hits = await start_server()
+            try:
+                api.base_url = url
+                async with api:
+                    return await asyncio.gather(*(api.get_player_stats("alice") for _ in range(3)))
+            finally:
+                await runner.cleanup()
+        
+        for _ in range(2):
+            self.assertEqual(len(asyncio.run(run())), 3)
+    
+    def test_invalid_json_is_an_api_error(self):
+        """Une réponse JSON invalide lève l'erreur de l'API et n'arrête pas les autres joueurs"""
+        async def run():
+            runner, url, hits = await start_server()
+            try:
+                async with AsyncChessComAPI(base_url=url, max_concurrency=1) as api:
+                    with self.assertRaises(RuntimeError):
+                        await api.get_player_profile("garbled")
+                    return await api.fetch_players(["garbled", "alice"])
+            finally:
+                await runner.cleanup()
+        
+        players = asyncio.run(run())
+        self.assertIsNotNone(players["garbled"].error)
+        self.assertEqual(players["alice"].profile, {"username": "alice"})
+    
+    def test_parallel_requests_with_throttling(self):
+        """Les réponses 429 ralentissent le client sans faire échouer les requêtes"""
+        async def run():
+            runner, url, hits = await start_server(throttle_every=7)
+            try:
+                async with AsyncChessComAPI(rate=200, base_url=url) as api:
+                    profile = await api.get_player_profile("alice")
+                    months = [(2023, month) for month in range(1, 13)]
+                    results = await api.get_many_monthly_games(["alice", "bob"], months)
+                    return profile, results, api
+            finally:
+                await runner.cleanup()
+        
+        profile, results, api = asyncio.run(run())
+        self.assertEqual(profile["username"], "alice")
+        self.assertEqual(len(results), 24)
+        self.assertTrue(all(len(games) == 3 for games in results.values()))
+        self.assertGreater(api.throttled, 0)
+        self.assertGreater(api.bucket._backoff_until, 0)
+        self.assertLessEqual(api.bucket.rate, 200)
+    
+    def test_recent_games_from_archives(self):
+        """Seuls les mois de l'index des archives sont demandés, les plus récents d'abord"""
+        async def run():
+            runner, url, hits = await start_server()
+            try:
+                async with AsyncChessComAPI(base_url=url, max_concurrency=2) as api:
+                    return await api.get_recent_games("alice", limit=5), hits["count"]
+            finally:
+                await runner.cleanup()
+        
+        games, requests = asyncio.run(run())
+        self.assertEqual([game.game_id for game in games], ["game-702", "game-701", "game-700", "game-502", "game-501"])
+        self.assertEqual(requests, 2)
+    
+    def test_fair_scheduler_round_robin(self):
+        """Les tâches sont distribuées à tour de rôle entre joueurs"""
+        order = []
+        
+        def job(key):
+            async def run():
+                order.append(key)
+                # Une tâche peut en ajouter d'autres pour son joueur
+                if key == "b" and order.count("b") == 1:
+                    scheduler.add("b", job("b"))
+            return run
+        
+        async def run():
+            for key, count in (("a", 3), ("b", 1), ("c", 2)):
+                for _ in range(count):
+                    scheduler.add(key, job(key))
+            await scheduler.run()
+        
+        scheduler = FairScheduler(concurrency=1)
+        asyncio.run(run())
+        self.assertEqual(order, ["a", "b", "c", "a", "b", "c", "a"])
+    
+    def test_fetch_club(self):
+        """Les membres d'un club sont récupérés ensemble; un compte en erreur n'arrête pas les autres"""
+        progress = {}
+        
+        async def run():
+            runner, url, hits = await start_server()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, lambda: fetch_club(
+                    "test-club",
+                    months=2,
+                    on_progress=lambda username, done, total: progress.__setitem__(username, (done, total)),
+                    base_url=url,
+                    max_concurrency=3
+                ))
+            finally:
+                await runner.cleanup()
+        
+        players = asyncio.run(run())
+        self.assertEqual(list(players), ["alice", "bob", "ghost"])
+        self.assertEqual(players["alice"].profile, {"username": "alice"})
+        self.assertEqual(players["alice"].stats["chess_blitz"]["last"]["rating"], 1500)
+        self.assertEqual(players["alice"].archives, [(2023, 7), (2023, 5), (2023, 2), (2023, 1)])
+        self.assertEqual(sorted(players["bob"].games), [(2023, 5), (2023, 7)])
+        self.assertEqual(len(players["bob"].games[(2023, 7)]), 3)
+        self.assertIsNone(players["bob"].error)
+        self.assertIsNotNone(players["ghost"].error)
+        self.assertEqual(progress["alice"], (5, 5))
+        done, total = progress["ghost"]
+        self.assertEqual(done, total)
+    
+    def test_parse_game_data_is_static(self):
+        """Le parsing des parties est partagé avec le client synchrone"""
+        game = ChessComAPI._parse_game_data(game_data(1))
+        self.assertEqual(game.game_id, "game-1")
+        self.assertEqual(game.white_rating, 1500)
+
+def http_response(status: int, body: dict = None, headers: dict = None) -> MagicMock:
+    """Réponse requests simulée"""
+    response = MagicMock()
+    response.status_code = status
+    response.content = json.dumps(body).encode("utf-8") if body is not None else b""
+    response.json.side_effect = lambda: json.loads(response.content)
+    response.headers = headers or {}
+    response.iter_content.side_effect = lambda size: (
+        response.content[i:i + 7] for i in range(0, len(response.content), 7)
+    )
+    response.__enter__.return_value = response
+    return response
+
+class TestChessComAPI(unittest.TestCase):
+    """Tests pour ChessComAPI"""
+    
+    def test_recent_games_from_archives(self):
+        """Les mois demandés sont ceux de l'index, par lots, jusqu'à la limite"""
+        api = ChessComAPI(rate_limit_delay=0, max_workers=2)
+        api.session = MagicMock()
+        archives = [f"https://api.chess.com/pub/player/alice/games/2023/{month:02d}" for month in (3, 1, 11, 6, 9)]
+        
+        def get(url, headers=None, stream=False):
+            if url.endswith("/archives"):
+                return http_response(200, {"archives": archives})
+            month = int(url.rsplit("/", 1)[1])
+            return http_response(200, {"games": [game_data(month * 100 + i) for i in range(2)]})
+        
+        api.session.get.side_effect = get
+        games = api.get_recent_games("alice", limit=3)
+        
+        requested = [call.args[0].rsplit("/games/", 1)[1] for call in api.session.get.call_args_list]
+        self.assertEqual(requested[0], "archives")
+        self.assertEqual(sorted(requested[1:]), ["2023/09", "2023/11"])
+        self.assertEqual([game.game_id for game in games], ["game-1101", "game-1100", "game-901"])
+    
+    def test_recent_games_of_active_player(self):
+        """Le mois le plus récent est demandé seul, puis seulement les mois manquants"""
+        self.assertEqual(months_to_fetch(0, 0, 10, 4), 1)
+        self.assertEqual(months_to_fetch(1, 6, 10, 4), 1)
+        self.assertEqual(months_to_fetch(1, 2, 10, 4), 4)
+        self.assertEqual(months_to_fetch(2, 0, 10, 4), 4)
+        
+        api = ChessComAPI(rate_limit_delay=0)
+        api.session = MagicMock()
+        archives = [f"https://api.chess.com/pub/player/alice/games/2023/{month:02d}" for month in range(1, 13)]
+        
+        def get(url, headers=None, stream=False):
+            if url.endswith("/archives"):
+                return http_response(200, {"archives": archives})
+            month = int(url.rsplit("/", 1)[1])
+            return http_response(200, {"games": [game_data(month * 100 + i) for i in range(30)]})
+        
+        api.session.get.side_effect = get
+        games = api.get_recent_games("alice")
+        
+        requested = [call.args[0].rsplit("/games/", 1)[1] for call in api.session.get.call_args_list]
+        self.assertEqual(requested, ["archives", "2023/12"])
+        self.assertEqual(len(games), 10)
+    
+    def test_iter_json_array(self):
+        """Les éléments sont décodés au fil des blocs, quel que soit le découpage"""
+        games = [game_data(i) for i in range(20)]
+        games[3]["pgn"] = "[Event \"Caf\u00e9 ]\"]\n\n1. e4 *"
+        body = json.dumps({"games": games}, ensure_ascii=False).encode("utf-8")
+        for size in (1, 5, 1000):
+            chunks = (body[i:i + size] for i in range(0, len(body), size))
+            self.assertEqual(list(iter_json_array(chunks)), games)
+        
+        with self.assertRaises(ValueError):
+            list(iter_json_array([body[:len(body) // 2]]))
+    
+    def test_streamed_archive_is_cached(self):
+        """Une archive lue en flux est écrite dans le cache puis relue sans requête"""
+        with tempfile.TemporaryDirectory() as directory, ResponseCache(directory) as cache:
+            api = ChessComAPI(rate_limit_delay=0, cache=cache)
+            api.session = MagicMock()
+            api.session.get.return_value = http_response(200, {"games": [game_data(i) for i in range(5)]})
+            
+            first = list(api.iter_monthly_games("alice", 2020, 1, include_pgn=False))
+            second = list(api.iter_monthly_games("alice", 2020, 1, include_pgn=False))
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 5)
+        self.assertEqual(first[0].pgn, "")
+        self.assertEqual(api.session.get.call_count, 1)
+    
+    def test_download_pgn_archives(self):
+        """Les exports PGN sont écrits sur disque; les mois terminés déjà présents sont sautés"""
+        api = ChessComAPI(rate_limit_delay=0)
+        api.session = MagicMock()
+        
+        def get(url, headers=None, stream=False):
+            response = http_response(200)
+            response.content = f"[Event \"{url.rsplit('/games/', 1)[1]}\"]\n\n1. e4 e5 *\n".encode("utf-8")
+            return response
+        
+        api.session.get.side_effect = get
+        current = datetime.now(timezone.utc)
+        months = [(2021, 5), (2021, 4), (current.year, current.month)]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = api.download_pgn_archives("Alice", directory, months)
+            self.assertEqual([path.name for path in paths][:2], ["alice_2021-04.pgn", "alice_2021-05.pgn"])
+            self.assertEqual(paths[0].read_text(), "[Event \"2021/04/pgn\"]\n\n1. e4 e5 *\n")
+            self.assertEqual(sorted(p.name for p in paths[0].parent.iterdir()), sorted(p.name for p in paths))
+            
+            api.download_pgn_archives("Alice", directory, months)
+        
+        requested = [call.args[0].rsplit("/games/", 1)[1] for call in api.session.get.call_args_list]
+        self.assertEqual(len(requested), 4)
+        self.assertEqual(requested[-1], f"{current.year:04d}/{current.month:02d}/pgn")
+    
+    def test_stale_pgn_archive_is_downloaded_again(self):
+        """Un export écrit avant la fin de son mois est téléchargé de nouveau"""
+        api = ChessComAPI(rate_limit_delay=0)
+        api.session = MagicMock()
+        api.session.get.side_effect = lambda url, headers=None, stream=False: http_response(200)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            stale = os.path.join(directory, "alice_2021-03.pgn")
+            fresh = os.path.join(directory, "alice_2021-02.pgn")
+            for path in (stale, fresh):
+                with open(path, "w") as f:
+                    f.write("[Event \"partial\"]\n\n1. e4 *\n")
+            written = datetime(2021, 3, 15, tzinfo=timezone.utc).timestamp()
+            os.utime(stale, (written, written))
+            
+            api.download_pgn_archives("Alice", directory, [(2021, 2), (2021, 3)])
+        
+        requested = [call.args[0].rsplit("/games/", 1)[1] for call in api.session.get.call_args_list]
+        self.assertEqual(requested, ["2021/03/pgn"])
+    
+    def test_rate_limit_slots_are_reserved(self):
+        """Des threads concurrents respectent l'espacement entre requêtes"""
+        api = ChessComAPI(rate_limit_delay=0.05)
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: api._wait_for_slot(), range(5)))
+        self.assertGreaterEqual(time.time() - start, 0.19)
+
+class TestGameRecords(unittest.TestCase):
+    """Tests pour GameRecord et GameBatch"""
+    
+    def setUp(self):
+        self.games = [game_data(i) for i in range(10)]
+        for index, game in enumerate(self.games):
+            game["end_time"] = 1_700_000_000 + (index * 7) % 10 * 100
+            game["white"]["rating"] = 1000 + index * 50
+            game["time_control"] = "600" if index % 2 else "180+2"
+        self.games[4]["white"]["username"] = "carol"
+    
+    def test_record_matches_parsed_game(self):
+        """Les champs décodés à la demande sont ceux de _parse_game_data"""
+        record = GameRecord(self.games[3])
+        self.assertEqual(record.to_info(), ChessComAPI._parse_game_data(self.games[3]))
+        self.assertEqual(record.end_timestamp, self.games[3]["end_time"])
+        self.assertFalse(hasattr(record, "__dict__") or hasattr(record, "data"))
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+    
+    def test_batch_newest_and_filters(self):
+        """Tri et filtres vectorisés sur les colonnes"""
+        batch = GameBatch.from_games(self.games)
+        expected = sorted(self.games, key=lambda game: game["end_time"], reverse=True)
+        
+        self.assertEqual([record.game_id for record in batch.sort()], [game["uuid"] for game in expected])
+        self.assertEqual([record.game_id for record in batch.newest(3)], [game["uuid"] for game in expected[:3]])
+        self.assertEqual(len(batch.newest(50)), 10)
+        
+        self.assertEqual(len(batch.filter(time_control="600")), 5)
+        self.assertEqual(len(batch.filter(time_control="60")), 0)
+        self.assertEqual([record.game_id for record in batch.filter(player="Carol")], ["game-4"])
+        self.assertEqual(len(batch.filter(player="alice", min_rating=1200)), 5)
+        since = datetime.fromtimestamp(1_700_000_500)
+        self.assertTrue(all(record.end_time >= since for record in batch.filter(since=since)))
+        self.assertEqual(batch.filter(player="alice", max_rating=1100).to_infos()[2], ChessComAPI._parse_game_data(self.games[2]))
+
+class TestGameStore(unittest.TestCase):
+    """Tests pour GameStore"""
+    
+    def setUp(self):
+        """Préparation des tests"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = GameStore(f"{self.directory.name}/games.sqlite")
+        self.api = ChessComAPI(rate_limit_delay=0)
+        self.api.session = MagicMock()
+        self.months = [(2023, 1), (2023, 2)]
+        
+        def get(url, headers=None, stream=False):
+            if url.endswith("/archives"):
+                return http_response(200, {"archives": [
+                    f"https://api.chess.com/pub/player/alice/games/{year}/{month:02d}" for year, month in self.months
+                ]})
+            month = int(url.rsplit("/", 1)[1])
+            games = [game_data(month * 100 + i) for i in range(3)]
+            games[0]["pgn"] = '[ECO "C50"]\n\n1. e4 e5 *'
+            games[1]["white"], games[1]["black"] = games[1]["black"], games[1]["white"]
+            return http_response(200, {"games": games})
+        
+        self.api.session.get.side_effect = get
+    
+    def tearDown(self):
+        """Nettoyage des tests"""
+        self.store.close()
+        self.directory.cleanup()
+    
+    def requested_months(self):
+        return [call.args[0].rsplit("/games/", 1)[1] for call in self.api.session.get.call_args_list]
+    
+    def test_incremental_sync(self):
+        """Seuls les mois depuis la dernière synchronisation sont téléchargés"""
+        self.assertEqual(self.api.sync_games("Alice", self.store), 6)
+        self.assertEqual(self.store.last_synced_month("alice"), (2023, 2))
+        
+        self.api.session.get.reset_mock()
+        self.months.append((2023, 3))
+        self.assertEqual(self.api.sync_games("alice", self.store), 3)
+        self.assertEqual(self.requested_months(), ["archives", "2023/02", "2023/03"])
+        self.assertEqual(self.store.count("ALICE"), 9)
+    
+    def test_queries(self):
+        """Requêtes par joueur, ECO, résultat et date, sans réseau"""
+        self.store.sync(self.api, "alice")
+        
+        recent = self.store.recent_games("alice", limit=2)
+        self.assertEqual([game.game_id for game in recent], ["game-202", "game-201"])
+        self.assertEqual(recent[0].white_player, "alice")
+        self.assertEqual(len(self.store.games(eco="C")), 2)
+        self.assertEqual(len(self.store.games(player="alice", result="win")), 6)
+        self.assertEqual(len(self.store.games(result="win")), 4)
+        self.assertEqual(len(self.store.games(since=datetime.fromtimestamp(1_700_000_201))), 2)
+
+class TestResponseCache(unittest.TestCase):
+    """Tests pour ResponseCache et son utilisation par ChessComAPI"""
+    
+    def setUp(self):
+        """Préparation des tests"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.directory.name)
+        self.api = ChessComAPI(rate_limit_delay=0, cache=self.cache)
+        self.api.session = MagicMock()
+    
+    def tearDown(self):
+        """Nettoyage des tests"""
+        self.cache.close()
+        self.directory.cleanup()
+    
+    def test_archive_closed_at(self):
+        """Une archive est définitive après la fin de son mois"""
+        closed_at = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() + ARCHIVE_GRACE_PERIOD
+        self.assertEqual(archive_closed_at("/player/alice/games/2023/12"), closed_at)
+        self.assertEqual(archive_closed_at("/player/alice/games/2023/12/pgn"), closed_at)
+        self.assertIsNone(archive_closed_at("/player/alice/stats"))
+    
+    def test_past_month_served_without_request(self):
+        """Une archive d'un mois terminé n'est téléchargée qu'une fois"""
+        self.api.session.get.return_value = http_response(200, {"games": [game_data(1)]})
+        
+        first = self.api.get_monthly_games("alice", 2020, 1)
+        second = self.api.get_monthly_games("alice", 2020, 1)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(self.api.session.get.call_count, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+    
+    def test_current_data_revalidated(self):
+        """Les données pouvant changer sont revalidées par requête conditionnelle"""
+        self.api.session.get.side_effect = [
+            http_response(200, {"username": "alice"}, {"ETag": '"v1"'}),
+            http_response(304)
+        ]
+        
+        first = self.api.get_player_profile("alice")
+        second = self.api.get_player_profile("alice")
+        
+        self.assertEqual(first, second)
+        _, kwargs = self.api.session.get.call_args
+        self.assertEqual(kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+    
+    def test_size_eviction(self):
+        """Les réponses les plus anciennes sont évincées au-delà de la taille maximale"""
+        self.cache.max_bytes = 1000
+        for index in range(10):
+            self.cache.put(f"/player/p{index}", b"x" * 200)
+        
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["size"], 1000)
+        self.assertIsNone(self.cache.get("/player/p0"))
+        self.assertIsNotNone(self.cache.get("/player/p9"))
+        self.assertEqual(len(list(self.cache.bodies.iterdir())), stats["entries"])
+
+if __name__ == '__main__':
+    unittest.main()
+
+class TestFakeChessComServer(unittest.TestCase):
+    """Clients chess.com contre le faux serveur local"""
+    
+    def test_sync_client(self):
+        """Parties récentes, export PGN et joueur inconnu"""
+        with FakeChessComServer(usernames=["alice"], months=3, games_per_month=4) as server, \
+                tempfile.TemporaryDirectory() as directory:
+            api = ChessComAPI(rate_limit_delay=0, base_url=server.base_url)
+            games = api.get_recent_games("alice", limit=6)
+            paths = api.download_pgn_archives("alice", directory)
+            pgn_games = [game for path in paths for game in iter_games(path)]
+            with self.assertRaises(RuntimeError):
+                api.get_player_profile("bob")
+        
+        self.assertEqual(len(games), 6)
+        self.assertEqual(games, sorted(games, key=lambda game: game.end_time, reverse=True))
+        self.assertTrue(all("alice" in (game.white_player, game.black_player) for game in games))
+        self.assertEqual(len(paths), 3)
+        self.assertEqual(len(pgn_games), 12)
+        self.assertTrue(all(game.errors == [] and game.end().ply() > 0 for game in pgn_games))
+    
+    def test_etag_revalidation(self):
+        """Une réponse en cache est revalidée par une requête conditionnelle (304)"""
+        with FakeChessComServer(months=2) as server, tempfile.TemporaryDirectory() as directory, \
+                ResponseCache(directory) as cache:
+            api = ChessComAPI(rate_limit_delay=0, cache=cache, base_url=server.base_url)
+            first = api.get_archives("alice")
+            second = api.get_archives("alice")
+            stats = server.stats()
+        
+        self.assertEqual(first, second)
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["not_modified"], 1)
+        self.assertEqual(cache.revalidated, 1)
+    
+    def test_async_client_with_faults(self):
+        """Le client asynchrone absorbe les réponses 429 et 5xx injectées"""
+        with FakeChessComServer(months=3, games_per_month=2, throttle_every=5, error_every=11, retry_after=0.01) as server:
+            async def run():
+                async with AsyncChessComAPI(rate=500, base_url=server.base_url) as api:
+                    return await api.fetch_players(["alice", "bob", "carol"], months=3)
+            
+            players = asyncio.run(run())
+            stats = server.stats()
+        
+        self.assertTrue(all(player.error is None for player in players.values()))
+        self.assertTrue(all(len(player.games) == 3 for player in players.values()))
+        self.assertGreater(stats["throttled"], 0)
+        self.assertGreater(stats["errors"], 0)
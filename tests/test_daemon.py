@@ -0,0 +1,77 @@
+"""
+Tests pour le démon d'analyse
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import chess
+import chess.engine
+from chessassist.core.analyzer import GameAnalyzer
+from chessassist.core.daemon import AnalysisDaemon, connect_daemon
+
+def fake_engine():
+    """Crée un moteur simulé"""
+    engine = MagicMock()
+    engine.id = {"name": "Fake 1.0"}
+    engine.analyse.side_effect = lambda board, limit: {
+        "score": chess.engine.PovScore(chess.engine.Cp(42), board.turn),
+        "pv": [next(iter(board.legal_moves))],
+        "depth": 12,
+        "nodes": 1000
+    }
+    return engine
+
+@unittest.skipUnless(hasattr(os, "getuid"), "Sockets Unix requis")
+class TestAnalysisDaemon(unittest.TestCase):
+    """Tests pour AnalysisDaemon"""
+    
+    def setUp(self):
+        """Lance un démon avec un moteur simulé"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "daemon.sock")
+        self.patcher = patch('chessassist.core.daemon.chess.engine.SimpleEngine.popen_uci')
+        self.patcher.start().side_effect = lambda path: fake_engine()
+        
+        self.daemon = AnalysisDaemon("fake_stockfish_path", socket_path=self.socket_path, idle_timeout=0.5)
+        self.thread = threading.Thread(target=self.daemon.serve_forever)
+        self.thread.start()
+        while not os.path.exists(self.socket_path):
+            time.sleep(0.01)
+    
+    def tearDown(self):
+        self.thread.join(timeout=5)
+        self.patcher.stop()
+        self.tmpdir.cleanup()
+    
+    def test_analyzer_uses_daemon(self):
+        """L'analyseur se connecte au démon de façon transparente"""
+        with GameAnalyzer("fake_stockfish_path", use_daemon=True, daemon_socket=self.socket_path) as analyzer:
+            self.assertEqual(analyzer.engine.id["name"], "Fake 1.0")
+            result = analyzer.analyze_position(chess.Board(), time_limit=0.01)
+        
+        self.assertEqual(result["evaluation"], 0.42)
+        self.assertEqual(result["depth"], 12)
+        self.assertEqual(self.daemon.requests, 1)
+    
+    def test_analyzer_ignores_other_engine(self):
+        """Sans option explicite ou avec un autre moteur, le démon n'est pas utilisé"""
+        with GameAnalyzer("fake_stockfish_path", daemon_socket=self.socket_path) as analyzer:
+            analyzer.analyze_position(chess.Board(), time_limit=0.01)
+        with GameAnalyzer("other_stockfish_path", use_daemon=True, daemon_socket=self.socket_path) as analyzer:
+            analyzer.analyze_position(chess.Board(), time_limit=0.01)
+        
+        self.assertEqual(self.daemon.requests, 0)
+    
+    def test_idle_shutdown(self):
+        """Le démon s'arrête et supprime son socket après le délai d'inactivité"""
+        self.thread.join(timeout=5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertIsNone(connect_daemon(self.socket_path))
+
+if __name__ == '__main__':
+    unittest.main()
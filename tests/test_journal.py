@@ -0,0 +1,123 @@
+"""
+Tests pour le journal de reprise des analyses par lot
+"""
+
+import os
+import signal
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import chess
+import chess.engine
+from chessassist.core.analyzer import GameAnalyzer, read_game
+from chessassist.core.journal import AnalysisJournal, analyze_batch, game_key
+
+FAKE_ENGINE = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fake_uci.py"),
+    "--delay", "0.001"
+]
+
+PGNS = ["1. e4 e5 2. Nf3 Nc6 *", "1. d4 d5 2. c4 e6 *"]
+
+class TestAnalysisJournal(unittest.TestCase):
+    """Tests pour AnalysisJournal et analyze_batch"""
+    
+    def setUp(self):
+        """Préparation des tests"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "journal.jsonl")
+    
+    def tearDown(self):
+        """Nettoyage des tests"""
+        self.directory.cleanup()
+    
+    def test_finished_games_are_not_analyzed_again(self):
+        """Une exécution relancée reprend les parties terminées sans moteur"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer, AnalysisJournal(self.path) as journal:
+            first = dict(analyze_batch(analyzer, PGNS, journal, time_per_move=None, depth=3))
+        
+        analyzer = GameAnalyzer("fake_stockfish_path")
+        analyzer.engine = MagicMock()
+        with AnalysisJournal(self.path) as journal:
+            second = dict(analyze_batch(analyzer, PGNS, journal, time_per_move=None, depth=3))
+        
+        self.assertEqual(first, second)
+        analyzer.engine.analyse.assert_not_called()
+    
+    def test_interrupted_game_resumes_from_last_position(self):
+        """Les positions journalisées d'une partie interrompue ne sont pas recherchées"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            game = read_game(PGNS[0])
+            with AnalysisJournal(self.path) as journal:
+                expected = analyzer.analyze_game(game, time_per_move=None, depth=3, checkpoint=journal.checkpoint(game_key(game)))
+            
+            # Arrêt brutal simulé: dernière position perdue, ligne tronquée
+            with open(self.path) as f:
+                lines = f.readlines()
+            with open(self.path, "w") as f:
+                f.writelines(lines[:-1])
+                f.write(lines[-1][:10])
+            
+            with AnalysisJournal(self.path) as journal:
+                self.assertEqual(len(journal.positions[game_key(game)]), 4)
+                results = dict(analyze_batch(analyzer, PGNS[:1], journal, time_per_move=None, depth=3))
+        
+        key = lambda analyses: [(a.move, a.evaluation, a.best_move, a.classification) for a in analyses]
+        self.assertEqual(key(results[0]), key(expected))
+        self.assertEqual(analyzer.last_game_metrics.counters["engine_calls"], 1)
+    
+    def test_truncated_tail_is_removed(self):
+        """Une ligne tronquée est retirée avant que le journal ne soit complété"""
+        with AnalysisJournal(self.path) as journal:
+            journal.checkpoint("a").record(0, {"evaluation": 0.1})
+            journal.checkpoint("a").record(1, {"evaluation": 0.2})
+        
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-5])
+        
+        with AnalysisJournal(self.path) as journal:
+            self.assertEqual(list(journal.positions["a"]), [0])
+            journal.checkpoint("a").record(2, {"evaluation": 0.3})
+        
+        with AnalysisJournal(self.path) as journal:
+            self.assertEqual(journal.positions["a"], {0: {"evaluation": 0.1}, 2: {"evaluation": 0.3}})
+    
+    def test_dead_engine_is_restarted(self):
+        """Un moteur tué en cours de lot est relancé sans faire échouer le lot"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer, AnalysisJournal(self.path) as journal:
+            results = analyze_batch(analyzer, PGNS, journal, time_per_move=None, depth=3)
+            next(results)
+            os.kill(analyzer.engine.transport.get_pid(), signal.SIGKILL)
+            index, analyses = next(results)
+        
+        self.assertEqual(index, 1)
+        self.assertEqual(len(analyses), 4)
+        self.assertEqual(analyzer.restarts, 0)
+        self.assertEqual(analyzer.metrics.counters["engine_restarts"], 1)
+        self.assertIn(game_key(read_game(PGNS[1])), journal.games)
+    
+    def test_restart_cap_is_per_failure(self):
+        """Le plafond compte les relances successives et lève une erreur une fois épuisé"""
+        analyzer = GameAnalyzer("fake_stockfish_path", max_restarts=1)
+        analyzer.restart_engine = lambda: setattr(analyzer, "restarts", analyzer.restarts + 1)
+        analyzer.engine = MagicMock()
+        analyzer.engine.id = {"name": "Stockfish 16"}
+        info = {"score": chess.engine.PovScore(chess.engine.Cp(20), chess.WHITE), "pv": [chess.Move.from_uci("e2e4")], "depth": 3}
+        crash = chess.engine.EngineTerminatedError("engine process died unexpectedly")
+        limit = chess.engine.Limit(depth=3)
+        
+        for _ in range(3):
+            analyzer.engine.analyse.side_effect = [crash, info]
+            self.assertEqual(analyzer._evaluate(chess.Board(), limit)["evaluation"], 0.2)
+            self.assertEqual(analyzer.restarts, 0)
+        
+        analyzer.engine.analyse.side_effect = [crash, crash]
+        with self.assertRaises(RuntimeError):
+            analyzer._evaluate(chess.Board(), limit)
+
+if __name__ == '__main__':
+    unittest.main()
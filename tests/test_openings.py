@@ -2,7 +2,12 @@
 Tests pour les recommandations d'ouvertures
 """
 
+import io
 import unittest
+import chess
+import chess.pgn
+from chessassist.openings.book import OpeningBook
+from chessassist.openings.eco import EcoIndex, iter_san_tokens
 from chessassist.openings.recommender import OpeningRecommender, Color, Difficulty
 
 class TestOpeningRecommender(unittest.TestCase):
@@ -66,6 +71,66 @@ class TestOpeningRecommender(unittest.TestCase):
         self.assertIn("main_openings", analysis)
         self.assertIn("recommendations", analysis)
         self.assertGreater(analysis["diversity_score"], 0)
+    
+    def test_get_opening_by_moves(self):
+        """L'ouverture est reconnue à sa position, même par transposition"""
+        self.assertEqual(self.recommender.get_opening_by_moves("1.e4 e5 2.Nf3 Nc6 3.Bc4 Bc5 4.c3").eco_code, "C50")
+        self.assertEqual(self.recommender.get_opening_by_moves("1.c4 e6 2.Nc3 Nf6 3.d4 Bb4").eco_code, "E20")
+        self.assertIsNone(self.recommender.get_opening_by_moves("1.h4 h5"))
+
+class TestEcoIndex(unittest.TestCase):
+    """Tests pour EcoIndex"""
+    
+    def setUp(self):
+        self.index = EcoIndex.default()
+    
+    def test_san_tokens_ignore_formatting(self):
+        """Commentaires, variantes, NAG et numéros n'influent pas sur les coups lus"""
+        pgn = (
+            '[Event "Live Chess"]\n[White "alice"]\n\n'
+            '1. e4 {[%clk 0:09:58.9]} 1... c5 2. Nf3! $1 (2. c3 d5) 2... d6 3. d4 cxd4 '
+            '4. Nxd4 Nf6 5. Nc3 a6 6. Bc4 e6 7. 0-0 Be7 1-0'
+        )
+        self.assertEqual(
+            list(iter_san_tokens(pgn)),
+            ["e4", "c5", "Nf3", "d6", "d4", "cxd4", "Nxd4", "Nf6", "Nc3", "a6", "Bc4", "e6", "O-O", "Be7"]
+        )
+        self.assertEqual(self.index.classify_pgn(pgn), self.index.classify_pgn("1.e4 c5 2.Nf3 d6 3.d4 cxd4 4.Nxd4 Nf6 5.Nc3 a6"))
+    
+    def test_deepest_match_and_transpositions(self):
+        """La ligne la plus profonde est retenue, quel que soit l'ordre des coups"""
+        self.assertEqual(self.index.classify_pgn("1.e4 c5 2.Nf3 d6 3.d4 cxd4 4.Nxd4 Nf6 5.Nc3 a6 6.Be3").eco, "B90")
+        self.assertEqual(self.index.classify_pgn("1.e4 c5 2.Nf3 e6 3.d4 cxd4 4.Nxd4 Nf6 5.Nc3 d6").eco, "B80")
+        self.assertEqual(self.index.classify_pgn("1.Nf3 c5 2.e4 d6 3.d4 cxd4 4.Nxd4 Nf6 5.Nc3 a6").eco, "B90")
+        self.assertEqual(self.index.classify_pgn("1.e4 e5").eco, "C20")
+        self.assertIsNone(self.index.classify_pgn("1.h4"))
+    
+    def test_game_and_pgn_agree(self):
+        """Parties lues et texte PGN donnent la même classification"""
+        pgn = "1. d4 Nf6 2. c4 g6 3. Nc3 Bg7 4. e4 d6 5. Nf3 O-O 6. Be2 e5 7. O-O Nc6 8. d5 Ne7 *"
+        game = chess.pgn.read_game(io.StringIO(pgn))
+        self.assertEqual(self.index.classify_game(game).eco, "E97")
+        self.assertEqual(self.index.classify_pgn(pgn).eco, "E97")
+        
+        chess960 = '[FEN "bbqnnrkr/pppppppp/8/8/8/8/PPPPPPPP/BBQNNRKR w HFhf - 0 1"]\n[SetUp "1"]\n\n1. e4 e5 *'
+        self.assertIsNone(self.index.classify_pgn(chess960))
+    
+    def test_from_lines(self):
+        """Une même position garde la ligne la plus longue; les lignes illégales sont ignorées"""
+        index = EcoIndex.from_lines([
+            ("X01", "Court", "1.d4 Nf6 2.c4 e6"),
+            ("X02", "Long", "1.c4 e6 2.d4 Nf6"),
+            ("X03", "Illégale", "1.e5")
+        ])
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.classify_pgn("1.d4 Nf6 2.c4 e6 3.Nc3").name, "Court")
+        
+        board = chess.Board()
+        for san in ["d4", "Nf6"]:
+            board.push_san(san)
+        book = OpeningBook.from_eco_index(index)
+        self.assertTrue(book.is_book_move(board, chess.Move.from_uci("c2c4")))
+        self.assertFalse(book.is_book_move(board, chess.Move.from_uci("e2e4")))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Tests pour le pool de moteurs
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import chess
+import chess.engine
+from chessassist.core.pool import EnginePool, default_pool_size
+
+def fake_engine():
+    """Crée un moteur simulé retournant toujours le premier coup légal"""
+    engine = MagicMock()
+    
+    def fake_analyse(board, limit):
+        return {
+            "score": chess.engine.PovScore(chess.engine.Cp(0), board.turn),
+            "pv": [next(iter(board.legal_moves))]
+        }
+    
+    engine.analyse.side_effect = fake_analyse
+    return engine
+
+class TestEnginePool(unittest.TestCase):
+    """Tests pour EnginePool"""
+    
+    def test_default_pool_size(self):
+        """La taille du pool tient compte des threads par moteur"""
+        self.assertGreaterEqual(default_pool_size(), 1)
+        self.assertEqual(default_pool_size(10 ** 6), 1)
+    
+    @patch('chessassist.core.analyzer.chess.engine.SimpleEngine.popen_uci')
+    def test_analyze_games(self, mock_popen):
+        """Toutes les parties sont analysées et indexées"""
+        mock_popen.side_effect = lambda path: fake_engine()
+        pgns = ["1. e4 e5 2. Nf3 *", "1. d4 d5 *", "1. c4 *"]
+        
+        with EnginePool("fake_stockfish_path", size=2, threads=1, hash_mb=16) as pool:
+            results = dict(pool.analyze_games(pgns, time_per_move=0.01))
+        
+        self.assertEqual(mock_popen.call_count, 2)
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertEqual([len(results[i]) for i in range(3)], [3, 2, 1])
+
+if __name__ == '__main__':
+    unittest.main()
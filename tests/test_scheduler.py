@@ -0,0 +1,85 @@
+"""
+Tests pour le planificateur d'analyse de corpus
+"""
+
+import os
+import sys
+import unittest
+import chess
+import chess.engine
+from chessassist.core.analyzer import GameAnalyzer
+from chessassist.core.scheduler import CorpusScheduler, analyze_corpus, merge_limits
+
+FAKE_ENGINE = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fake_uci.py"),
+    "--delay", "0.001"
+]
+
+class TestCorpusScheduler(unittest.TestCase):
+    """Tests pour CorpusScheduler"""
+    
+    def test_merge_limits(self):
+        """Seules des limites de mêmes critères se combinent, critère par critère"""
+        merged = merge_limits(chess.engine.Limit(depth=8, nodes=5000), chess.engine.Limit(depth=12, nodes=1000))
+        self.assertEqual(merged, chess.engine.Limit(depth=12, nodes=5000))
+        with self.assertRaises(ValueError):
+            merge_limits(chess.engine.Limit(depth=8), chess.engine.Limit(depth=12, nodes=1000))
+    
+    def test_different_criteria_searched_separately(self):
+        """Une position demandée en profondeur et en noeuds respecte chaque limite"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            scheduler = CorpusScheduler(analyzer)
+            scheduler.add_game("1. e4 *", time_per_move=None, depth=4)
+            scheduler.add_game("1. e4 *", time_per_move=None, nodes=1000)
+            self.assertEqual(scheduler.pending(), 4)
+            limits = [position.limit for position in scheduler.positions.values()]
+            self.assertEqual(limits.count(chess.engine.Limit(depth=4)), 2)
+            self.assertEqual(limits.count(chess.engine.Limit(nodes=1000)), 2)
+            scheduler.run()
+        
+        self.assertEqual(analyzer.metrics.histograms["depth"].max, 4)
+    
+    def test_search_limit_required(self):
+        """Une partie sans aucune limite de recherche est refusée"""
+        scheduler = CorpusScheduler(GameAnalyzer("fake_stockfish_path"))
+        with self.assertRaises(ValueError):
+            scheduler.add_game("1. e4 *", time_per_move=None)
+    
+    def test_unique_positions_searched_once(self):
+        """Ouvertures communes et répétitions ne sont cherchées qu'une fois"""
+        pgns = [
+            "1. e4 e5 2. Nf3 Nc6 *",
+            "1. e4 e5 2. Nf3 Nf6 *",
+            "1. Nf3 Nf6 2. Ng1 Ng8 3. Nf3 Nf6 *"
+        ]
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            results = analyze_corpus(analyzer, pgns, time_per_move=None, depth=3)
+            calls = analyzer.metrics.counters["engine_calls"]
+            transpositions = analyzer.metrics.counters["transpositions"]
+            references = [analyzer.analyze_game(pgn, time_per_move=None, depth=3) for pgn in pgns]
+        
+        # 5 positions, puis 1 nouvelle, puis 3 nouvelles (2 répétitions)
+        self.assertEqual(calls, 9)
+        self.assertEqual(transpositions, 8)
+        for analyses, reference in zip(results, references):
+            self.assertEqual(
+                [(a.move, a.evaluation, a.classification) for a in analyses],
+                [(a.move, a.evaluation, a.classification) for a in reference]
+            )
+    
+    def test_deeper_requirement_wins(self):
+        """Une occurrence plus exigeante relance la recherche de la position"""
+        with GameAnalyzer(FAKE_ENGINE) as analyzer:
+            scheduler = CorpusScheduler(analyzer)
+            scheduler.add_game("1. e4 *", time_per_move=None, depth=2)
+            scheduler.run()
+            
+            scheduler.add_game("1. e4 e5 *", time_per_move=None, depth=4)
+            self.assertEqual(scheduler.pending(), 3)
+            scheduler.run()
+        
+        self.assertEqual(analyzer.metrics.histograms["depth"].max, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests pour la notation vectorisée des coups
+"""
+
+import time
+import unittest
+import numpy as np
+from chessassist.core.analyzer import MATE_SCORE, MoveAnalysis, calculate_accuracy, classify_move
+from chessassist.core.scoring import (
+    classify, class_names, score_analyses, score_game, score_moves,
+    split_evaluations, win_probability
+)
+
+class TestScoring(unittest.TestCase):
+    """Tests pour le module scoring"""
+    
+    def test_split_evaluations_handles_mates(self):
+        """Les mats encodés et les infinis deviennent des distances de mat"""
+        centipawns, mate = split_evaluations([0.35, (MATE_SCORE - 3) / 100, -(MATE_SCORE - 1) / 100, float("inf")])
+        self.assertEqual(centipawns.tolist(), [35, 0, 0, 0])
+        self.assertEqual(mate.tolist(), [0, 3, -1, 1])
+    
+    def test_win_probability(self):
+        """Probabilité symétrique, saturée pour les mats"""
+        probability = win_probability([0, 300, -300, 0], [0, 0, 0, -2])
+        self.assertAlmostEqual(probability[0], 50.0)
+        self.assertAlmostEqual(probability[1] + probability[2], 100.0)
+        self.assertEqual(probability[3], 0.0)
+    
+    def test_classify(self):
+        """Seuils par défaut et seuils personnalisés"""
+        codes = classify([100, 90, 75, 55, 20])
+        self.assertEqual(class_names(codes), ["excellent", "good", "inaccuracy", "mistake", "blunder"])
+        self.assertEqual(class_names(classify([75], thresholds=(95, 85, 80, 60))), ["mistake"])
+    
+    def test_score_game(self):
+        """Précision alignée sur les coups, couleur alternée, mats finis"""
+        mated = -(MATE_SCORE - 1) / 100
+        scores = score_game([0.2, 0.3, 0.2, mated], book=[True, False, False])
+        
+        self.assertEqual(len(scores.win_probability), 4)
+        self.assertEqual(class_names(scores.classification), ["book", "excellent", "blunder"])
+        self.assertTrue(np.all(np.isfinite(scores.accuracy)))
+        self.assertEqual(scores.accuracy[2], 25.0)
+        
+        scores = score_game([0.2, 0.3, 0.2, mated], book=[True, False, False], model="win")
+        self.assertEqual(class_names(scores.classification), ["book", "excellent", "blunder"])
+        self.assertLess(scores.accuracy[2], 10)
+    
+    def test_matches_game_analyzer(self):
+        """Le modèle par défaut note et classe chaque coup comme GameAnalyzer"""
+        before = np.linspace(-3, 3, 61)
+        for loss in (0.0, 0.05, 0.1, 0.2, 0.45, 0.6, 0.8, 1.2, 3.0):
+            for white in (True, False):
+                after = before - loss if white else before + loss
+                accuracy, codes = score_moves(before, after, np.full(len(before), white))
+                expected = [calculate_accuracy(b, a, white) for b, a in zip(before, after)]
+                np.testing.assert_allclose(accuracy, expected)
+                self.assertEqual(class_names(codes), [classify_move(value) for value in expected])
+        
+        with self.assertRaises(ValueError):
+            score_moves([0.0], [0.0], [True], model="elo")
+    
+    def test_score_analyses(self):
+        """Des analyses stockées sont renotées sans moteur"""
+        analyses = [
+            MoveAnalysis("e2e4", 0.3, "e2e4", 100.0, "excellent"),
+            MoveAnalysis("f7f6", 1.5, "e7e5", 25.0, "blunder")
+        ]
+        scores = score_analyses(analyses, initial_evaluation=0.2)
+        self.assertEqual(scores.accuracy[0], 100.0)
+        self.assertEqual(scores.accuracy[1], analyses[1].accuracy)
+        self.assertEqual(class_names(scores.classification), ["excellent", "blunder"])
+    
+    def test_corpus_rescoring_is_fast(self):
+        """100k coups sont renotés en bien moins d'une seconde"""
+        rng = np.random.default_rng(0)
+        before = rng.normal(0, 2, 100_000)
+        after = before + rng.normal(0, 0.5, 100_000)
+        white = np.arange(100_000) % 2 == 0
+        
+        start = time.perf_counter()
+        accuracy, codes = score_moves(before, after, white, thresholds=(90, 80, 60, 40))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(accuracy.shape, codes.shape)
+
+if __name__ == '__main__':
+    unittest.main()
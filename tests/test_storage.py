@@ -0,0 +1,73 @@
+"""
+Tests pour le stockage en colonnes des analyses
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from chessassist.core.analyzer import MATE_SCORE, MoveAnalysis
+from chessassist.core.storage import AnalysisStore, decode_move, encode_move
+
+class TestAnalysisStore(unittest.TestCase):
+    """Tests pour AnalysisStore"""
+    
+    def setUp(self):
+        """Préparation des tests"""
+        self.games = [
+            [
+                MoveAnalysis("e2e4", 0.3, "e2e4", 100.0, "book"),
+                MoveAnalysis("f7f6", 1.25, "e7e5", 70.0, "inaccuracy", 0.5)
+            ],
+            [],
+            [
+                MoveAnalysis("e7e8q", (MATE_SCORE - 2) / 100, "e7e8q", 100.0, "excellent"),
+                MoveAnalysis("g8h8", -(MATE_SCORE - 1) / 100, None, 25.0, "blunder")
+            ]
+        ]
+    
+    def test_encode_move(self):
+        """Les coups, promotions comprises, tiennent sur 16 bits"""
+        for uci in ("e2e4", "a7a8n", "h2h1q"):
+            self.assertLess(encode_move(uci), 1 << 16)
+            self.assertEqual(decode_move(encode_move(uci)), uci)
+        self.assertIsNone(decode_move(encode_move(None)))
+    
+    def test_roundtrip_mmap(self):
+        """Les analyses relues depuis des fichiers projetés sont identiques"""
+        store = AnalysisStore.from_games(self.games)
+        self.assertEqual(sum(column.itemsize for column in store.columns.values()), 16)
+        self.assertTrue(all(column.flags.c_contiguous for column in store.columns.values()))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "analyses")
+            store.save(path)
+            loaded = AnalysisStore.load(path)
+            
+            self.assertTrue(all(isinstance(column, np.memmap) for column in loaded.columns.values()))
+            self.assertEqual(len(loaded), 3)
+            self.assertEqual(len(loaded[1]), 0)
+            for view, original in zip(loaded, self.games):
+                self.assertEqual(list(view), original)
+            self.assertEqual(loaded[2].evaluations.tolist(), [(MATE_SCORE - 2) / 100, -(MATE_SCORE - 1) / 100])
+            del loaded
+    
+    def test_trailing_empty_games(self):
+        """Les parties sans coup en fin de lot sont comptées, y compris après relecture"""
+        store = AnalysisStore.from_games(self.games + [[], []])
+        self.assertEqual(len(store), 5)
+        self.assertEqual(len(store[4]), 0)
+        self.assertEqual(len(AnalysisStore.from_games([[], []])), 2)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "analyses")
+            store.save(path)
+            self.assertEqual(len(AnalysisStore.load(path, mmap=False)), 5)
+    
+    def test_accuracy_precision(self):
+        """La précision est conservée au-delà de float16"""
+        store = AnalysisStore.from_games([[MoveAnalysis("e2e4", 0.3, "e2e4", 87.53, "good")]])
+        self.assertAlmostEqual(store[0][0].accuracy, 87.53, places=4)
+
+if __name__ == '__main__':
+    unittest.main()